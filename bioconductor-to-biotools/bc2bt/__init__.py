@@ -11,10 +11,11 @@ __version__ = "0.1.0"
 __author__ = "Hervé Ménager"
 __email__ = "herve.menager@pasteur.fr"
 
-from .converter import convert_package, batch_convert, process_authors
+from .converter import convert_package, batch_convert, convert_entries, process_authors
 from .mapper import (
     IdentityRegistry,
     compare_files,
+    load_dataset,
     IDENTITY_FUNCTIONS,
     identity_name,
     identity_name_insensitive,
@@ -23,6 +24,7 @@ from .mapper import (
     identity_name_homepage,
     identity_biotoolsID_unprefixed,
 )
+from .identity_index import IdentityIndex
 from .updater import update_entries, create_entry, Updater
 
 __all__ = [
@@ -31,10 +33,12 @@ __all__ = [
     # Converter
     "convert_package",
     "batch_convert",
+    "convert_entries",
     "process_authors",
     # Mapper
     "IdentityRegistry",
     "compare_files",
+    "load_dataset",
     "IDENTITY_FUNCTIONS",
     "identity_name",
     "identity_name_insensitive",
@@ -42,6 +46,7 @@ __all__ = [
     "identity_doi",
     "identity_name_homepage",
     "identity_biotoolsID_unprefixed",
+    "IdentityIndex",
     # Updater
     "update_entries",
     "create_entry",
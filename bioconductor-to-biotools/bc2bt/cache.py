@@ -0,0 +1,226 @@
+"""
+Cache of the publication metadata fetched by the DOI resolvers.
+
+Parsed metadata (not HTTP responses) is kept in a SQLite database, keyed by
+resolver and normalized DOI. Entries expire after a time to live, and the
+oldest ones are evicted beyond a maximum number of entries. The database is
+in WAL mode, so that several processes can read it while one writes.
+
+Only the resolvers use the cache; other HTTP requests are not affected.
+"""
+
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default location, overridden by the BC2BT_METADATA_CACHE environment variable
+DEFAULT_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "bc2bt",
+    "metadata.sqlite",
+)
+TTL = 2592000  # 30 days in seconds
+MAX_ENTRIES = 100_000
+# Expired and excess entries are evicted on opening, then every EVICT_EVERY writes
+EVICT_EVERY = 1000
+DOI_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "doi:")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    resolver TEXT NOT NULL,
+    doi TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (resolver, doi)
+);
+CREATE INDEX IF NOT EXISTS metadata_fetched ON metadata (fetched);
+"""
+
+
+def normalize_doi(doi: str) -> str:
+    """Lowercase a DOI and remove its 'doi:' or resolver URL prefix."""
+    doi = doi.strip().lower()
+    for prefix in DOI_PREFIXES:
+        if doi.startswith(prefix):
+            return doi[len(prefix) :].strip()
+    return doi
+
+
+class MetadataCache:
+    """SQLite cache of the publication metadata of DOIs, per resolver."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: float = TTL,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        """
+        Open (or create) a metadata cache.
+
+        Args:
+            db_path: Path to the SQLite database file; defaults to
+                BC2BT_METADATA_CACHE or DEFAULT_PATH
+            ttl: Time to live of the entries, in seconds
+            max_entries: Maximum number of entries kept
+        """
+        self.db_path = db_path or os.environ.get("BC2BT_METADATA_CACHE", DEFAULT_PATH)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection per thread, as resolvers may be called from a pool
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SCHEMA)
+        self.evict()
+
+    def _conn(self) -> sqlite3.Connection:
+        if not hasattr(self._local, "conn"):
+            self._local.conn = sqlite3.connect(self.db_path, timeout=30)
+        return self._local.conn
+
+    def get(self, resolver: str, doi: str) -> Optional[dict]:
+        """Cached metadata of a DOI, or None if absent or expired."""
+        return self.get_many(resolver, [doi]).get(normalize_doi(doi))
+
+    def get_many(self, resolver: str, dois: Iterable[str]) -> Dict[str, dict]:
+        """
+        Cached metadata of several DOIs.
+
+        Args:
+            resolver: Name of the resolver
+            dois: DOIs to look up
+
+        Returns:
+            Dictionary mapping the normalized DOIs found to their metadata
+        """
+        keys = list(dict.fromkeys(normalize_doi(doi) for doi in dois))
+        found = {}
+        oldest = time.time() - self.ttl
+        # Stay below the SQLite limit on query parameters
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for doi, value in self._conn().execute(
+                "SELECT doi, value FROM metadata WHERE resolver = ? AND fetched >= ?"
+                f" AND doi IN ({placeholders})",
+                [resolver, oldest, *chunk],
+            ):
+                found[doi] = json.loads(value)
+        return found
+
+    def set(self, resolver: str, doi: str, metadata: dict):
+        """Store the metadata of a DOI."""
+        self.set_many(resolver, [(doi, metadata)])
+
+    def set_many(self, resolver: str, items: Iterable[Tuple[str, dict]]):
+        """
+        Store the metadata of several DOIs.
+
+        Args:
+            resolver: Name of the resolver
+            items: Pairs of (DOI, metadata)
+        """
+        now = time.time()
+        rows = [
+            (resolver, normalize_doi(doi), now, json.dumps(metadata))
+            for doi, metadata in items
+        ]
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)", rows
+            )
+        with self._lock:
+            self._writes += len(rows)
+            evict = self._writes >= EVICT_EVERY
+            if evict:
+                self._writes = 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Remove the expired entries, then the oldest beyond max_entries."""
+        conn = self._conn()
+        with conn:
+            expired = conn.execute(
+                "DELETE FROM metadata WHERE fetched < ?", (time.time() - self.ttl,)
+            ).rowcount
+            excess = conn.execute(
+                "DELETE FROM metadata WHERE rowid IN (SELECT rowid FROM metadata"
+                " ORDER BY fetched DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if expired or excess:
+            logger.debug(f"Metadata cache: evicted {expired} expired, {excess} excess")
+
+    def clear(self):
+        """Remove all the entries."""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM metadata")
+
+
+_cache: Optional[MetadataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> MetadataCache:
+    """Metadata cache shared by the resolvers, opened on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache()
+        return _cache
+
+
+def set_cache(cache: Optional[MetadataCache]):
+    """
+    Replace the metadata cache shared by the resolvers.
+
+    Args:
+        cache: Cache to use, or None to open the default one on next use
+    """
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def cached(resolver: str) -> Callable:
+    """
+    Decorate a single-DOI resolver function so that the metadata it returns
+    is cached. Metadata that could not be fetched (None) is not cached.
+
+    Args:
+        resolver: Name of the resolver, part of the cache key
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(doi):
+            if not doi or not doi.strip():
+                return function(doi)
+            metadata = get_cache().get(resolver, doi)
+            if metadata is not None:
+                logger.debug(f"Retrieved {resolver} metadata for DOI {doi} from cache")
+                return metadata
+            metadata = function(doi)
+            if metadata is not None:
+                get_cache().set(resolver, doi, metadata)
+            return metadata
+
+        return wrapper
+
+    return decorator
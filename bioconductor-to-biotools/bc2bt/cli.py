@@ -8,8 +8,8 @@ import json
 import sys
 from pathlib import Path
 
-from .converter import batch_convert
-from .mapper import compare_files, IdentityRegistry
+from .converter import batch_convert, convert_entries
+from .mapper import compare_files, load_dataset, IdentityRegistry
 from .updater import update_entries
 
 
@@ -38,6 +38,12 @@ def convert_command(args=None):
             default=None,
             help="Directory containing citation HTML files",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of parallel workers",
+        )
 
         args = parser.parse_args()
 
@@ -46,6 +52,7 @@ def convert_command(args=None):
             input_dir=args.input_dir,
             output_dir=args.output_dir,
             existing_biotools_dir=args.existing,
+            num_workers=args.workers,
         )
         print(f"Converted {len(result)} packages")
         print(f"Output written to: {args.output_dir}")
@@ -97,6 +104,11 @@ def compare_command(args=None):
             default=None,
             help="Number of parallel workers",
         )
+        parser.add_argument(
+            "--index",
+            default=None,
+            help="SQLite identity index, to only reload the files changed since the previous run",
+        )
 
         args = parser.parse_args()
 
@@ -116,6 +128,7 @@ def compare_command(args=None):
             upset1_path=args.upset1,
             upset2_path=args.upset2,
             num_workers=args.workers,
+            index_path=args.index,
         )
 
         # Save results
@@ -161,6 +174,11 @@ def update_command(args=None):
             action="store_true",
             help="Don't create backup files before updating",
         )
+        parser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Write all the changes concurrently as one transaction, with a journal instead of backup files",
+        )
         parser.add_argument(
             "--no-copy-source",
             action="store_true",
@@ -189,6 +207,7 @@ def update_command(args=None):
             backup=not args.no_backup,
             copy_source=not args.no_copy_source,
             bioc_files_dir=bioc_files_dir,
+            parallel=args.parallel,
         )
 
         print("\n" + "=" * 60)
@@ -196,6 +215,7 @@ def update_command(args=None):
         print("=" * 60)
         print(f"Created: {len(summary['created'])}")
         print(f"Updated: {len(summary['updated'])}")
+        print(f"Unchanged: {len(summary['unchanged'])}")
         print(f"Errors: {len(summary['errors'])}")
 
         if args.dry_run:
@@ -224,7 +244,7 @@ def sync_command(args=None):
         parser.add_argument(
             "--work-dir",
             default="bc2bt_work",
-            help="Working directory for intermediate files",
+            help="Working directory for intermediate files (with --keep-work-dir)",
         )
         parser.add_argument(
             "--methods",
@@ -258,16 +278,27 @@ def sync_command(args=None):
             action="store_true",
             help="Don't create backup files",
         )
+        parser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Write all the changes concurrently as one transaction, with a journal instead of backup files",
+        )
         parser.add_argument(
             "--keep-work-dir",
             action="store_true",
-            help="Keep working directory after completion",
+            help="Write intermediate files (converted entries, matches) to the working directory",
         )
         parser.add_argument(
             "--no-copy-source",
             action="store_true",
             help="Disable copying of original Bioconductor JSON files to data directory",
         )
+        parser.add_argument(
+            "--index",
+            default=None,
+            help="SQLite identity index of the existing bio.tools entries, to only "
+            "reload the entries changed since the previous run",
+        )
         args = parser.parse_args()
 
     # Validate methods
@@ -289,15 +320,19 @@ def sync_command(args=None):
         print("STEP 1: CONVERT")
         print("=" * 60)
 
-        converted_files = batch_convert(
+        # Entries stay in memory; they are written only for debugging
+        converted_entries = convert_entries(
             input_dir=args.input_dir,
             output_dir=str(converted_dir),
             existing_biotools_dir=args.bt_files_dir,
+            num_workers=args.workers,
+            write=args.keep_work_dir,
         )
-        print(f"Converted {len(converted_files)} packages")
-        print(f"Output written to: {converted_dir}")
+        print(f"Converted {len(converted_entries)} packages")
+        if args.keep_work_dir:
+            print(f"Output written to: {converted_dir}")
 
-        if not converted_files:
+        if not converted_entries:
             print("No packages converted. Exiting.")
             return 0
 
@@ -309,6 +344,12 @@ def sync_command(args=None):
         pattern1 = f"{args.bt_files_dir}/*/*.biotools.json"
         pattern2 = f"{converted_dir}/*.biotools.json"
 
+        # With an identity index, existing entries are only read when updated
+        existing_entries = None
+        if not args.index:
+            existing_entries = load_dataset(
+                pattern1, args.workers, "Loading existing bio.tools entries"
+            )
         results = compare_files(
             pattern1=pattern1,
             pattern2=pattern2,
@@ -316,12 +357,16 @@ def sync_command(args=None):
             upset1_path=args.upset1,
             upset2_path=args.upset2,
             num_workers=args.workers,
+            json_data1=existing_entries,
+            json_data2=converted_entries,
+            index_path=args.index,
         )
 
         # Save results
-        with open(results_file, "w") as f:
-            json.dump(results, f, indent=2)
-        print(f"\nResults saved to: {results_file}")
+        if args.keep_work_dir:
+            with open(results_file, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"\nResults saved to: {results_file}")
 
         # Print comparison summary
         for method, matches in results.get("match_results", {}).items():
@@ -347,36 +392,36 @@ def sync_command(args=None):
             backup=not args.no_backup,
             copy_source=not args.no_copy_source,
             bioc_files_dir=args.input_dir,
+            converted_entries=converted_entries,
+            existing_entries=existing_entries,
+            parallel=args.parallel,
+            workers=args.workers,
         )
 
         print("\nUPDATE SUMMARY")
         print("-" * 40)
         print(f"Created: {len(summary['created'])}")
         print(f"Updated: {len(summary['updated'])}")
+        print(f"Unchanged: {len(summary['unchanged'])}")
         print(f"Errors: {len(summary['errors'])}")
 
         # Full workflow summary
         print("\n" + "=" * 60)
         print("WORKFLOW COMPLETE")
         print("=" * 60)
-        print(f"Converted: {len(converted_files)} packages")
+        print(f"Converted: {len(converted_entries)} packages")
         print(
             f"Matched: {sum(len(m) for m in results.get('match_results', {}).values())} entries"
         )
         print(f"Created: {len(summary['created'])} new entries")
         print(f"Updated: {len(summary['updated'])} existing entries")
+        print(f"Unchanged: {len(summary['unchanged'])} existing entries")
 
         if args.dry_run:
             print("\n[DRY RUN - No changes made]")
 
-        # Clean up working directory unless requested to keep
-        if not args.keep_work_dir and not args.dry_run:
-            import shutil
-
-            shutil.rmtree(work_dir)
-            print(f"\nCleaned up working directory: {work_dir}")
-        else:
-            print(f"\nWorking directory preserved: {work_dir}")
+        if args.keep_work_dir:
+            print(f"\nIntermediate files kept in: {work_dir}")
 
         return 0
 
@@ -408,7 +453,7 @@ def main():
     sync_parser.add_argument(
         "--work-dir",
         default="bc2bt_work",
-        help="Working directory for intermediate files",
+        help="Working directory for intermediate files (with --keep-work-dir)",
     )
     sync_parser.add_argument(
         "--methods",
@@ -442,16 +487,27 @@ def main():
         action="store_true",
         help="Don't create backup files",
     )
+    sync_parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Write all the changes concurrently as one transaction, with a journal instead of backup files",
+    )
     sync_parser.add_argument(
         "--keep-work-dir",
         action="store_true",
-        help="Keep working directory after completion",
+        help="Write intermediate files (converted entries, matches) to the working directory",
     )
     sync_parser.add_argument(
         "--no-copy-source",
         action="store_true",
         help="Disable copying of original Bioconductor JSON files to data directory",
     )
+    sync_parser.add_argument(
+        "--index",
+        default=None,
+        help="SQLite identity index of the existing bio.tools entries, to only "
+        "reload the entries changed since the previous run",
+    )
 
     # Convert command
     convert_parser = subparsers.add_parser(
@@ -465,6 +521,12 @@ def main():
         default=None,
         help="Directory with existing bio.tools entries to merge",
     )
+    convert_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parallel workers",
+    )
 
     # Compare command
     compare_parser = subparsers.add_parser(
@@ -484,6 +546,27 @@ def main():
         default="matches.json",
         help="Output file for results",
     )
+    compare_parser.add_argument(
+        "--upset1",
+        default=None,
+        help="Path to save UpSet plot for first set",
+    )
+    compare_parser.add_argument(
+        "--upset2",
+        default=None,
+        help="Path to save UpSet plot for second set",
+    )
+    compare_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parallel workers",
+    )
+    compare_parser.add_argument(
+        "--index",
+        default=None,
+        help="SQLite identity index, to only reload the files changed since the previous run",
+    )
 
     # Update command
     update_parser = subparsers.add_parser(
@@ -503,6 +586,11 @@ def main():
         action="store_true",
         help="Don't create backup files before updating",
     )
+    update_parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Write all the changes concurrently as one transaction, with a journal instead of backup files",
+    )
     update_parser.add_argument(
         "--no-copy-source",
         action="store_true",
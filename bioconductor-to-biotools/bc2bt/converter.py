@@ -4,9 +4,10 @@ Converter module for transforming Bioconductor metadata to bio.tools format.
 
 import re
 import json
+from html import unescape
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
-from typing import Optional
-from bs4 import BeautifulSoup
+from typing import Dict, Optional, Tuple
 from .license_normalizer import normalize_license
 
 # Fields to preserve when updating existing bio.tools entries
@@ -19,6 +20,12 @@ PRESERVED_FIELDS = [
     "function",
 ]
 
+# href attribute values of <a> tags, double-, single- or un-quoted
+LINK_HREF_PATTERN = re.compile(
+    r"""<a\s[^>]*?(?<![\w-])href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""",
+    re.IGNORECASE,
+)
+
 
 def process_authors(author_str: str) -> list:
     """
@@ -147,10 +154,9 @@ def extract_publications(citation_html: str) -> list:
         List of publication dictionaries with DOI entries
     """
     publications = []
-    soup = BeautifulSoup(citation_html, "html.parser")
 
-    for link in soup.find_all("a", href=True):
-        href = link["href"].strip()
+    for match in LINK_HREF_PATTERN.finditer(citation_html):
+        href = unescape(next(g for g in match.groups() if g is not None)).strip()
         if "doi.org" in href:
             doi = href.split("doi.org/")[-1]
             # not updating the publications for now because this is ignored and overwritten by bio.tools
@@ -182,58 +188,128 @@ def merge_with_existing(new_data: dict, existing_data: dict) -> dict:
     return result
 
 
-def batch_convert(
+def convert_file(json_file: Path, existing_biotools_dir: Optional[str] = None) -> dict:
+    """
+    Load and convert one Bioconductor JSON file, with its citation HTML and
+    existing bio.tools entry when available.
+
+    Args:
+        json_file: Path to the Bioconductor .json file
+        existing_biotools_dir: Optional directory with existing bio.tools entries for merging
+
+    Returns:
+        bio.tools formatted dictionary
+    """
+    base_name = json_file.stem
+    citation_file = json_file.parent / f"{base_name}.citation.html"
+
+    # Load Bioconductor data
+    with open(json_file, "r", encoding="utf-8") as f:
+        bioc_data = json.load(f)
+
+    # Load citation HTML if available
+    citation_html = None
+    if citation_file.exists():
+        with open(citation_file, "r", encoding="utf-8") as f:
+            citation_html = f.read()
+
+    # Load existing bio.tools entry if available
+    existing_data = None
+    if existing_biotools_dir:
+        biotools_id = get_biotools_id(bioc_data)
+        existing_file = Path(existing_biotools_dir) / f"{biotools_id}.biotools.json"
+        if existing_file.exists():
+            with open(existing_file, "r", encoding="utf-8") as f:
+                existing_data = json.load(f)
+
+    return convert_package(bioc_data, citation_html, existing_data)
+
+
+def _convert_file_task(task: Tuple[Path, Optional[str]]) -> dict:
+    """Helper function for parallel conversion."""
+    return convert_file(*task)
+
+
+def convert_entries(
     input_dir: str,
-    output_dir: str,
+    output_dir: str = "converted",
     existing_biotools_dir: Optional[str] = None,
-) -> list:
+    num_workers: Optional[int] = None,
+    write: bool = False,
+) -> Dict[str, dict]:
     """
-    Batch convert all Bioconductor JSON files in input directory.
+    Convert all Bioconductor JSON files in input directory, in memory.
+
+    Packages are converted by a pool of worker processes, which send the
+    converted dictionaries back to the main process.
 
     Args:
         input_dir: Directory containing Bioconductor .json files and .citation.html files
-        output_dir: Directory to write converted bio.tools JSON files
+        output_dir: Directory the converted bio.tools JSON files belong to
         existing_biotools_dir: Optional directory with existing bio.tools entries for merging
+        num_workers: Number of worker processes (default: up to 8, 1 converts in-process)
+        write: If True, also write the converted entries to output_dir
 
     Returns:
-        List of output file paths created
+        Dictionary mapping output file paths to converted entries, which can be
+        passed to compare_files() and update_entries() as is
     """
+    if num_workers is None:
+        num_workers = min(cpu_count(), 8)
+
     input_path = Path(input_dir)
     output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-
-    output_files = []
+    if write:
+        output_path.mkdir(parents=True, exist_ok=True)
+
+    tasks = [
+        (json_file, existing_biotools_dir)
+        for json_file in input_path.glob("*.bioconductor.json")
+    ]
+    num_workers = max(1, min(num_workers, len(tasks)))
+
+    if num_workers == 1:
+        return _collect_converted(map(_convert_file_task, tasks), output_path, write)
+
+    chunksize = max(1, len(tasks) // (num_workers * 4))
+    with Pool(num_workers) as pool:
+        return _collect_converted(
+            pool.imap(_convert_file_task, tasks, chunksize), output_path, write
+        )
 
-    for json_file in input_path.glob("*.bioconductor.json"):
-        base_name = json_file.stem
-        citation_file = input_path / f"{base_name}.citation.html"
 
-        # Load Bioconductor data
-        with open(json_file, "r", encoding="utf-8") as f:
-            bioc_data = json.load(f)
+def _collect_converted(entries, output_path: Path, write: bool) -> Dict[str, dict]:
+    """Key converted entries by output path, writing them as they come if asked."""
+    converted = {}
+    for processed in entries:
+        output_file = output_path / f"{processed['biotoolsID']}.biotools.json"
+        if write:
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(processed, f, indent=4)
 
-        # Load citation HTML if available
-        citation_html = None
-        if citation_file.exists():
-            with open(citation_file, "r", encoding="utf-8") as f:
-                citation_html = f.read()
+        converted[str(output_file)] = processed
+    return converted
 
-        # Load existing bio.tools entry if available
-        existing_data = None
-        if existing_biotools_dir:
-            biotools_id = get_biotools_id(bioc_data)
-            existing_file = Path(existing_biotools_dir) / f"{biotools_id}.biotools.json"
-            if existing_file.exists():
-                with open(existing_file, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
 
-        # Convert package
-        processed = convert_package(bioc_data, citation_html, existing_data)
+def batch_convert(
+    input_dir: str,
+    output_dir: str,
+    existing_biotools_dir: Optional[str] = None,
+    num_workers: Optional[int] = None,
+) -> list:
+    """
+    Batch convert all Bioconductor JSON files in input directory.
 
-        # Write output
-        output_file = output_path / f"{processed['biotoolsID']}.biotools.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(processed, f, indent=4)
+    Args:
+        input_dir: Directory containing Bioconductor .json files and .citation.html files
+        output_dir: Directory to write converted bio.tools JSON files
+        existing_biotools_dir: Optional directory with existing bio.tools entries for merging
+        num_workers: Number of worker processes (default: up to 8, 1 converts in-process)
 
-        output_files.append(str(output_file))
-    return output_files
+    Returns:
+        List of output file paths created
+    """
+    converted = convert_entries(
+        input_dir, output_dir, existing_biotools_dir, num_workers, write=True
+    )
+    return list(converted)
@@ -1,13 +1,35 @@
 import dateutil.parser
 import requests
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import cached, get_cache, normalize_doi
 
 logger = logging.getLogger(__name__)
 
+RESOLVER = "crossref"
+API_URL = "https://api.crossref.org/works"
+# CrossRef accepts many filters per query, but keeps URLs reasonable up to ~50
+BATCH_SIZE = 50
+# Concurrent requests allowed in the CrossRef polite pool
+MAX_WORKERS = 3
+TIMEOUT = 30
+USER_AGENT = "bc2bt (https://github.com/research-software-ecosystem/utils)"
+# Fields of a work used by parse_work()
+SELECT = (
+    "DOI,title,abstract,container-title,short-container-title,published-print,"
+    "published-online,published,author,is-referenced-by-count"
+)
+
 
+@cached(RESOLVER)
 def get_publication_metadata(doi):
     """
     Fetch publication metadata based on DOI using CrossRef API.
+    Results are cached, see bc2bt.cache.
 
     Args:
         doi (str): Digital Object Identifier (with or without 'doi:' prefix)
@@ -25,9 +47,9 @@ def get_publication_metadata(doi):
             return None
 
         # Fetch data from CrossRef API
-        url = f"https://api.crossref.org/works/{clean_doi}"
+        url = f"{API_URL}/{clean_doi}"
         headers = {"Accept": "application/json"}
-        response = requests.get(url, headers=headers)
+        response = requests.get(url, headers=headers, timeout=TIMEOUT)
 
         if response.status_code != 200:
             logger.error(
@@ -41,65 +63,224 @@ def get_publication_metadata(doi):
             logger.error(f"No metadata found for DOI {clean_doi}")
             return None
 
-        # Extract metadata
-        title = data.get("title", [""])[0] if data.get("title") else ""
-        abstract = data.get("abstract", "")
-        journal = ""
-        authors = []
-        date = None
-        citation_count = data.get("is-referenced-by-count", None)
-
-        # Extract journal
-        if "container-title" in data and data["container-title"]:
-            journal = data["container-title"][0]
-        elif "short-container-title" in data and data["short-container-title"]:
-            journal = data["short-container-title"][0]
-
-        # Extract date
-        try:
-            if "published-print" in data and "date-parts" in data["published-print"]:
-                date_parts = data["published-print"]["date-parts"][0]
-            elif (
-                "published-online" in data and "date-parts" in data["published-online"]
-            ):
-                date_parts = data["published-online"]["date-parts"][0]
-            elif "published" in data and "date-parts" in data["published"]:
-                date_parts = data["published"]["date-parts"][0]
-            else:
-                date_parts = None
-
-            if date_parts:
-                # date_parts is [year, month, day] but may have fewer elements
-                date_str = "-".join(
-                    str(p).zfill(2) if i > 0 else str(p)
-                    for i, p in enumerate(date_parts)
-                )
-                date = dateutil.parser.parse(date_str).isoformat()
-        except (KeyError, TypeError, ValueError) as e:
-            logger.warning(f"Publication date not available for DOI {clean_doi}: {e}")
-
-        # Extract authors
-        try:
-            for author in data.get("author", []):
-                if "family" in author:
-                    given = author.get("given", "")
-                    family = author.get("family", "")
-                    name = f"{given} {family}".strip() if given else family
-                    authors.append({"name": name})
-                elif "name" in author:
-                    authors.append({"name": author["name"]})
-        except (KeyError, TypeError) as e:
-            logger.warning(f"Authors not available for DOI {clean_doi}: {e}")
-
-        return {
-            "abstract": abstract,
-            "authors": authors,
-            "citationCount": citation_count,
-            "date": date,
-            "journal": journal,
-            "title": title,
-        }
+        return parse_work(data, clean_doi)
 
     except Exception as e:
         logger.error(f"Error fetching metadata for DOI {doi}: {str(e)}")
         return None
+
+
+def make_session(mailto=None, max_workers=MAX_WORKERS):
+    """
+    Create a requests session for the CrossRef API, with a connection pool
+    for concurrent requests, retries with backoff on rate limiting and server
+    errors (honouring Retry-After), and the headers of the polite pool.
+
+    Args:
+        mailto (str): Contact email sent to CrossRef; defaults to the
+            CROSSREF_MAILTO environment variable
+        max_workers (int): Number of concurrent requests to pool connections for
+
+    Returns:
+        requests.Session: The configured session
+    """
+    mailto = mailto or os.environ.get("CROSSREF_MAILTO")
+    retry = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=max_workers, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Accept": "application/json",
+            "User-Agent": f"{USER_AGENT[:-1]}; mailto:{mailto})"
+            if mailto
+            else USER_AGENT,
+        }
+    )
+    return session
+
+
+def _fetch_batch(session, batch):
+    """
+    Fetch the works of a batch of DOIs with a single filter query.
+
+    Args:
+        session (requests.Session): Session created by make_session()
+        batch (list): Normalized DOIs, without commas
+
+    Returns:
+        dict: Work records keyed by normalized DOI; empty if the query failed
+    """
+    params = {
+        "filter": ",".join(f"doi:{doi}" for doi in batch),
+        "rows": len(batch),
+        "select": SELECT,
+    }
+    try:
+        response = session.get(API_URL, params=params, timeout=TIMEOUT)
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch metadata for {len(batch)} DOIs: {e}")
+        return {}
+
+    if response.status_code != 200:
+        logger.error(
+            f"Failed to fetch metadata for {len(batch)} DOIs: HTTP {response.status_code}"
+        )
+        return {}
+
+    try:
+        data = response.json()
+    except ValueError as e:
+        logger.error(f"Failed to parse metadata for {len(batch)} DOIs: {e}")
+        return {}
+
+    items = data.get("message", {}).get("items", [])
+    return {normalize_doi(item["DOI"]): item for item in items if item.get("DOI")}
+
+
+def get_publication_metadata_batch(
+    dois, mailto=None, batch_size=BATCH_SIZE, max_workers=MAX_WORKERS
+):
+    """
+    Fetch publication metadata of many DOIs using CrossRef API, with one
+    ``filter=doi:...,doi:...`` query per batch of DOIs. Batches are fetched
+    concurrently over a pooled session, see make_session().
+
+    Args:
+        dois (iterable): Digital Object Identifiers (with or without 'doi:' prefix)
+        mailto (str): Contact email for the CrossRef polite pool; defaults to
+            the CROSSREF_MAILTO environment variable
+        batch_size (int): Maximum number of DOIs per query
+        max_workers (int): Maximum number of concurrent queries
+
+    Returns:
+        dict: Publication metadata of each DOI, as returned by
+              get_publication_metadata(), keyed by the DOIs as given. Values
+              are None for DOIs whose metadata was not found. Cached metadata
+              is not fetched again.
+    """
+    clean_dois = {
+        doi: normalize_doi(doi) if doi and doi.strip() else None for doi in dois
+    }
+    cache = get_cache()
+    cached_metadata = cache.get_many(RESOLVER, filter(None, clean_dois.values()))
+    # A comma would split the filter
+    unique = [
+        clean_doi
+        for clean_doi in dict.fromkeys(clean_dois.values())
+        if clean_doi and "," not in clean_doi and clean_doi not in cached_metadata
+    ]
+    batches = [unique[i : i + batch_size] for i in range(0, len(unique), batch_size)]
+    logger.info(
+        f"Fetching {len(unique)} DOIs from CrossRef in {len(batches)} queries, "
+        f"{len(cached_metadata)} cached"
+    )
+
+    works = {}
+    with make_session(mailto, max_workers) as session:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for batch_works in pool.map(
+                lambda batch: _fetch_batch(session, batch), batches
+            ):
+                works.update(batch_works)
+
+    results = {}
+    fetched = {}
+    for doi, clean_doi in clean_dois.items():
+        if not clean_doi:
+            logger.error("No DOI provided")
+            results[doi] = None
+        elif clean_doi in cached_metadata:
+            results[doi] = cached_metadata[clean_doi]
+        elif "," in clean_doi:
+            results[doi] = get_publication_metadata(clean_doi)
+        elif clean_doi not in works:
+            logger.error(f"No metadata found for DOI {clean_doi}")
+            results[doi] = None
+        else:
+            if clean_doi not in fetched:
+                try:
+                    fetched[clean_doi] = parse_work(works[clean_doi], clean_doi)
+                except Exception as e:
+                    logger.error(f"Error parsing metadata for DOI {clean_doi}: {e}")
+                    fetched[clean_doi] = None
+            results[doi] = fetched[clean_doi]
+    cache.set_many(
+        RESOLVER, [(doi, metadata) for doi, metadata in fetched.items() if metadata]
+    )
+    return results
+
+
+def parse_work(data, clean_doi):
+    """
+    Normalise a CrossRef work record.
+
+    Args:
+        data (dict): Work record, as in the "message" of the works API
+        clean_doi (str): DOI of the work, for log messages
+
+    Returns:
+        dict: Publication metadata with keys: abstract, authors, citationCount,
+              date, journal, title.
+    """
+    title = data.get("title", [""])[0] if data.get("title") else ""
+    abstract = data.get("abstract", "")
+    journal = ""
+    authors = []
+    date = None
+    citation_count = data.get("is-referenced-by-count", None)
+
+    # Extract journal
+    if "container-title" in data and data["container-title"]:
+        journal = data["container-title"][0]
+    elif "short-container-title" in data and data["short-container-title"]:
+        journal = data["short-container-title"][0]
+
+    # Extract date
+    try:
+        if "published-print" in data and "date-parts" in data["published-print"]:
+            date_parts = data["published-print"]["date-parts"][0]
+        elif "published-online" in data and "date-parts" in data["published-online"]:
+            date_parts = data["published-online"]["date-parts"][0]
+        elif "published" in data and "date-parts" in data["published"]:
+            date_parts = data["published"]["date-parts"][0]
+        else:
+            date_parts = None
+
+        if date_parts:
+            # date_parts is [year, month, day] but may have fewer elements
+            date_str = "-".join(
+                str(p).zfill(2) if i > 0 else str(p) for i, p in enumerate(date_parts)
+            )
+            date = dateutil.parser.parse(date_str).isoformat()
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Publication date not available for DOI {clean_doi}: {e}")
+
+    # Extract authors
+    try:
+        for author in data.get("author", []):
+            if "family" in author:
+                given = author.get("given", "")
+                family = author.get("family", "")
+                name = f"{given} {family}".strip() if given else family
+                authors.append({"name": name})
+            elif "name" in author:
+                authors.append({"name": author["name"]})
+    except (KeyError, TypeError) as e:
+        logger.warning(f"Authors not available for DOI {clean_doi}: {e}")
+
+    return {
+        "abstract": abstract,
+        "authors": authors,
+        "citationCount": citation_count,
+        "date": date,
+        "journal": journal,
+        "title": title,
+    }
@@ -1,19 +1,14 @@
 import dateutil.parser
 import requests
-import requests_cache
 import logging
 from bs4 import BeautifulSoup
 import re
 
+from .cache import cached
+
 logger = logging.getLogger(__name__)
 
-# Install cache for requests to doi.org
-# Cache expires after 30 days
-requests_cache.install_cache(
-    cache_name="doi_cache",
-    backend="sqlite",
-    expire_after=2592000,  # 30 days in seconds
-)
+RESOLVER = "doi"
 
 
 def clean_jats_abstract(jats_text):
@@ -59,10 +54,11 @@ def clean_jats_abstract(jats_text):
         return text
 
 
+@cached(RESOLVER)
 def get_publication_metadata(doi):
     """
     Fetch publication metadata based on DOI using doi.org content negotiation.
-    Results are cached for 30 days to avoid repeated requests.
+    Results are cached for 30 days to avoid repeated requests, see bc2bt.cache.
 
     Args:
         doi (str): Digital Object Identifier (with or without 'doi:' prefix)
@@ -85,10 +81,6 @@ def get_publication_metadata(doi):
         headers = {"Accept": "application/vnd.citationstyles.csl+json"}
         response = requests.get(url, headers=headers)
 
-        # Log if response came from cache
-        if hasattr(response, "from_cache") and response.from_cache:
-            logger.debug(f"Retrieved metadata for DOI {clean_doi} from cache")
-
         if response.status_code != 200:
             logger.error(
                 f"Failed to fetch metadata for DOI {clean_doi}: HTTP {response.status_code}"
@@ -2,12 +2,24 @@ import dateutil.parser
 import requests
 import logging
 
+from .cache import cached, get_cache, normalize_doi
+
 logger = logging.getLogger(__name__)
 
+RESOLVER = "europepmc"
+SEARCH_URL = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
+# DOIs OR-ed in one query; keeps the query URL well below server limits
+BATCH_SIZE = 100
+# Largest page size of the search API
+PAGE_SIZE = 1000
+TIMEOUT = 30
+
 
+@cached(RESOLVER)
 def get_publication_metadata(doi):
     """
     Fetch publication metadata based on DOI.
+    Results are cached, see bc2bt.cache.
 
     Args:
         doi (str): Digital Object Identifier (with or without 'doi:' prefix)
@@ -25,7 +37,7 @@ def get_publication_metadata(doi):
             return None
 
         # Fetch data from Europe PMC
-        url = f"https://www.ebi.ac.uk/europepmc/webservices/rest/search?query=DOI:{clean_doi}&format=json&resultType=core"
+        url = f"{SEARCH_URL}?query=DOI:{clean_doi}&format=json&resultType=core"
         headers = {"Accept": "application/json"}
         response = requests.get(url, headers=headers)
 
@@ -41,47 +53,172 @@ def get_publication_metadata(doi):
             logger.error(f"No metadata found for DOI {clean_doi}")
             return None
 
-        data = results[0]
+        return parse_result(results[0], clean_doi)
 
-        # Extract metadata
-        title = data.get("title", "")
-        abstract = data.get("abstractText", "")
-        journal = ""
-        authors = []
-        date = None
-        citation_count = None
+    except Exception as e:
+        logger.error(f"Error fetching metadata for DOI {doi}: {str(e)}")
+        return None
 
-        try:
-            journal = data["journalInfo"]["journal"]["title"]
-        except (KeyError, TypeError):
-            logger.warning(f"Journal not available for DOI {clean_doi}")
 
-        try:
-            date = dateutil.parser.parse(data["journalInfo"]["printPublicationDate"])
-            date = date.isoformat()
-        except (KeyError, TypeError, ValueError):
-            logger.warning(f"Publication date not available for DOI {clean_doi}")
+def _search(session, query):
+    """
+    Fetch all the results of a search, following cursorMark pages.
+
+    Args:
+        session (requests.Session): Session used for the requests
+        query (str): Europe PMC search query
 
+    Returns:
+        list: Result records, empty if a request failed
+    """
+    results = []
+    cursor = "*"
+    while True:
+        params = {
+            "query": query,
+            "format": "json",
+            "resultType": "core",
+            "pageSize": PAGE_SIZE,
+            "cursorMark": cursor,
+        }
         try:
-            for author in data["authorList"]["author"]:
-                authors.append({"name": author["fullName"]})
-        except (KeyError, TypeError):
-            logger.warning(f"Authors not available for DOI {clean_doi}")
+            response = session.get(SEARCH_URL, params=params, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            logger.error(f"Failed to search Europe PMC: {e}")
+            return []
+
+        if response.status_code != 200:
+            logger.error(f"Failed to search Europe PMC: HTTP {response.status_code}")
+            return []
 
         try:
-            citation_count = data["citedByCount"]
-        except KeyError:
-            logger.warning(f"Citation count not available for DOI {clean_doi}")
-
-        return {
-            "abstract": abstract,
-            "authors": authors,
-            "citationCount": citation_count,
-            "date": date,
-            "journal": journal,
-            "title": title,
-        }
+            data = response.json()
+        except ValueError as e:
+            logger.error(f"Failed to parse Europe PMC search results: {e}")
+            return []
 
-    except Exception as e:
-        logger.error(f"Error fetching metadata for DOI {doi}: {str(e)}")
-        return None
+        page = data.get("resultList", {}).get("result", [])
+        results.extend(page)
+        next_cursor = data.get("nextCursorMark")
+        if len(page) < PAGE_SIZE or not next_cursor or next_cursor == cursor:
+            return results
+        cursor = next_cursor
+
+
+def get_publication_metadata_batch(dois, batch_size=BATCH_SIZE):
+    """
+    Fetch publication metadata of many DOIs, with one Europe PMC search per
+    batch of DOIs combined with OR.
+
+    Args:
+        dois (iterable): Digital Object Identifiers (with or without 'doi:' prefix)
+        batch_size (int): Maximum number of DOIs per search
+
+    Returns:
+        dict: Publication metadata of each DOI, as returned by
+              get_publication_metadata(), keyed by the DOIs as given. Values
+              are None for DOIs whose metadata was not found. Cached metadata
+              is not fetched again.
+    """
+    clean_dois = {
+        doi: normalize_doi(doi) if doi and doi.strip() else None for doi in dois
+    }
+    cache = get_cache()
+    cached_metadata = cache.get_many(RESOLVER, filter(None, clean_dois.values()))
+    # A quote would end the quoted term early
+    unique = [
+        clean_doi
+        for clean_doi in dict.fromkeys(clean_dois.values())
+        if clean_doi and '"' not in clean_doi and clean_doi not in cached_metadata
+    ]
+    batches = [unique[i : i + batch_size] for i in range(0, len(unique), batch_size)]
+    logger.info(
+        f"Fetching {len(unique)} DOIs from Europe PMC in {len(batches)} searches, "
+        f"{len(cached_metadata)} cached"
+    )
+
+    found = {}
+    with requests.Session() as session:
+        for batch in batches:
+            query = " OR ".join(f'DOI:"{doi}"' for doi in batch)
+            for result in _search(session, query):
+                # Keep the first result of a DOI, like get_publication_metadata()
+                if result.get("doi"):
+                    found.setdefault(normalize_doi(result["doi"]), result)
+
+    results = {}
+    fetched = {}
+    for doi, clean_doi in clean_dois.items():
+        if not clean_doi:
+            logger.error("No DOI provided")
+            results[doi] = None
+        elif clean_doi in cached_metadata:
+            results[doi] = cached_metadata[clean_doi]
+        elif '"' in clean_doi:
+            results[doi] = get_publication_metadata(clean_doi)
+        elif clean_doi not in found:
+            logger.error(f"No metadata found for DOI {clean_doi}")
+            results[doi] = None
+        else:
+            if clean_doi not in fetched:
+                try:
+                    fetched[clean_doi] = parse_result(found[clean_doi], clean_doi)
+                except Exception as e:
+                    logger.error(f"Error parsing metadata for DOI {clean_doi}: {e}")
+                    fetched[clean_doi] = None
+            results[doi] = fetched[clean_doi]
+    cache.set_many(
+        RESOLVER, [(doi, metadata) for doi, metadata in fetched.items() if metadata]
+    )
+    return results
+
+
+def parse_result(data, clean_doi):
+    """
+    Normalise a Europe PMC search result.
+
+    Args:
+        data (dict): Result record of a core search
+        clean_doi (str): DOI of the publication, for log messages
+
+    Returns:
+        dict: Publication metadata with keys: abstract, authors, citationCount,
+              date, journal, title.
+    """
+    title = data.get("title", "")
+    abstract = data.get("abstractText", "")
+    journal = ""
+    authors = []
+    date = None
+    citation_count = None
+
+    try:
+        journal = data["journalInfo"]["journal"]["title"]
+    except (KeyError, TypeError):
+        logger.warning(f"Journal not available for DOI {clean_doi}")
+
+    try:
+        date = dateutil.parser.parse(data["journalInfo"]["printPublicationDate"])
+        date = date.isoformat()
+    except (KeyError, TypeError, ValueError):
+        logger.warning(f"Publication date not available for DOI {clean_doi}")
+
+    try:
+        for author in data["authorList"]["author"]:
+            authors.append({"name": author["fullName"]})
+    except (KeyError, TypeError):
+        logger.warning(f"Authors not available for DOI {clean_doi}")
+
+    try:
+        citation_count = data["citedByCount"]
+    except KeyError:
+        logger.warning(f"Citation count not available for DOI {clean_doi}")
+
+    return {
+        "abstract": abstract,
+        "authors": authors,
+        "citationCount": citation_count,
+        "date": date,
+        "journal": journal,
+        "title": title,
+    }
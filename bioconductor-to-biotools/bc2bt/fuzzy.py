@@ -0,0 +1,177 @@
+"""
+Approximate matching of identity values with MinHash signatures and
+locality-sensitive hashing (LSH).
+
+The values of a fuzzy identity method are normalized strings. Each distinct
+string is split into shingles (character n-grams or word n-grams), summarized
+by a MinHash signature, and the signature is cut into bands. Strings sharing a
+band are candidates, and a candidate is only accepted when the exact Jaccard
+similarity of the shingle sets reaches the threshold of the method. Finding
+the matches of a value therefore costs a few dictionary lookups instead of a
+comparison with every other value.
+"""
+
+import re
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+# Prime above 2**32, the range of the shingle hashes
+PRIME = 4294967311
+# Number of values whose shingles are kept in memory, per method
+SHINGLE_CACHE_SIZE = 65536
+NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+WORD = re.compile(r"[0-9a-z]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase a text and collapse any run of other characters to a space."""
+    return NON_ALPHANUMERIC.sub(" ", text.lower()).strip()
+
+
+def char_shingles(text: str, n: int = 3) -> FrozenSet[str]:
+    """
+    Character n-grams of a text, ignoring spaces and punctuation, so that
+    e.g. "DESeq 2" and "DESeq2" have the same shingles.
+    """
+    text = f"^{text.replace(' ', '')}$"
+    if len(text) <= n:
+        return frozenset([text])
+    return frozenset(text[i : i + n] for i in range(len(text) - n + 1))
+
+
+def word_shingles(text: str, k: int = 3) -> FrozenSet[str]:
+    """Sequences of k consecutive words of a text."""
+    words = WORD.findall(text)
+    if len(words) <= k:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i : i + k]) for i in range(len(words) - k + 1))
+
+
+def url_shingles(url: str) -> FrozenSet[str]:
+    """
+    Successive path prefixes of a URL without protocol, so that URLs which
+    only differ by a trailing path segment are similar, while sibling pages
+    (e.g. two packages of the same repository) are not.
+    """
+    segments = [segment for segment in url.split("/") if segment]
+    return frozenset("/".join(segments[: i + 1]) for i in range(len(segments)))
+
+
+def jaccard(shingles1: FrozenSet[str], shingles2: FrozenSet[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not shingles1 or not shingles2:
+        return 0.0
+    common = len(shingles1 & shingles2)
+    return common / (len(shingles1) + len(shingles2) - common)
+
+
+class FuzzyMatcher:
+    """Shingling, MinHash/LSH parameters and threshold of a fuzzy method."""
+
+    def __init__(
+        self,
+        shingle: Callable[[str], FrozenSet[str]],
+        threshold: float,
+        bands: int = 16,
+        rows: int = 4,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            shingle: Function splitting a value into a set of shingles
+            threshold: Minimum Jaccard similarity of two matching values
+            bands: Number of LSH bands
+            rows: Number of signature rows per band; with the default 16 x 4,
+                pairs with a similarity of 0.6 are candidates 89% of the time,
+                and those with 0.8 more than 99.9%
+            seed: Seed of the MinHash permutations
+        """
+        self.shingle = lru_cache(maxsize=SHINGLE_CACHE_SIZE)(shingle)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.seed = seed
+        self._permutations = None
+
+    def similarity(self, value1: str, value2: str) -> float:
+        """Exact Jaccard similarity of two values."""
+        if value1 == value2:
+            return 1.0
+        return jaccard(self.shingle(value1), self.shingle(value2))
+
+    def matches(self, value1: str, value2: str) -> bool:
+        """Whether two values are similar enough to match."""
+        return self.similarity(value1, value2) >= self.threshold
+
+    def band_keys(self, value: str) -> List[bytes]:
+        """LSH band keys of the MinHash signature of a value."""
+        import numpy as np
+
+        shingles = self.shingle(value)
+        if not shingles:
+            return []
+        if self._permutations is None:
+            # numpy is only imported once fuzzy matching is used
+            rng = np.random.default_rng(self.seed)
+            size = self.bands * self.rows
+            self._permutations = (
+                rng.integers(1, 2**31, size, dtype=np.uint64)[:, None],
+                rng.integers(0, 2**31, size, dtype=np.uint64)[:, None],
+            )
+        a, b = self._permutations
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        # a * hash + b stays below 2**64, as a, b < 2**31 and hash < 2**32
+        signature = ((a * hashes + b) % PRIME).min(axis=1)
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def join(self, index: Dict[str, Iterable[int]]) -> "FuzzyJoin":
+        """
+        Build the approximate join of a reverse index.
+
+        Args:
+            index: Dictionary mapping values to the ids of the files having them
+
+        Returns:
+            FuzzyJoin mapping any value to the ids of the files with a similar one
+        """
+        return FuzzyJoin(self, index)
+
+
+class FuzzyJoin:
+    """
+    Dictionary-like approximate join: looking a value up returns the sorted
+    ids of the files whose value is similar to it, as verified with the exact
+    similarity of their shingles.
+    """
+
+    def __init__(self, matcher: FuzzyMatcher, index: Dict[str, Iterable[int]]):
+        self.matcher = matcher
+        self.index = {value: sorted(ids) for value, ids in index.items()}
+        self.buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(matcher.bands)]
+        for value in self.index:
+            for band, key in enumerate(matcher.band_keys(value)):
+                self.buckets[band].setdefault(key, []).append(value)
+        self._cache: Dict[str, List[int]] = {}
+
+    def candidates(self, value: str) -> set:
+        """Values sharing at least one LSH band with the given one."""
+        candidates = set()
+        for band, key in enumerate(self.matcher.band_keys(value)):
+            candidates.update(self.buckets[band].get(key, ()))
+        if value in self.index:
+            candidates.add(value)
+        return candidates
+
+    def get(self, value: str, default=None) -> Optional[List[int]]:
+        if value not in self._cache:
+            ids = set()
+            for candidate in self.candidates(value):
+                if self.matcher.matches(value, candidate):
+                    ids.update(self.index[candidate])
+            self._cache[value] = sorted(ids)
+        return self._cache[value] or default
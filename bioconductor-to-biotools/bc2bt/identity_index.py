@@ -0,0 +1,288 @@
+"""
+Persistent identity index for bio.tools files.
+
+Identity values are stored in a SQLite database, keyed on file path and
+validated against the file modification time, size and content hash, so that
+comparisons only load the files that changed since the previous run.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from multiprocessing import Pool, cpu_count
+from typing import Dict, List, Optional, Tuple
+
+from .mapper import (
+    PARALLEL_THRESHOLD,
+    build_reverse_index,
+    compute_identity_values,
+    parse_json,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the identity functions or the storage format change, to rebuild
+# existing indices from scratch.
+SCHEMA_VERSION = "1"
+
+# Status of an indexed file
+INVALID, INDEXED, EMPTY = 0, 1, 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    -- 0: not valid JSON, 1: indexed entry, 2: empty entry (nothing to index)
+    valid INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS identities (
+    path TEXT NOT NULL REFERENCES files (path) ON DELETE CASCADE,
+    method TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (path, method)
+);
+"""
+
+
+def encode_value(value) -> Optional[str]:
+    """Serialize an identity value (str, tuple or frozenset) to JSON."""
+    if value is None:
+        return None
+    if isinstance(value, (set, frozenset)):
+        return json.dumps({"set": sorted(value)})
+    if isinstance(value, tuple):
+        return json.dumps({"tuple": list(value)})
+    return json.dumps(value)
+
+
+def decode_value(text: Optional[str]):
+    """Inverse of encode_value()."""
+    if text is None:
+        return None
+    value = json.loads(text)
+    if isinstance(value, dict):
+        if "set" in value:
+            return frozenset(value["set"])
+        if "tuple" in value:
+            return tuple(value["tuple"])
+    return value
+
+
+def _scan_file(task: Tuple[str, Optional[str], List[str]]) -> tuple:
+    """
+    Hash a file and, if its content changed, compute its identity values.
+
+    Args:
+        task: Tuple of (file path, stored hash or None, identity methods)
+
+    Returns:
+        Tuple of (path, mtime_ns, size, sha1, status, identity values), with
+        status and identity values None when the stored values are still valid
+    """
+    filepath, known_sha1, identity_methods = task
+    stat = os.stat(filepath)
+    with open(filepath, "rb") as f:
+        content = f.read()
+    sha1 = hashlib.sha1(content).hexdigest()
+    if sha1 == known_sha1:
+        return filepath, stat.st_mtime_ns, stat.st_size, sha1, None, None
+
+    try:
+        json_data = parse_json(content)
+    except ValueError as e:
+        logger.error(f"Error loading {filepath}: {e}")
+        return filepath, stat.st_mtime_ns, stat.st_size, sha1, INVALID, {}
+
+    if not json_data:
+        return filepath, stat.st_mtime_ns, stat.st_size, sha1, EMPTY, {}
+    values = compute_identity_values(json_data, identity_methods)
+    return filepath, stat.st_mtime_ns, stat.st_size, sha1, INDEXED, values
+
+
+class IdentityIndex:
+    """SQLite-backed identity values of bio.tools files."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) an identity index.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        version = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'schema_version'"
+        ).fetchone()
+        if version is None or version[0] != SCHEMA_VERSION:
+            with self.conn:
+                self.conn.execute("DELETE FROM identities")
+                self.conn.execute("DELETE FROM files")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                    (SCHEMA_VERSION,),
+                )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _stored(self, identity_methods: List[str]) -> Tuple[dict, dict]:
+        """Stored file records, and the set of methods indexed for each file."""
+        files = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                "SELECT path, mtime_ns, size, sha1, valid FROM files"
+            )
+        }
+        methods = {}
+        placeholders = ",".join("?" * len(identity_methods))
+        for path, method in self.conn.execute(
+            f"SELECT path, method FROM identities WHERE method IN ({placeholders})",
+            identity_methods,
+        ):
+            methods.setdefault(path, set()).add(method)
+        return files, methods
+
+    def refresh(
+        self,
+        pattern: str,
+        identity_methods: List[str],
+        num_workers: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Bring the index up to date with the files matching a pattern.
+
+        Files whose modification time and size did not change are not read.
+        Files which were touched are hashed, and only reloaded when their
+        content changed. Records of files that no longer exist are removed.
+
+        Args:
+            pattern: File pattern for the bio.tools JSON files
+            identity_methods: List of identity methods to index
+            num_workers: Number of worker processes for parallel loading
+
+        Returns:
+            List of the files matching the pattern
+        """
+        paths = glob.glob(pattern)
+        files, methods = self._stored(identity_methods)
+        required = set(identity_methods)
+
+        tasks = []
+        for path in paths:
+            record = files.get(path)
+            # Invalid and empty files have no identities, they are complete as is
+            complete = record is not None and (
+                record[3] != INDEXED or required <= methods.get(path, set())
+            )
+            if complete:
+                stat = os.stat(path)
+                if (stat.st_mtime_ns, stat.st_size) == record[:2]:
+                    continue
+            tasks.append((path, record[2] if complete else None, identity_methods))
+
+        logger.info(
+            f"Identity index: {len(paths) - len(tasks)} unchanged files, "
+            f"{len(tasks)} to check in {pattern}"
+        )
+        if len(tasks) > PARALLEL_THRESHOLD:
+            if num_workers is None:
+                num_workers = min(cpu_count(), 8)
+            with Pool(num_workers) as pool:
+                results = pool.map(
+                    _scan_file, tasks, max(1, len(tasks) // (num_workers * 4))
+                )
+        else:
+            results = [_scan_file(task) for task in tasks]
+
+        current = set(paths)
+        with self.conn:
+            for path, mtime_ns, size, sha1, status, values in results:
+                if values is None:
+                    self.conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                        (mtime_ns, size, path),
+                    )
+                    continue
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                    (path, mtime_ns, size, sha1, status),
+                )
+                self.conn.execute("DELETE FROM identities WHERE path = ?", (path,))
+                if status == INDEXED:
+                    self.conn.executemany(
+                        "INSERT INTO identities VALUES (?, ?, ?)",
+                        [
+                            (path, method, encode_value(values.get(method)))
+                            for method in identity_methods
+                        ],
+                    )
+            removed = [
+                (path,)
+                for path in files
+                if path not in current and not os.path.exists(path)
+            ]
+            self.conn.executemany("DELETE FROM files WHERE path = ?", removed)
+
+        reloaded = sum(1 for result in results if result[5] is not None)
+        logger.info(
+            f"Identity index: reloaded {reloaded} files, removed {len(removed)}"
+        )
+        return paths
+
+    def identity_index(
+        self,
+        pattern: str,
+        identity_methods: List[str],
+        num_workers: Optional[int] = None,
+    ) -> Tuple[List[str], Dict[str, dict], dict]:
+        """
+        Refresh the index for a pattern and return its identity data, in the
+        same shape as mapper.build_identity_index().
+
+        Args:
+            pattern: File pattern for the bio.tools JSON files
+            identity_methods: List of identity methods to use
+            num_workers: Number of worker processes for parallel loading
+
+        Returns:
+            Tuple of (valid file paths, identity_values, identity_indices)
+        """
+        paths = self.refresh(pattern, identity_methods, num_workers)
+
+        status = dict(self.conn.execute("SELECT path, valid FROM files"))
+        stored = {}
+        placeholders = ",".join("?" * len(identity_methods))
+        for path, method, value in self.conn.execute(
+            f"SELECT path, method, value FROM identities WHERE method IN ({placeholders})",
+            identity_methods,
+        ):
+            values = stored.setdefault(path, {})
+            if value is not None:
+                values[method] = decode_value(value)
+
+        # Keep the glob order, which decides the first match of each file
+        valid = [path for path in paths if status.get(path, INVALID) != INVALID]
+        identity_values = {
+            path: stored.get(path, {}) for path in valid if status[path] == INDEXED
+        }
+        return (
+            valid,
+            identity_values,
+            build_reverse_index(identity_values, identity_methods),
+        )
@@ -10,64 +10,22 @@ The new version recognises inputs such as:
     "LGPL (>= 2.1)"                        →  "LGPL-2.1-or-later"
     "BSD 3-clause License + file LICENSE" →  "BSD-3-Clause"
 
-Only the `normalize_license` function is part of the public API.
+Only the `normalize_license` and `normalize_licenses` functions are part of
+the public API.
 """
 
+import json
+import os
 import re
 import unicodedata
-import difflib
-from typing import Optional, Dict, Set
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 # ----------------------------------------------------------------------
-# 1️⃣  Full SPDX identifier set (copy‑paste from https://spdx.org/licenses/)
+# 1️⃣  Full SPDX licence and exception list, bundled with the package
+#     (refresh it with update_spdx_licenses.py)
 # ----------------------------------------------------------------------
-_SP_dx_IDS: Set[str] = {
-    "0BSD",
-    "AFL-1.1",
-    "AFL-1.2",
-    "AFL-2.0",
-    "AFL-2.1",
-    "AFL-3.0",
-    "AGPL-1.0-only",
-    "AGPL-1.0-or-later",
-    "AGPL-3.0-only",
-    "AGPL-3.0-or-later",
-    "Apache-2.0",
-    "Artistic-1.0",
-    "Artistic-2.0",
-    "BSD-2-Clause",
-    "BSD-3-Clause",
-    "BSD-4-Clause",
-    "CC0-1.0",
-    "CC-BY-4.0",
-    "CC-BY-NC-4.0",
-    "CC-BY-NC-ND-4.0",
-    "CC-BY-NC-SA-4.0",
-    "CC-BY-ND-4.0",
-    "CC-BY-SA-4.0",
-    "CDDL-1.0",
-    "CDDL-1.1",
-    "CECT-1.0",
-    "CPL-1.0",
-    "EPL-1.0",
-    "EPL-2.0",
-    "GPL-1.0-only",
-    "GPL-1.0-or-later",
-    "GPL-2.0-only",
-    "GPL-2.0-or-later",
-    "GPL-3.0-only",
-    "GPL-3.0-or-later",
-    "LGPL-2.0-only",
-    "LGPL-2.0-or-later",
-    "LGPL-2.1-only",
-    "LGPL-2.1-or-later",
-    "LGPL-3.0-only",
-    "LGPL-3.0-or-later",
-    "MIT",
-    "MPL-2.0",
-    "Unlicense",
-    "Zlib",
-}
+_SPDX_DATA = os.path.join(os.path.dirname(__file__), "data", "spdx_licenses.json")
 # ----------------------------------------------------------------------
 
 
@@ -121,14 +79,189 @@ _ALIAS_MAP: Dict[str, str] = {
 # ----------------------------------------------------------------------
 
 
+# ----------------------------------------------------------------------
+# 3️⃣  Precompiled regexes and lookup tables
+# ----------------------------------------------------------------------
+_PLUS_RE = re.compile(r"\+.*$")
+_FILE_RE = re.compile(r"file.*$")
+_SEPARATOR_RE = re.compile(r"[\s_]+")
+_INVALID_RE = re.compile(r"[^a-z0-9\-]")
+# Characters of SPDX identifiers, e.g. "EPL-2.0", "OLDAP-2.2.1"
+_INVALID_ID_RE = re.compile(r"[^a-z0-9.+\-]")
+_LATER_RE = re.compile(r">=|>|or[-\s]*later")
+_WITH_RE = re.compile(r"\s+with\s+", re.IGNORECASE)
+
+_FAMILIES = [
+    "gpl",
+    "lgpl",
+    "apache",
+    "bsd",
+    "mit",
+    "artistic",
+    "agpl",
+    "cc0",
+    "cc-by-nc-nd",
+    "cc-by-nc",
+    "cc-by-sa",
+    "cc-by",
+    "epl",
+    "cpl",
+]
+# (family, regex finding the family, regex finding its version)
+_FAMILY_RES = [
+    (
+        f,
+        re.compile(r"\b" + re.escape(f) + r"\b"),
+        re.compile(rf"{re.escape(f)}[^0-9]*([0-9]+(?:\.[0-9]+)?)"),
+    )
+    for f in _FAMILIES
+]
+
+# Cache of normalize_license() results for the built-in tables; Bioconductor
+# only has a few hundred distinct licence strings.
+_CACHE_SIZE = 4096
+
+
+class _SpdxIndex:
+    """
+    Lowercase lookup table of a SPDX identifier set, with the same identifiers
+    bucketed by length and indexed by trigram for the fuzzy fallback.
+    """
+
+    def __init__(self, spdx_ids: Iterable[str]):
+        self.by_lower: Dict[str, str] = {s.lower(): s for s in spdx_ids}
+        self.by_length: Dict[int, List[str]] = {}
+        self.by_trigram: Dict[str, List[str]] = {}
+        self.trigrams: Dict[str, Set[str]] = {}
+        for lowered in sorted(self.by_lower):
+            self.by_length.setdefault(len(lowered), []).append(lowered)
+            self.trigrams[lowered] = _trigrams(lowered)
+            for trigram in self.trigrams[lowered]:
+                self.by_trigram.setdefault(trigram, []).append(lowered)
+
+    def closest(self, candidate: str, cutoff: float) -> Optional[str]:
+        """
+        Most similar identifier to *candidate*, if their similarity reaches
+        *cutoff*. The similarity of two strings is ``1 - d / (len1 + len2)``
+        with *d* their insertion/deletion distance, i.e. the share of their
+        characters in a longest common subsequence. It is at least the ratio
+        of ``difflib``, whose matching blocks can miss part of that
+        subsequence, so a few strings match here that ``difflib`` rejects.
+
+        An insertion or deletion changes at most 3 trigrams of a string, so an
+        identifier within edit distance *d* of *candidate* shares all but
+        ``3 * d`` of its trigrams, and in particular one of any ``3 * d + 1``
+        of them: only the identifiers found under the rarest ones are
+        compared. The length buckets are scanned instead when the candidate
+        is too short for that filter.
+        """
+        # Largest edit distance within the cutoff, for each reachable length
+        bounds = {}
+        for length in self.by_length:
+            bound = _max_distance(cutoff, len(candidate) + length)
+            if abs(len(candidate) - length) <= bound:
+                bounds[length] = bound
+        if not bounds:
+            return None
+
+        trigrams = _trigrams(candidate)
+        prefix = 3 * max(bounds.values()) + 1
+        compared = set()
+        if len(trigrams) < prefix:
+            for length in bounds:
+                compared.update(self.by_length[length])
+        else:
+            rarest = sorted(trigrams, key=lambda t: len(self.by_trigram.get(t, ())))
+            for trigram in rarest[:prefix]:
+                for lowered in self.by_trigram.get(trigram, ()):
+                    bound = bounds.get(len(lowered))
+                    if (
+                        bound is not None
+                        and len(trigrams & self.trigrams[lowered])
+                        >= len(trigrams) - 3 * bound
+                    ):
+                        compared.add(lowered)
+
+        masks = _char_masks(candidate)
+        best, best_similarity = None, cutoff
+        for lowered in compared:
+            distance = _edit_distance(masks, len(candidate), lowered)
+            if distance > bounds[len(lowered)]:
+                continue
+            similarity = 1 - distance / (len(candidate) + len(lowered))
+            # Ties go to the greatest identifier, as in difflib
+            if similarity > best_similarity or (
+                similarity == best_similarity and (best is None or lowered > best)
+            ):
+                best, best_similarity = lowered, similarity
+        return self.by_lower[best] if best is not None else None
+
+
+def _trigrams(s: str) -> Set[str]:
+    s = f"^{s}$"
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+def _max_distance(similarity: float, total: int) -> int:
+    """Largest edit distance of two strings of *total* length with *similarity*."""
+    # The epsilon keeps e.g. (1 - 0.8) * 10 from rounding down to 1
+    return int((1 - similarity) * total + 1e-9)
+
+
+def _char_masks(s: str) -> Dict[str, int]:
+    """Bit mask of the positions of each character of *s*."""
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(s):
+        masks[char] = masks.get(char, 0) | 1 << i
+    return masks
+
+
+def _edit_distance(masks: Dict[str, int], length: int, other: str) -> int:
+    """
+    Edit distance counting insertions and deletions (a substitution costs 2)
+    between a string, given by its ``_char_masks`` and length, and *other*.
+    The length of their longest common subsequence is computed with the
+    bit-parallel algorithm of Allison and Dix, one integer operation per
+    character of *other*.
+    """
+    full = (1 << length) - 1
+    v = full
+    for char in other:
+        u = v & masks.get(char, 0)
+        v = ((v + u) | (v - u)) & full
+    common = length - bin(v).count("1")
+    return length + len(other) - 2 * common
+
+
+@lru_cache(maxsize=None)
+def _spdx_indices() -> Tuple[_SpdxIndex, _SpdxIndex]:
+    """
+    Indices of the current (non-deprecated) SPDX licence and exception
+    identifiers, loaded from the bundled list on first use.
+    """
+    with open(_SPDX_DATA, encoding="utf-8") as f:
+        data = json.load(f)
+    licenses = _SpdxIndex(
+        license["licenseId"]
+        for license in data["licenses"]
+        if not license["isDeprecatedLicenseId"]
+    )
+    exceptions = _SpdxIndex(
+        exception["licenseExceptionId"]
+        for exception in data["exceptions"]
+        if not exception["isDeprecatedLicenseId"]
+    )
+    return licenses, exceptions
+
+
 def _strip_noise(raw: str) -> str:
     """
     Remove the typical “+ file LICENSE”, “file …”, and trailing whitespace
     that are not part of the licence name itself.
     """
     s = raw.lower()
-    s = re.sub(r"\+.*$", "", s)  # drop “+ file LICENSE”
-    s = re.sub(r"file.*$", "", s)  # drop plain “file …”
+    s = _PLUS_RE.sub("", s)  # drop “+ file LICENSE”
+    s = _FILE_RE.sub("", s)  # drop plain “file …”
     return s.strip()
 
 
@@ -146,40 +279,20 @@ def _extract_family_version(raw: str) -> tuple:
     """
     low = raw.lower()
 
-    # ----- family -------------------------------------------------------
-    families = [
-        "gpl",
-        "lgpl",
-        "apache",
-        "bsd",
-        "mit",
-        "artistic",
-        "agpl",
-        "cc0",
-        "cc-by-nc-nd",
-        "cc-by-nc",
-        "cc-by-sa",
-        "cc-by",
-        "epl",
-        "cpl",
-    ]
-    family = None
-    for f in families:
-        if re.search(r"\b" + re.escape(f) + r"\b", low):
+    # ----- family and numeric version ----------------------------------
+    # Picks the first number after the family name (if any), something
+    # like “>= 2.1”, “==3”, “3.0”, “2” etc.
+    family, version = None, None
+    for f, family_re, version_re in _FAMILY_RES:
+        if family_re.search(low):
             family = f
+            m = version_re.search(low)
+            if m:
+                version = m.group(1)
             break
 
-    # ----- numeric version -----------------------------------------------
-    # Picks the first number after the family name (if any)
-    version = None
-    if family:
-        # look for something like “>= 2.1”, “==3”, “3.0”, “2” etc.
-        m = re.search(rf"{re.escape(family)}[^0-9]*([0-9]+(?:\.[0-9]+)?)", low)
-        if m:
-            version = m.group(1)
-
     # ----- later flag ----------------------------------------------------
-    later = bool(re.search(r">=|>|or[-\s]*later|or[-\s]*later", low))
+    later = bool(_LATER_RE.search(low))
 
     return family, version, later
 
@@ -192,12 +305,25 @@ def _clean_string_for_exact_match(raw: str) -> str:
     """
     s = _strip_noise(raw)  # drop “+ file …” etc.
     s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode()
-    s = re.sub(r"[\s_]+", "-", s)  # collapse space/underscore -> '-'
-    s = re.sub(r"[^a-z0-9\-]", "", s)  # keep only alphanum and '-'
+    s = _SEPARATOR_RE.sub("-", s)  # collapse space/underscore -> '-'
+    s = _INVALID_RE.sub("", s)  # keep only alphanum and '-'
     s = s.strip("-")
     return s.lower()
 
 
+def _clean_string_for_id_match(raw: str) -> str:
+    """
+    Normalise a licence string for the direct SPDX-identifier lookup: as
+    ``_clean_string_for_exact_match`` but keeping the dots (and plus signs)
+    of versions, so that "EPL-2.0" does not become "epl-20".
+    """
+    s = unicodedata.normalize("NFKD", raw.strip().lower())
+    s = s.encode("ascii", "ignore").decode()
+    s = _SEPARATOR_RE.sub("-", s)
+    s = _INVALID_ID_RE.sub("", s)
+    return s.strip("-")
+
+
 def _family_fallback(
     family: Optional[str], version: Optional[str], later: bool
 ) -> Optional[str]:
@@ -274,21 +400,86 @@ def _family_fallback(
 
 
 def _fuzzy_match(
-    candidate: str, spdx_set: Set[str], cutoff: float = 0.92
+    candidate: str, spdx_index: _SpdxIndex, cutoff: float = 0.92
 ) -> Optional[str]:
     """
-    Conservative fuzzy matcher – uses difflib and only returns a match if
-    the similarity ratio is >= *cutoff*.
+    Conservative fuzzy matcher – only returns a match if the similarity is
+    very high (default 0.92).
     """
-    lowered = {s.lower(): s for s in spdx_set}
-    matches = difflib.get_close_matches(
-        candidate.lower(), lowered.keys(), n=1, cutoff=cutoff
-    )
-    if matches:
-        return lowered[matches[0]]
+    return spdx_index.closest(candidate.lower(), cutoff)
+
+
+def _match_exception(raw_exception: str, cutoff: float) -> Optional[str]:
+    """SPDX licence exception identifier of a string, exact or fuzzy."""
+    exceptions = _spdx_indices()[1]
+    direct = exceptions.by_lower.get(_clean_string_for_id_match(raw_exception))
+    if direct:
+        return direct
+    cleaned = _clean_string_for_exact_match(raw_exception)
+    return exceptions.by_lower.get(cleaned) or exceptions.closest(cleaned, cutoff)
+
+
+def _normalize(
+    raw_license: str,
+    alias: Dict[str, str],
+    spdx_index: _SpdxIndex,
+    fuzzy_cutoff: float,
+) -> Optional[str]:
+    # ------------------------------------------------------------------
+    # 0️⃣ “<licence> WITH <exception>” expressions
+    # ------------------------------------------------------------------
+    parts = _WITH_RE.split(raw_license, maxsplit=1)
+    if len(parts) == 2:
+        license = _normalize(parts[0], alias, spdx_index, fuzzy_cutoff)
+        exception = _match_exception(parts[1], fuzzy_cutoff)
+        if license and exception:
+            return f"{license} WITH {exception}"
+
+    # ------------------------------------------------------------------
+    # 1️⃣ Try the *exact‑alias* table first (fast, 100 % confidence)
+    # ------------------------------------------------------------------
+    cleaned = _clean_string_for_exact_match(raw_license)
+    if cleaned in alias:
+        return alias[cleaned]
+
+    # ------------------------------------------------------------------
+    # 2️⃣ Direct SPDX‑ID match (case‑insensitive), with and without the
+    #     dots of versions
+    # ------------------------------------------------------------------
+    direct = spdx_index.by_lower.get(_clean_string_for_id_match(raw_license))
+    if direct:
+        return direct
+    if cleaned in spdx_index.by_lower:
+        return spdx_index.by_lower[cleaned]
+
+    # ------------------------------------------------------------------
+    # 3️⃣ Family‑based fallback – handles "GPL (>= 3)",
+    #     "Apache License (>= 2)", etc.
+    # ------------------------------------------------------------------
+    family, version, later = _extract_family_version(raw_license)
+    fallback = _family_fallback(family, version, later)
+    if fallback:
+        return fallback
+
+    # ------------------------------------------------------------------
+    # 4️⃣ Conservative fuzzy matcher (high cutoff)
+    # ------------------------------------------------------------------
+    fuzzy = _fuzzy_match(cleaned, spdx_index, cutoff=fuzzy_cutoff)
+    if fuzzy:
+        return fuzzy
+
+    # ------------------------------------------------------------------
+    # 5️⃣ No confident match – caller must decide what to do
+    # ------------------------------------------------------------------
     return None
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
+def _normalize_cached(raw_license: str, fuzzy_cutoff: float) -> Optional[str]:
+    """``_normalize`` with the built-in tables, memoized."""
+    return _normalize(raw_license, _ALIAS_MAP, _spdx_indices()[0], fuzzy_cutoff)
+
+
 def normalize_license(
     raw_license: str,
     *,
@@ -299,6 +490,8 @@ def normalize_license(
     """
     Convert a possibly noisy licence string to an SPDX identifier.
 
+    Results obtained with the built-in tables are memoized.
+
     Parameters
     ----------
     raw_license : str
@@ -306,7 +499,8 @@ def normalize_license(
     alias_map : dict | None
         Optional custom mapping; defaults to the built‑in ``_ALIAS_MAP``.
     spdx_ids : set | None
-        Optional SPDX identifier set; defaults to the built‑in ``_SP_dx_IDS``.
+        Optional SPDX identifier set; defaults to the current identifiers of
+        the bundled SPDX licence list.
     fuzzy_cutoff : float
         Minimum similarity (0‑1) required for the fuzzy fallback.
 
@@ -327,45 +521,51 @@ def normalize_license(
     >>> normalize_license('file LICENSE') is None
     True
     """
-    # ------------------------------------------------------------------
-    # 1️⃣ Choose data structures
-    # ------------------------------------------------------------------
+    if alias_map is None and spdx_ids is None:
+        return _normalize_cached(raw_license, fuzzy_cutoff)
     alias = alias_map if alias_map is not None else _ALIAS_MAP
-    spdx = spdx_ids if spdx_ids is not None else _SP_dx_IDS
+    spdx_index = _SpdxIndex(spdx_ids) if spdx_ids is not None else _spdx_indices()[0]
+    return _normalize(raw_license, alias, spdx_index, fuzzy_cutoff)
 
-    # ------------------------------------------------------------------
-    # 2️⃣ Try the *exact‑alias* table first (fast, 100 % confidence)
-    # ------------------------------------------------------------------
-    cleaned = _clean_string_for_exact_match(raw_license)
-    if cleaned in alias:
-        return alias[cleaned]
 
-    # ------------------------------------------------------------------
-    # 3️⃣ Direct SPDX‑ID match (case‑insensitive)
-    # ------------------------------------------------------------------
-    if cleaned.upper() in spdx:
-        return cleaned.upper()
+def normalize_licenses(
+    raw_licenses: Iterable[str],
+    *,
+    alias_map: Optional[Dict[str, str]] = None,
+    spdx_ids: Optional[Set[str]] = None,
+    fuzzy_cutoff: float = 0.92,
+) -> List[Optional[str]]:
+    """
+    Convert many licence strings at once, normalising each distinct string
+    only once.
 
-    # ------------------------------------------------------------------
-    # 4️⃣ Family‑based fallback – this is the new part that handles
-    #     "GPL (>= 3)", "Apache License (>= 2)", etc.
-    # ------------------------------------------------------------------
-    family, version, later = _extract_family_version(raw_license)
-    fallback = _family_fallback(family, version, later)
-    if fallback:
-        return fallback
+    Parameters
+    ----------
+    raw_licenses : iterable of str
+        The licence texts.
+    alias_map, spdx_ids, fuzzy_cutoff
+        As for ``normalize_license``.
 
-    # ------------------------------------------------------------------
-    # 5️⃣ Conservative fuzzy matcher (high cutoff)
-    # ------------------------------------------------------------------
-    fuzzy = _fuzzy_match(cleaned, spdx, cutoff=fuzzy_cutoff)
-    if fuzzy:
-        return fuzzy
+    Returns
+    -------
+    list
+        The SPDX identifier (or ``None``) of each input, in input order.
 
-    # ------------------------------------------------------------------
-    # 6️⃣ No confident match – caller must decide what to do
-    # ------------------------------------------------------------------
-    return None
+    Examples
+    --------
+    >>> normalize_licenses(['MIT + file LICENSE', 'Artistic-2.0', 'MIT'])
+    ['MIT', 'Artistic-2.0', 'MIT']
+    """
+    raw_licenses = list(raw_licenses)
+    alias = alias_map if alias_map is not None else _ALIAS_MAP
+    spdx_index = _SpdxIndex(spdx_ids) if spdx_ids is not None else _spdx_indices()[0]
+    results = {}
+    for raw in dict.fromkeys(raw_licenses):
+        if alias_map is None and spdx_ids is None:
+            results[raw] = _normalize_cached(raw, fuzzy_cutoff)
+        else:
+            results[raw] = _normalize(raw, alias, spdx_index, fuzzy_cutoff)
+    return [results[raw] for raw in raw_licenses]
 
 
 # ----------------------------------------------------------------------
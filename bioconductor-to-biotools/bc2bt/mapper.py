@@ -8,18 +8,34 @@ import json
 import glob
 import logging
 from collections import defaultdict
+from contextlib import ExitStack
 from typing import List, Dict, Callable, Optional, FrozenSet, Tuple
 from multiprocessing import Pool, cpu_count
 from urllib.parse import urlparse
-import matplotlib
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from .fuzzy import (
+    FuzzyMatcher,
+    char_shingles,
+    normalize_text,
+    url_shingles,
+    word_shingles,
+)
 
-matplotlib.use("Agg")  # Set non-interactive backend
-from tqdm import tqdm
-import pandas as pd
-from upsetplot import from_indicators, UpSet
+# The plotting stack (matplotlib, pandas, upsetplot) and tqdm are imported
+# where they are used, so that importing bc2bt stays fast.
+
+try:
+    import orjson
+
+    def parse_json(content: bytes):
+        """Parse JSON content, with orjson when it is installed."""
+        return orjson.loads(content)
+
+except ImportError:
+
+    def parse_json(content: bytes):
+        """Parse JSON content, with orjson when it is installed."""
+        return json.loads(content)
 
 
 # Configure logging
@@ -34,6 +50,12 @@ levels = {
 }
 logging.basicConfig(level=levels.get(log_level, logging.INFO))
 
+# Below this number of files to load, loading in-process is faster than
+# starting worker processes and sending the results back.
+PARALLEL_THRESHOLD = 200
+# Files sent to a worker at once
+CHUNK_SIZE = 32
+
 
 def remove_protocol(url: str) -> str:
     """Remove any protocol from a URL."""
@@ -118,6 +140,30 @@ def identity_name_homepage(json_data: dict) -> Optional[Tuple]:
     return None
 
 
+def identity_name_fuzzy(json_data: dict) -> Optional[str]:
+    """Return the normalized name, matched by character trigram similarity."""
+    name = normalize_text(json_data.get("name") or "")
+    return name or None
+
+
+def identity_homepage_fuzzy(json_data: dict) -> Optional[str]:
+    """
+    Return the normalized homepage, without protocol, "www." or trailing
+    slash, matched by the similarity of its path prefixes.
+    """
+    homepage = json_data.get("homepage")
+    if not homepage:
+        return None
+    homepage = remove_protocol(normalize_bioconductor_url(homepage)).lower()
+    return homepage.removeprefix("www.").rstrip("/") or None
+
+
+def identity_description_fuzzy(json_data: dict) -> Optional[str]:
+    """Return the normalized description, matched by word shingle similarity."""
+    description = normalize_text(json_data.get("description") or "")
+    return description or None
+
+
 # Registry of available identity functions
 IDENTITY_FUNCTIONS: Dict[str, Callable] = {
     "name": identity_name,
@@ -126,14 +172,26 @@ IDENTITY_FUNCTIONS: Dict[str, Callable] = {
     "homepage": identity_homepage,
     "biotoolsID_unprefixed": identity_biotoolsID_unprefixed,
     "name_homepage": identity_name_homepage,
+    "name_fuzzy": identity_name_fuzzy,
+    "homepage_fuzzy": identity_homepage_fuzzy,
+    "description_fuzzy": identity_description_fuzzy,
+}
+
+# Approximate identity methods: their values match when the Jaccard
+# similarity of their shingles reaches a threshold, rather than when they are
+# equal. Candidates are found with a MinHash/LSH index (see bc2bt.fuzzy).
+FUZZY_METHODS: Dict[str, FuzzyMatcher] = {
+    "name_fuzzy": FuzzyMatcher(char_shingles, threshold=0.7),
+    "homepage_fuzzy": FuzzyMatcher(url_shingles, threshold=0.75),
+    "description_fuzzy": FuzzyMatcher(word_shingles, threshold=0.6),
 }
 
 
 def load_json(filepath: str) -> Optional[dict]:
     """Load JSON file and return its contents."""
     try:
-        with open(filepath, "r", encoding="utf-8") as file:
-            return json.load(file)
+        with open(filepath, "rb") as file:
+            return parse_json(file.read())
     except Exception as e:
         logging.error(f"Error loading {filepath}: {e}")
         return None
@@ -144,6 +202,25 @@ def load_json_with_path(filepath: str) -> tuple:
     return filepath, load_json(filepath)
 
 
+def load_identity_values_with_path(task: Tuple[str, List[str]]) -> tuple:
+    """
+    Load a JSON file and compute its identity values, so that a worker
+    process only sends these values back rather than the whole entry.
+
+    Args:
+        task: Tuple of (file path, identity methods)
+
+    Returns:
+        Tuple of (path, loaded, identity values), the values being None for
+        files that could not be loaded and for empty entries
+    """
+    filepath, identity_methods = task
+    json_data = load_json(filepath)
+    if not json_data:
+        return filepath, json_data is not None, None
+    return filepath, True, compute_identity_values(json_data, identity_methods)
+
+
 class IdentityRegistry:
     """Registry for identity functions."""
 
@@ -177,29 +254,69 @@ def build_identity_index(
         Tuple of (identity_values, identity_indices)
     """
     identity_values = {}
-    identity_indices = {method: defaultdict(list) for method in identity_methods}
 
     for filepath, json_data in json_data_dict.items():
         if not json_data:
             continue
 
-        identity_values[filepath] = {}
+        identity_values[filepath] = compute_identity_values(json_data, identity_methods)
 
-        for method in identity_methods:
-            id_func = IDENTITY_FUNCTIONS[method]
-            id_value = id_func(json_data)
+    return identity_values, build_reverse_index(identity_values, identity_methods)
+
+
+def compute_identity_values(json_data: dict, identity_methods: List[str]) -> dict:
+    """
+    Compute the identity values of one entry.
 
-            if id_value is not None:
-                identity_values[filepath][method] = id_value
+    Args:
+        json_data: bio.tools entry
+        identity_methods: List of identity methods to use
+
+    Returns:
+        Dictionary mapping methods to identity values, for the non-None values
+    """
+    values = {}
+    for method in identity_methods:
+        id_value = IDENTITY_FUNCTIONS[method](json_data)
+        if id_value is not None:
+            values[method] = id_value
+    return values
+
+
+def build_reverse_index(identity_values: dict, identity_methods: List[str]) -> dict:
+    """
+    Create the reverse indices (identity value to file paths) for each method.
+
+    Args:
+        identity_values: Identity values per file, as built by build_identity_index()
+        identity_methods: List of identity methods to use
+
+    Returns:
+        Dictionary mapping each method to a dictionary of value -> list of file paths
+    """
+    identity_indices = {method: defaultdict(list) for method in identity_methods}
+
+    for filepath, values in identity_values.items():
+        for method, id_value in values.items():
+            if method not in identity_indices:
+                continue
+            # Handle set/frozenset types differently for indexing
+            if isinstance(id_value, (set, frozenset)):
+                for element in id_value:
+                    identity_indices[method][element].append(filepath)
+            else:
+                identity_indices[method][id_value].append(filepath)
+
+    return identity_indices
 
-                # Handle set/frozenset types differently for indexing
-                if isinstance(id_value, (set, frozenset)):
-                    for element in id_value:
-                        identity_indices[method][element].append(filepath)
-                else:
-                    identity_indices[method][id_value].append(filepath)
 
-    return identity_values, identity_indices
+def _shares_value(method: str, id_val1, id_val2) -> bool:
+    """Whether two identity values of a method match."""
+    if method in FUZZY_METHODS:
+        return FUZZY_METHODS[method].matches(id_val1, id_val2)
+    if isinstance(id_val1, (set, frozenset)) and isinstance(id_val2, (set, frozenset)):
+        return not id_val1.isdisjoint(id_val2)
+    return id_val1 == id_val2
 
 
 def find_matches_optimized(
@@ -207,108 +324,121 @@ def find_matches_optimized(
     identity_values2: dict,
     identity_indices2: dict,
     identity_methods: List[str],
+    identity_indices1: Optional[dict] = None,
 ) -> tuple:
     """
     Find matches between two datasets using pre-computed indices.
 
+    Files of dataset 2 are interned as integers (their position in
+    identity_values2), and each reverse index becomes a hash join from
+    identity value to the sorted list of these integers, with a cursor on the
+    first file not matched yet. Each file of dataset 1 is matched, in dataset
+    order, with the first unmatched file of dataset 2 sharing a value with it
+    for any method; the match is recorded for every method on which the two
+    files agree. Since matched files are never unmatched, cursors only move
+    forward and popular values (e.g. a DOI cited by many packages) are
+    scanned once overall rather than once per file.
+
+    For the fuzzy methods of FUZZY_METHODS, the join is approximate: a value
+    is looked up in a MinHash/LSH index of the values of dataset 2, and the
+    candidates are kept when their exact similarity reaches the threshold.
+
+    With identity_indices1, only the files of dataset 1 having a value in
+    common with dataset 2, found by set intersection of the index keys, are
+    visited.
+
     Args:
         identity_values1: Identity values for dataset 1
         identity_values2: Identity values for dataset 2
         identity_indices2: Reverse index for dataset 2
         identity_methods: List of identity methods to use
+        identity_indices1: Optional reverse index for dataset 1
 
     Returns:
         Tuple of (match_results, match_registry1, match_registry2, matched_files1, matched_files2)
     """
-    match_results = defaultdict(lambda: defaultdict(set))
-    matched_files1 = set()
-    matched_files2 = set()
-
-    match_registry1 = {method: {} for method in identity_methods}
-    match_registry2 = {method: {} for method in identity_methods}
-
-    # Initialize all files as unmatched
-    for file1 in identity_values1.keys():
+    files2 = list(identity_values2)
+    file_ids2 = {filepath: i for i, filepath in enumerate(files2)}
+    joins = {}
+    for method in identity_methods:
+        joins[method] = {
+            value: sorted(file_ids2[f] for f in filepaths if f in file_ids2)
+            for value, filepaths in identity_indices2[method].items()
+        }
+        if method in FUZZY_METHODS:
+            joins[method] = FUZZY_METHODS[method].join(joins[method])
+    cursors = {method: {} for method in identity_methods}
+    matched_ids2 = bytearray(len(files2))
+
+    def first_unmatched(method, value):
+        ids = joins[method].get(value)
+        if not ids:
+            return None
+        position = cursors[method].get(value, 0)
+        while position < len(ids) and matched_ids2[ids[position]]:
+            position += 1
+        cursors[method][value] = position
+        return ids[position] if position < len(ids) else None
+
+    files1 = identity_values1.keys()
+    if identity_indices1 is not None:
+        with_candidates = set()
         for method in identity_methods:
-            match_registry1[method][file1] = False
-
-    for file2 in identity_values2.keys():
-        for method in identity_methods:
-            match_registry2[method][file2] = False
-
-    # Process each file from dataset 1
-    for file1, id_vals1 in tqdm(
-        identity_values1.items(), desc="Finding matches", unit="file"
-    ):
-        if file1 in matched_files1:
-            continue
+            index1 = identity_indices1[method]
+            if method in FUZZY_METHODS:
+                shared = [value for value in index1 if joins[method].get(value)]
+            else:
+                shared = index1.keys() & joins[method].keys()
+            for value in shared:
+                with_candidates.update(index1[value])
+        files1 = [f for f in identity_values1 if f in with_candidates]
 
-        candidates = set()
-        method_matches = defaultdict(set)
+    match_results = defaultdict(lambda: defaultdict(set))
+    matched_files1 = set()
+    matched_methods1 = {method: [] for method in identity_methods}
+    matched_methods2 = {method: [] for method in identity_methods}
 
-        # Find candidate matches for each method
+    for file1 in files1:
+        id_vals1 = identity_values1[file1]
+        best = None
         for method in identity_methods:
-            if method not in id_vals1:
+            id_val1 = id_vals1.get(method)
+            if id_val1 is None:
                 continue
+            elements = id_val1 if isinstance(id_val1, (set, frozenset)) else (id_val1,)
+            for element in elements:
+                first = first_unmatched(method, element)
+                if first is not None and (best is None or first < best):
+                    best = first
 
-            id_val1 = id_vals1[method]
-
-            # Handle set/frozenset types
-            if isinstance(id_val1, (set, frozenset)):
-                for element in id_val1:
-                    if element in identity_indices2[method]:
-                        for file2 in identity_indices2[method][element]:
-                            if file2 not in matched_files2:
-                                candidates.add(file2)
-                                method_matches[method].add(file2)
-            else:
-                # Direct lookup for scalar values
-                if id_val1 in identity_indices2[method]:
-                    for file2 in identity_indices2[method][id_val1]:
-                        if file2 not in matched_files2:
-                            candidates.add(file2)
-                            method_matches[method].add(file2)
-
-        if not candidates:
+        if best is None:
             continue
 
-        # Verify matches for candidates
-        for file2 in candidates:
-            if file2 not in identity_values2:
-                continue
-
-            id_vals2 = identity_values2[file2]
-            match_found = {}
-
-            for method in identity_methods:
-                if method not in id_vals1 or method not in id_vals2:
-                    match_found[method] = False
-                    continue
-
-                id1 = id_vals1[method]
-                id2 = id_vals2[method]
-
-                if isinstance(id1, (set, frozenset)) and isinstance(
-                    id2, (set, frozenset)
-                ):
-                    match_found[method] = bool(not id1.isdisjoint(id2))
-                else:
-                    match_found[method] = bool(id1 == id2)
-
-                if match_found[method]:
-                    match_registry1[method][file1] = True
-                    match_registry2[method][file2] = True
-
-            # If any method matched, record it
-            if any(match_found.values()):
-                for method in identity_methods:
-                    if match_found[method]:
-                        match_results[method][file1].add(file2)
-
-                matched_files1.add(file1)
-                matched_files2.add(file2)
-                break  # Stop after finding first match
-
+        file2 = files2[best]
+        id_vals2 = identity_values2[file2]
+        matched_ids2[best] = 1
+        matched_files1.add(file1)
+        for method in identity_methods:
+            if (
+                method in id_vals1
+                and method in id_vals2
+                and _shares_value(method, id_vals1[method], id_vals2[method])
+            ):
+                match_results[method][file1].add(file2)
+                matched_methods1[method].append(file1)
+                matched_methods2[method].append(file2)
+
+    matched_files2 = {files2[i] for i, matched in enumerate(matched_ids2) if matched}
+
+    match_registry1 = {}
+    match_registry2 = {}
+    for method in identity_methods:
+        match_registry1[method] = dict.fromkeys(identity_values1, False)
+        match_registry1[method].update(dict.fromkeys(matched_methods1[method], True))
+        match_registry2[method] = dict.fromkeys(files2, False)
+        match_registry2[method].update(dict.fromkeys(matched_methods2[method], True))
+
+    logging.info(f"Matched {len(matched_files1)} of {len(identity_values1)} files")
     return (
         match_results,
         match_registry1,
@@ -330,6 +460,13 @@ def create_match_upsetplot(
         pattern: File pattern for the JSON files (used for plot title)
         identity_methods: List of identity methods used for comparison
     """
+    import matplotlib
+
+    matplotlib.use("Agg")  # Set non-interactive backend
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from upsetplot import UpSet, from_indicators
+
     data = {method: list(files.values()) for method, files in data.items()}
     df = pd.DataFrame(data)
     data = from_indicators(identity_methods, df)
@@ -342,17 +479,105 @@ def create_match_upsetplot(
     logging.info(f"Upset plot {title} saved to {filename}")
 
 
+def find_files(pattern: str) -> List[str]:
+    """
+    List the files matching a pattern.
+
+    Raises:
+        ValueError: If no file matches
+    """
+    files = glob.glob(pattern)
+    logging.info(f"Found {len(files)} files matching {pattern}")
+    if not files:
+        raise ValueError(f"No files found matching pattern: {pattern}")
+    return files
+
+
+def _map_files(function: Callable, tasks: list, pool, desc: str) -> list:
+    """Apply a loading function to tasks, in the pool if any."""
+    from tqdm import tqdm
+
+    if pool is None:
+        results = map(function, tasks)
+    else:
+        results = pool.imap(function, tasks, CHUNK_SIZE)
+    return list(tqdm(results, total=len(tasks), desc=desc, unit="file"))
+
+
+def load_dataset(
+    pattern: str, num_workers: Optional[int] = None, desc: str = "Loading dataset"
+) -> Dict[str, dict]:
+    """
+    Load all JSON files matching a pattern, in parallel when there are more
+    than PARALLEL_THRESHOLD of them.
+
+    Args:
+        pattern: File pattern for the JSON files
+        num_workers: Number of worker processes for parallel loading
+        desc: Progress bar description
+
+    Returns:
+        Dictionary mapping file paths to JSON data, for the files that could be loaded
+    """
+    files = find_files(pattern)
+    if len(files) > PARALLEL_THRESHOLD:
+        with Pool(num_workers or min(cpu_count(), 8)) as pool:
+            results = _map_files(load_json_with_path, files, pool, desc)
+    else:
+        results = _map_files(load_json_with_path, files, None, desc)
+    return {filepath: data for filepath, data in results if data is not None}
+
+
+def load_identity_values(
+    files: List[str],
+    identity_methods: List[str],
+    pool=None,
+    desc: str = "Loading dataset",
+) -> Tuple[List[str], Dict[str, dict]]:
+    """
+    Compute the identity values of JSON files, without keeping the entries.
+
+    Args:
+        files: Paths of the JSON files
+        identity_methods: List of identity methods to use
+        pool: Optional multiprocessing pool, the files are loaded in-process otherwise
+        desc: Progress bar description
+
+    Returns:
+        Tuple of (paths of the files that could be loaded, identity values as
+        built by build_identity_index())
+    """
+    tasks = [(filepath, identity_methods) for filepath in files]
+    results = _map_files(load_identity_values_with_path, tasks, pool, desc)
+    loaded = [filepath for filepath, ok, _ in results if ok]
+    identity_values = {
+        filepath: values for filepath, _, values in results if values is not None
+    }
+    return loaded, identity_values
+
+
 def compare_files(
-    pattern1: str,
-    pattern2: str,
+    pattern1: Optional[str],
+    pattern2: Optional[str],
     identity_methods: List[str],
     upset1_path: Optional[str] = None,
     upset2_path: Optional[str] = None,
     num_workers: Optional[int] = None,
+    json_data1: Optional[Dict[str, dict]] = None,
+    json_data2: Optional[Dict[str, dict]] = None,
+    index_path: Optional[str] = None,
 ) -> dict:
     """
     Compare two sets of bio.tools JSON files based on the given identity methods.
 
+    Either set can be given already loaded, as a dictionary mapping keys
+    (usually file paths) to JSON data, in which case its pattern is only used
+    as a label and may be None.
+
+    With index_path, the identity values of the sets given by pattern are
+    kept in a persistent identity index (see identity_index.IdentityIndex),
+    so that only the files that changed since the previous run are loaded.
+
     Args:
         pattern1: File pattern for the first set of JSON files
         pattern2: File pattern for the second set of JSON files
@@ -360,73 +585,84 @@ def compare_files(
         upset1_path: Path to save the Upset plot for the first set
         upset2_path: Path to save the Upset plot for the second set
         num_workers: Number of worker processes for parallel loading
+        json_data1: Optional preloaded first set
+        json_data2: Optional preloaded second set
+        index_path: Optional path to the SQLite identity index
 
     Returns:
         Dictionary with match_results, only_in_files1, only_in_files2
     """
-    if num_workers is None:
-        num_workers = min(cpu_count(), 8)
-
-    files1 = glob.glob(pattern1)
-    files2 = glob.glob(pattern2)
-
-    logging.info(
-        f"Found {len(files1)} files matching pattern1 and {len(files2)} files matching pattern2"
-    )
-
-    if not files1:
-        raise ValueError(f"No files found matching pattern1: {pattern1}")
-    if not files2:
-        raise ValueError(f"No files found matching pattern2: {pattern2}")
-
-    # Parallel JSON loading
-    logging.info("Loading JSON files from dataset 1...")
-    with Pool(num_workers) as pool:
-        results1 = list(
-            tqdm(
-                pool.imap(load_json_with_path, files1),
-                total=len(files1),
-                desc="Loading dataset 1",
-                unit="file",
-            )
-        )
-    json_data1 = {filepath: data for filepath, data in results1 if data is not None}
-
-    logging.info("Loading JSON files from dataset 2...")
-    with Pool(num_workers) as pool:
-        results2 = list(
-            tqdm(
-                pool.imap(load_json_with_path, files2),
-                total=len(files2),
-                desc="Loading dataset 2",
-                unit="file",
-            )
-        )
-    json_data2 = {filepath: data for filepath, data in results2 if data is not None}
-
-    logging.info(f"Loaded {len(json_data1)} valid files from dataset 1")
-    logging.info(f"Loaded {len(json_data2)} valid files from dataset 2")
-
-    # Build identity indices
-    logging.info("Building identity indices...")
-    identity_values1, identity_indices1 = build_identity_index(
-        json_data1, identity_methods
-    )
-    identity_values2, identity_indices2 = build_identity_index(
-        json_data2, identity_methods
-    )
+    datasets = ((pattern1, json_data1), (pattern2, json_data2))
+    for number, (pattern, json_data) in enumerate(datasets, 1):
+        if json_data is None and pattern is None:
+            raise ValueError(f"Either pattern{number} or json_data{number} is required")
+
+    with ExitStack() as stack:
+        index = None
+        if index_path and (json_data1 is None or json_data2 is None):
+            from .identity_index import IdentityIndex
+
+            index = stack.enter_context(IdentityIndex(index_path))
+
+        # One pool for both datasets, if there are enough files to load
+        to_load = {
+            number: find_files(pattern)
+            for number, (pattern, json_data) in enumerate(datasets, 1)
+            if json_data is None and index is None
+        }
+        pool = None
+        if sum(len(files) for files in to_load.values()) > PARALLEL_THRESHOLD:
+            pool = stack.enter_context(Pool(num_workers or min(cpu_count(), 8)))
+
+        loaded = []
+        for number, (pattern, json_data) in enumerate(datasets, 1):
+            if json_data is not None:
+                files = list(json_data.keys())
+                logging.info(f"Building identity index of dataset {number}...")
+                loaded.append(
+                    (files, *build_identity_index(json_data, identity_methods))
+                )
+            elif index is not None:
+                logging.info(f"Updating identity index of dataset {number}...")
+                files, identity_values, identity_indices = index.identity_index(
+                    pattern, identity_methods, num_workers
+                )
+                if not files:
+                    raise ValueError(f"No files found matching pattern: {pattern}")
+                loaded.append((files, identity_values, identity_indices))
+            else:
+                logging.info(f"Loading JSON files from dataset {number}...")
+                files, identity_values = load_identity_values(
+                    to_load[number], identity_methods, pool, f"Loading dataset {number}"
+                )
+                loaded.append(
+                    (
+                        files,
+                        identity_values,
+                        build_reverse_index(identity_values, identity_methods),
+                    )
+                )
+            logging.info(f"Loaded {len(files)} valid files from dataset {number}")
+    (
+        (files1, identity_values1, identity_indices1),
+        (files2, identity_values2, identity_indices2),
+    ) = loaded
 
     # Find matches using optimized algorithm
     logging.info("Finding matches...")
     match_results, match_registry1, match_registry2, matched_files1, matched_files2 = (
         find_matches_optimized(
-            identity_values1, identity_values2, identity_indices2, identity_methods
+            identity_values1,
+            identity_values2,
+            identity_indices2,
+            identity_methods,
+            identity_indices1,
         )
     )
 
     # Calculate unmatched files
-    only_in_files1 = set(json_data1.keys()) - matched_files1
-    only_in_files2 = set(json_data2.keys()) - matched_files2
+    only_in_files1 = set(files1) - matched_files1
+    only_in_files2 = set(files2) - matched_files2
 
     result = {
         "match_results": {
@@ -447,11 +683,11 @@ def compare_files(
         logging.info("Creating upset plots...")
         if upset1_path:
             create_match_upsetplot(
-                match_registry1, upset1_path, pattern1, identity_methods
+                match_registry1, upset1_path, pattern1 or "dataset 1", identity_methods
             )
         if upset2_path:
             create_match_upsetplot(
-                match_registry2, upset2_path, pattern2, identity_methods
+                match_registry2, upset2_path, pattern2 or "dataset 2", identity_methods
             )
 
     return result
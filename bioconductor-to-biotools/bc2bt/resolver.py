@@ -0,0 +1,197 @@
+"""
+Publication metadata from several resolvers, with fallback and hedging.
+
+The resolvers (CrossRef, Europe PMC and doi.org by default) are tried in order
+of preference. The next one is started as soon as the previous one has no
+answer, or when it has not answered within a latency threshold (hedging),
+which also runs while the request waits for a slot of its host; the first
+complete answer wins. A whole batch of DOIs runs on one asyncio
+event loop, and the number of requests in flight to each host is bounded.
+
+The resolvers themselves are the synchronous functions of bc2bt.doi,
+bc2bt.crossref and bc2bt.europepmc, run in a thread pool, so their metadata
+cache is used as well.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import crossref, doi, europepmc
+
+logger = logging.getLogger(__name__)
+
+# (name, host, function returning the metadata of a DOI or None), by preference
+DEFAULT_RESOLVERS: List[Tuple[str, str, Callable[[str], Optional[dict]]]] = [
+    ("crossref", "api.crossref.org", crossref.get_publication_metadata),
+    ("europepmc", "www.ebi.ac.uk", europepmc.get_publication_metadata),
+    ("doi", "doi.org", doi.get_publication_metadata),
+]
+# Seconds to wait for a resolver before also starting the next one
+HEDGE_DELAY = 1.0
+# Maximum number of requests in flight to each host
+PER_HOST = 3
+
+
+def is_complete(metadata: Optional[dict]) -> bool:
+    """Whether metadata has a title and authors, i.e. needs no fallback."""
+    return bool(metadata and metadata.get("title") and metadata.get("authors"))
+
+
+class MultiResolver:
+    """
+    Asynchronous facade over several resolvers. An instance belongs to the
+    event loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        resolvers: Optional[List[Tuple[str, str, Callable]]] = None,
+        hedge_delay: float = HEDGE_DELAY,
+        per_host: int = PER_HOST,
+    ):
+        """
+        Args:
+            resolvers: List of (name, host, function) tuples, by preference;
+                defaults to DEFAULT_RESOLVERS
+            hedge_delay: Seconds to wait for a resolver before also starting
+                the next one
+            per_host: Maximum number of requests in flight to each host
+        """
+        self.resolvers = resolvers if resolvers is not None else DEFAULT_RESOLVERS
+        self.hedge_delay = hedge_delay
+        self.per_host = per_host
+        hosts = {host for _, host, _ in self.resolvers}
+        self._executor = ThreadPoolExecutor(max_workers=per_host * len(hosts))
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+
+    def close(self):
+        """Stop the thread pool, dropping the requests not started yet."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def _fetch(
+        self,
+        name: str,
+        host: str,
+        function: Callable,
+        doi: str,
+    ):
+        # Semaphores are created here, on the running loop (Python 3.9)
+        if host not in self._limits:
+            self._limits[host] = asyncio.Semaphore(self.per_host)
+        async with self._limits[host]:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, function, doi
+            )
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # A running request cannot be stopped: it keeps its slot until
+                # it ends, and its metadata still goes to the cache
+                await asyncio.wait([future])
+                raise
+            except Exception as e:
+                logger.error(f"Error fetching metadata for DOI {doi} from {name}: {e}")
+                return None
+
+    async def resolve(self, doi: str) -> Optional[dict]:
+        """
+        Fetch the metadata of a DOI.
+
+        The hedge delay of the first resolver runs from the call, including
+        any wait for a free slot of its host, and the one of each next
+        resolver from the start of the previous one. So when the preferred
+        host is slow or saturated, the next resolver is tried after
+        hedge_delay rather than once a slot frees up.
+
+        Args:
+            doi: Digital Object Identifier (with or without 'doi:' prefix)
+
+        Returns:
+            The first complete metadata, else the first incomplete one, else
+            None if no resolver found the DOI
+        """
+        pending = set()
+        started = 0
+        fallback = None
+
+        def start_next():
+            nonlocal started
+            name, host, function = self.resolvers[started]
+            pending.add(asyncio.ensure_future(self._fetch(name, host, function, doi)))
+            started += 1
+
+        start_next()
+        try:
+            while pending:
+                hedging = started < len(self.resolvers)
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if hedging else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                pending.difference_update(done)
+                for task in done:
+                    metadata = task.result()
+                    if is_complete(metadata):
+                        return metadata
+                    fallback = fallback or metadata
+                # No answer in time, or no complete one: try the next resolver
+                if hedging:
+                    start_next()
+        finally:
+            # Drop the fetches of the other resolvers: those still waiting
+            # for a slot never start, see _fetch() for the running ones
+            for task in pending:
+                task.cancel()
+        return fallback
+
+    async def resolve_all(self, dois: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Fetch the metadata of several DOIs concurrently.
+
+        Args:
+            dois: Digital Object Identifiers
+
+        Returns:
+            Dictionary mapping each DOI to its metadata (None if not found)
+        """
+        dois = list(dict.fromkeys(dois))
+        results = await asyncio.gather(*(self.resolve(doi) for doi in dois))
+        return dict(zip(dois, results))
+
+
+def resolve_publications(
+    dois: Iterable[str],
+    resolvers: Optional[List[Tuple[str, str, Callable]]] = None,
+    hedge_delay: float = HEDGE_DELAY,
+    per_host: int = PER_HOST,
+) -> Dict[str, Optional[dict]]:
+    """
+    Fetch the metadata of a batch of DOIs from several resolvers, on one
+    event loop, see MultiResolver.
+
+    Args:
+        dois: Digital Object Identifiers
+        resolvers: List of (name, host, function) tuples, by preference;
+            defaults to DEFAULT_RESOLVERS
+        hedge_delay: Seconds to wait for a resolver before also starting the
+            next one
+        per_host: Maximum number of requests in flight to each host
+
+    Returns:
+        Dictionary mapping each DOI to its metadata (None if not found)
+    """
+
+    async def run():
+        async with MultiResolver(resolvers, hedge_delay, per_host) as resolver:
+            return await resolver.resolve_all(dois)
+
+    return asyncio.run(run())
@@ -2,14 +2,165 @@
 Updater module for creating and updating bio.tools entries based on match results.
 """
 
+import filecmp
 import json
+import os
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Union
 
 
 logger = logging.getLogger(__name__)
 
+# Journal of a parallel batch, in the bio.tools directory, see Updater.rollback()
+JOURNAL_NAME = ".bc2bt-journal.json"
+
+# Fields updated from Bioconductor (only these will be overwritten)
+BIOC_FIELDS_TO_UPDATE = [
+    "credit",
+    "description",
+    "documentation",
+    "download",
+    "homepage",
+    "license",
+    "publication",
+    "version",
+]
+
+
+def _load_entry(entry: Union[str, dict]) -> dict:
+    """Return an entry given either as a dictionary or as a JSON file path."""
+    if isinstance(entry, dict):
+        return entry
+    with open(entry, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merge_entry(existing_data: dict, bioc_data: dict) -> dict:
+    """
+    Merge Bioconductor metadata into an existing bio.tools entry.
+
+    Strategy: Start with existing bio.tools data (preserves all fields),
+    then selectively update specific fields from Bioconductor.
+
+    Args:
+        existing_data: Existing bio.tools entry
+        bioc_data: Converted Bioconductor entry
+
+    Returns:
+        The merged entry
+    """
+    # Start with existing data (preserves ALL fields from bio.tools)
+    merged_data = {**existing_data}
+
+    for field in BIOC_FIELDS_TO_UPDATE:
+        if field in bioc_data:
+            merged_data[field] = bioc_data[field]
+
+    # Merge collectionID: ensure "BioConductor" is included
+    existing_collections = set(existing_data.get("collectionID", []))
+    existing_collections.add("BioConductor")
+    merged_data["collectionID"] = sorted(list(existing_collections))
+    return merged_data
+
+
+def _sort_key(value) -> tuple:
+    """
+    Sort key of a JSON value in jq's order: null < false < true < numbers <
+    strings < arrays < objects, with objects compared by their sorted keys,
+    then by the values of these keys.
+    """
+    if value is None:
+        return (0,)
+    if value is False:
+        return (1,)
+    if value is True:
+        return (2,)
+    if isinstance(value, (int, float)):
+        return (3, value)
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, list):
+        return (5, tuple(_sort_key(item) for item in value))
+    keys = sorted(value)
+    return (6, tuple(keys), tuple(_sort_key(value[key]) for key in keys))
+
+
+def normalize_entry(value):
+    """
+    Sort all the arrays of an entry, recursively, like
+    jq 'walk(if type == "array" then sort else . end)'. The order of the
+    object keys is kept.
+    """
+    if isinstance(value, dict):
+        return {key: normalize_entry(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return sorted((normalize_entry(item) for item in value), key=_sort_key)
+    return value
+
+
+def format_entry(data: dict) -> str:
+    """
+    Serialize an entry in the format of the bio.tools content repository:
+    normalized, indented by 4 spaces as jq --indent 4 does, with a final
+    newline. Numbers are written as Python does, keeping e.g. 1.0, -0.0 and
+    large integers as they are, whereas jq 1.6 writes 1, -0 and 1e+20.
+    """
+    text = json.dumps(normalize_entry(data), indent=4, ensure_ascii=False)
+    # jq escapes DEL, the only character Python leaves as is
+    return text.replace("\x7f", "\\u007f") + "\n"
+
+
+def _read_text(path: Path) -> str | None:
+    """Content of a file, or None if it does not exist."""
+    try:
+        # newline="" keeps the line endings, so that a rollback is byte-exact
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_atomic(
+    path: Path, content: bytes, source: Path | None = None, sync: bool = False
+):
+    """
+    Write a file through a temporary file renamed over it, so that readers
+    never see it half-written.
+
+    Args:
+        path: Path of the file
+        content: New content of the file
+        source: File whose permissions and times are copied, if any
+        sync: If True, flush the content to disk before renaming
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        if source is not None:
+            shutil.copystat(source, tmp_path)
+        elif path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_change(path: Path, change: Union[dict, Path]):
+    """Write a pending change: an entry, or a file to copy."""
+    if isinstance(change, dict):
+        _write_atomic(path, format_entry(change).encode("utf-8"))
+    else:
+        _write_atomic(path, change.read_bytes(), source=change)
+
 
 class Updater:
     """Handles creation and updating of bio.tools entries."""
@@ -21,6 +172,9 @@ class Updater:
         backup: bool = True,
         bioc_files_dir: str | None = None,
         copy_source: bool = True,
+        parallel: bool = False,
+        workers: int | None = None,
+        journal_path: str | None = None,
     ):
         """
         Initialize the updater.
@@ -28,15 +182,29 @@ class Updater:
         Args:
             bt_files_dir: Directory containing existing bio.tools entries
             dry_run: If True, don't actually write any changes
-            backup: If True, create .backup files before modifying
+            backup: If True, create .backup files before modifying; in parallel
+                mode, keep the journal of the batch instead
             bioc_files_dir: Directory containing original Bioconductor JSON files
             copy_source: If True, copy original Bioconductor files to data directory
+            parallel: If True, apply_changes() computes all the changes in
+                memory, then writes them concurrently as one transaction
+            workers: Number of threads writing files in parallel mode
+            journal_path: Journal of the parallel mode (default:
+                JOURNAL_NAME in bt_files_dir)
         """
         self.bt_files_dir = Path(bt_files_dir)
         self.dry_run = dry_run
         self.backup = backup
         self.bioc_files_dir = Path(bioc_files_dir) if bioc_files_dir else None
         self.copy_source = copy_source
+        self.parallel = parallel
+        self.workers = workers
+        self.journal_path = (
+            Path(journal_path) if journal_path else self.bt_files_dir / JOURNAL_NAME
+        )
+        # Changes of the current parallel batch, by target path: entries to
+        # write, or source files to copy
+        self._pending: Dict[Path, Union[dict, Path]] | None = None
 
     def _get_source_bioc_file(self, biotools_id: str) -> Path | None:
         """
@@ -82,36 +250,39 @@ class Updater:
             logger.debug(f"No source Bioconductor file found for {biotools_id}")
             return None
 
+        target_path = target_dir / f"{biotools_id}.bioconductor.json"
+        if target_path.exists() and filecmp.cmp(source_file, target_path, False):
+            logger.debug(f"Source unchanged: {target_path}")
+            return target_path
+
         if self.dry_run:
-            target_path = target_dir / f"{biotools_id}.bioconductor.json"
             logger.info(f"[DRY RUN] Would copy source: {source_file} -> {target_path}")
             return target_path
 
+        # Copy the source file with biotools_id naming
+        if self._pending is not None:
+            self._pending[target_path] = source_file
+            return target_path
+
         # Ensure target directory exists
         target_dir.mkdir(parents=True, exist_ok=True)
-
-        # Copy the source file with biotools_id naming
-        target_path = target_dir / f"{biotools_id}.bioconductor.json"
         shutil.copy2(source_file, target_path)
         logger.info(f"Copied source: {target_path}")
         return target_path
 
-    def create_entry(self, converted_file_path: str, target_dir: str) -> str:
+    def create_entry(self, converted: Union[str, dict], target_dir: str) -> str:
         """
         Create a new bio.tools entry from a converted Bioconductor file.
 
         Args:
-            converted_file_path: Path to the converted bio.tools JSON file
+            converted: Path to the converted bio.tools JSON file, or the converted entry
             target_dir: Directory to create the entry in
 
         Returns:
             Path to the created file
         """
-        source_path = Path(converted_file_path)
-
         # Load the converted data
-        with open(source_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _load_entry(converted)
 
         # Determine target path (create subdirectory for each entry)
         biotools_id = data["biotoolsID"]
@@ -123,12 +294,17 @@ class Updater:
             self._copy_source_file(biotools_id, target_path.parent)
             return str(target_path)
 
+        if self._pending is not None:
+            self._pending[target_path] = data
+            self._copy_source_file(biotools_id, target_path.parent)
+            return str(target_path)
+
         # Ensure target directory exists
         target_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write the file
         with open(target_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+            f.write(format_entry(data))
 
         logger.info(f"Created: {target_path}")
 
@@ -140,56 +316,42 @@ class Updater:
     def update_entry(
         self,
         existing_file_path: str,
-        converted_file_path: str,
-    ) -> str:
+        converted: Union[str, dict],
+        existing_data: dict | None = None,
+    ) -> str | None:
         """
-        Update an existing bio.tools entry with Bioconductor metadata.
-
-        Strategy: Start with existing bio.tools data (preserves all fields),
-        then selectively update specific fields from Bioconductor.
+        Update an existing bio.tools entry with Bioconductor metadata, see
+        merge_entry().
 
         Args:
             existing_file_path: Path to the existing bio.tools JSON file
-            converted_file_path: Path to the converted Bioconductor JSON file
+            converted: Path to the converted Bioconductor JSON file, or the converted entry
+            existing_data: Already loaded content of existing_file_path, if available
 
         Returns:
-            Path to the updated file
+            Path to the updated file, or None if the merged entry is the same
+            as the existing one once normalized, in which case nothing is written
         """
         existing_path = Path(existing_file_path)
 
         # Load both files
-        with open(existing_path, "r", encoding="utf-8") as f:
-            existing_data = json.load(f)
-
-        with open(converted_file_path, "r", encoding="utf-8") as f:
-            bioc_data = json.load(f)
+        if self._pending is not None and existing_path in self._pending:
+            existing_data = self._pending[existing_path]
+        elif existing_data is None:
+            existing_data = _load_entry(existing_file_path)
+        bioc_data = _load_entry(converted)
 
         # Get biotoolsID for source copying
         biotools_id = existing_data.get("biotoolsID") or bioc_data.get("biotoolsID")
 
-        # Start with existing data (preserves ALL fields from bio.tools)
-        merged_data = {**existing_data}
-
-        # Fields to update from Bioconductor (only these will be overwritten)
-        bioc_fields_to_update = [
-            "credit",
-            "description",
-            "documentation",
-            "download",
-            "homepage",
-            "license",
-            "publication",
-            "version",
-        ]
-
-        for field in bioc_fields_to_update:
-            if field in bioc_data:
-                merged_data[field] = bioc_data[field]
-
-        # Merge collectionID: ensure "BioConductor" is included
-        existing_collections = set(existing_data.get("collectionID", []))
-        existing_collections.add("BioConductor")
-        merged_data["collectionID"] = sorted(list(existing_collections))
+        merged_data = merge_entry(existing_data, bioc_data)
+
+        if format_entry(merged_data) == format_entry(existing_data):
+            logger.debug(f"Unchanged: {existing_path}")
+            # The source file may have changed in fields which are not mapped
+            if biotools_id:
+                self._copy_source_file(biotools_id, existing_path.parent)
+            return None
 
         if self.dry_run:
             logger.info(f"[DRY RUN] Would update: {existing_path}")
@@ -198,6 +360,12 @@ class Updater:
                 self._copy_source_file(biotools_id, existing_path.parent)
             return str(existing_path)
 
+        if self._pending is not None:
+            self._pending[existing_path] = merged_data
+            if biotools_id:
+                self._copy_source_file(biotools_id, existing_path.parent)
+            return str(existing_path)
+
         # Create backup if requested
         if self.backup:
             backup_path = existing_path.with_suffix(".biotools.json.backup")
@@ -206,7 +374,7 @@ class Updater:
 
         # Write the merged data
         with open(existing_path, "w", encoding="utf-8") as f:
-            json.dump(merged_data, f, indent=4)
+            f.write(format_entry(merged_data))
 
         logger.info(f"Updated: {existing_path}")
 
@@ -219,21 +387,39 @@ class Updater:
     def apply_changes(
         self,
         match_results: dict,
-        converted_files_dir: str,
+        converted_files_dir: str | None = None,
+        converted_entries: dict | None = None,
+        existing_entries: dict | None = None,
     ) -> dict:
         """
         Apply create/update operations based on match results.
 
+        The converted and existing entries referenced by the match results
+        are read from disk, unless they are given in converted_entries or
+        existing_entries (as returned by converter.convert_entries() and
+        mapper.load_dataset()).
+
+        In parallel mode, the changes are first computed in memory, then
+        written by a pool of threads as a single transaction, see
+        _write_pending().
+
         Args:
             match_results: Result dictionary from mapper.compare_files()
             converted_files_dir: Directory containing converted Bioconductor files
+            converted_entries: Optional converted entries keyed by file path
+            existing_entries: Optional existing bio.tools entries keyed by file path
 
         Returns:
             Summary of operations performed
         """
+        if self.parallel and not self.dry_run:
+            self._pending = {}
+        converted_entries = converted_entries or {}
+        existing_entries = existing_entries or {}
         summary = {
             "created": [],
             "updated": [],
+            "unchanged": [],
             "skipped": [],
             "errors": [],
         }
@@ -241,7 +427,10 @@ class Updater:
         # Files that exist only in dataset 2 (converted files) need to be created
         for new_file_path in match_results.get("only_in_files2", []):
             try:
-                created_path = self.create_entry(new_file_path, str(self.bt_files_dir))
+                created_path = self.create_entry(
+                    converted_entries.get(new_file_path, new_file_path),
+                    str(self.bt_files_dir),
+                )
                 summary["created"].append(created_path)
             except Exception as e:
                 logger.error(f"Error creating entry from {new_file_path}: {e}")
@@ -261,9 +450,27 @@ class Updater:
                     conversion_to_existing[converted_file] = existing_file
 
         # Update matched entries
+        updated_files = set()
         for converted_file, existing_file in conversion_to_existing.items():
+            # a file updated twice must be reloaded the second time
+            existing_data = None
+            if existing_file not in updated_files:
+                existing_data = existing_entries.get(existing_file)
+            updated_files.add(existing_file)
             try:
-                updated_path = self.update_entry(existing_file, converted_file)
+                updated_path = self.update_entry(
+                    existing_file,
+                    converted_entries.get(converted_file, converted_file),
+                    existing_data,
+                )
+                if updated_path is None:
+                    summary["unchanged"].append(
+                        {
+                            "source": converted_file,
+                            "target": existing_file,
+                        }
+                    )
+                    continue
                 summary["updated"].append(
                     {
                         "source": converted_file,
@@ -282,8 +489,131 @@ class Updater:
                     }
                 )
 
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._write_pending(pending, summary)
         return summary
 
+    def _write_pending(self, pending: Dict[Path, Union[dict, Path]], summary: dict):
+        """
+        Write the changes of a parallel batch as a single transaction.
+
+        The original content of every target file (or its absence) is first
+        saved to the journal, then the files are written concurrently, each
+        through an atomic rename. If any write fails, the whole batch is
+        rolled back and its operations are reported as errors. The journal is
+        kept as the backup of the batch when backup is enabled, and removed
+        otherwise. A batch interrupted before its end is rolled back by the
+        next one, or by rollback().
+
+        Args:
+            pending: Changes by target path, entries to write or files to copy
+            summary: Summary of the batch, updated if it is rolled back
+        """
+        if not pending:
+            return
+        self._recover()
+        targets = list(pending)
+        new_dirs = sorted(
+            {str(path.parent) for path in targets if not path.parent.exists()}
+        )
+        with ThreadPoolExecutor(self.workers) as executor:
+            try:
+                originals = list(executor.map(_read_text, targets))
+            except Exception as e:
+                logger.error(f"Error reading the files to change: {e}")
+                self._abort(summary, e)
+                return
+            journal = {
+                "status": "pending",
+                "files": [
+                    {"path": str(path), "original": original}
+                    for path, original in zip(targets, originals)
+                ],
+                "directories": new_dirs,
+            }
+            self._write_journal(journal)
+            futures = [
+                executor.submit(_write_change, path, pending[path]) for path in targets
+            ]
+            errors = [future.exception() for future in futures if future.exception()]
+        if errors:
+            logger.error(
+                f"Error writing {len(errors)} of {len(targets)} files, "
+                f"rolling back: {errors[0]}"
+            )
+            self.rollback()
+            self._abort(summary, errors[0])
+            return
+
+        logger.info(f"Wrote {len(targets)} files")
+        if self.backup:
+            journal["status"] = "committed"
+            self._write_journal(journal)
+            logger.debug(f"Journal kept: {self.journal_path}")
+        else:
+            self.journal_path.unlink()
+
+    def _write_journal(self, journal: dict):
+        _write_atomic(self.journal_path, json.dumps(journal).encode("utf-8"), sync=True)
+
+    def _recover(self):
+        """Roll back the batch of a previous run which did not complete."""
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                status = json.load(f).get("status")
+        except FileNotFoundError:
+            return
+        if status == "pending":
+            logger.warning(f"Rolling back the interrupted batch of {self.journal_path}")
+            self.rollback()
+
+    @staticmethod
+    def _abort(summary: dict, error: Exception):
+        """Report the operations of a batch which was not written as errors."""
+        for created_path in summary["created"]:
+            summary["errors"].append({"file": created_path, "error": str(error)})
+        for update in summary["updated"]:
+            summary["errors"].append({**update, "error": str(error)})
+        summary["created"] = []
+        summary["updated"] = []
+
+    def rollback(self) -> bool:
+        """
+        Restore the files changed by the batch recorded in the journal, i.e.
+        the last parallel batch when backup is enabled, and remove the journal.
+
+        Returns:
+            True if a batch was rolled back, False if there was no journal
+        """
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except FileNotFoundError:
+            return False
+
+        def restore(record: dict):
+            path = Path(record["path"])
+            # Temporary file left by a write interrupted before its rename
+            path.with_name(f".{path.name}.tmp").unlink(missing_ok=True)
+            if record["original"] is None:
+                path.unlink(missing_ok=True)
+            else:
+                _write_atomic(path, record["original"].encode("utf-8"))
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            list(executor.map(restore, journal["files"]))
+        for directory in reversed(journal["directories"]):
+            try:
+                Path(directory).rmdir()
+            except OSError:
+                pass
+        self.journal_path.unlink()
+        logger.info(
+            f"Rolled back {len(journal['files'])} files from {self.journal_path}"
+        )
+        return True
+
 
 def create_entry(
     converted_file_path: str,
@@ -307,12 +637,16 @@ def create_entry(
 
 def update_entries(
     match_results: dict,
-    converted_files_dir: str,
+    converted_files_dir: str | None,
     bt_files_dir: str,
     dry_run: bool = False,
     backup: bool = True,
     bioc_files_dir: str | None = None,
     copy_source: bool = True,
+    converted_entries: dict | None = None,
+    existing_entries: dict | None = None,
+    parallel: bool = False,
+    workers: int | None = None,
 ) -> dict:
     """
     Convenience function to update/create bio.tools entries based on match results.
@@ -325,9 +659,23 @@ def update_entries(
         backup: If True, create .backup files before modifying
         bioc_files_dir: Directory containing original Bioconductor JSON files
         copy_source: If True, copy original Bioconductor files to data directory
+        converted_entries: Optional converted entries keyed by file path
+        existing_entries: Optional existing bio.tools entries keyed by file path
+        parallel: If True, write all the changes concurrently as one transaction
+        workers: Number of threads writing files in parallel mode
 
     Returns:
         Summary of operations performed
     """
-    updater = Updater(bt_files_dir, dry_run, backup, bioc_files_dir, copy_source)
-    return updater.apply_changes(match_results, converted_files_dir)
+    updater = Updater(
+        bt_files_dir,
+        dry_run,
+        backup,
+        bioc_files_dir,
+        copy_source,
+        parallel=parallel,
+        workers=workers,
+    )
+    return updater.apply_changes(
+        match_results, converted_files_dir, converted_entries, existing_entries
+    )
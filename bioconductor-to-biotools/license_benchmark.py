@@ -0,0 +1,167 @@
+"""
+Time bc2bt.license_normalizer.normalize_license() on the licence strings of a
+synthetic Bioconductor release (20k packages by default), cold, memoized and
+through normalize_licenses(), and compare its results with the previous
+difflib-based implementation over the same SPDX identifiers. Also time the
+fuzzy fallback alone on misspelled identifiers, and check that every bundled
+SPDX licence and exception identifier normalizes to itself.
+
+    python license_benchmark.py [packages]
+"""
+
+import difflib
+import random
+import sys
+import time
+
+from bc2bt import license_normalizer
+from bc2bt.license_normalizer import normalize_license, normalize_licenses
+
+# Licence strings as they appear in Bioconductor DESCRIPTION files
+LICENSES = [
+    "Artistic-2.0",
+    "Artistic License 2.0",
+    "GPL-2",
+    "GPL-3",
+    "GPL (>= 2)",
+    "GPL (>= 3)",
+    "GPL (>= 3) + file LICENSE",
+    "GPL-2 | GPL-3",
+    "LGPL",
+    "LGPL-2.1",
+    "LGPL (>= 3)",
+    "MIT + file LICENSE",
+    "MIT + file LICENCE",
+    "BSD_3_clause + file LICENSE",
+    "BSD_2_clause + file LICENSE",
+    "Apache License (>= 2)",
+    "Apache License 2.0",
+    "AGPL-3",
+    "CC BY 4.0",
+    "CC0",
+    "EPL-2.0",
+    "file LICENSE",
+    "Unlimited",
+    "Apache-2.0",
+    "Artistc-2.0",
+    "GPL-3.0-or-later",
+]
+
+
+def legacy_normalize(raw_license, fuzzy_cutoff=0.92):
+    """The previous normalize_license(), with difflib as the fuzzy matcher."""
+    cleaned = license_normalizer._clean_string_for_exact_match(raw_license)
+    if cleaned in license_normalizer._ALIAS_MAP:
+        return license_normalizer._ALIAS_MAP[cleaned]
+    spdx_ids = set(license_normalizer._spdx_indices()[0].by_lower.values())
+    if cleaned.upper() in spdx_ids:
+        return cleaned.upper()
+    fallback = license_normalizer._family_fallback(
+        *license_normalizer._extract_family_version(raw_license)
+    )
+    if fallback:
+        return fallback
+    lowered = {s.lower(): s for s in spdx_ids}
+    matches = difflib.get_close_matches(
+        cleaned.lower(), lowered.keys(), n=1, cutoff=fuzzy_cutoff
+    )
+    return lowered[matches[0]] if matches else None
+
+
+def misspelled_ids(count, seed=1):
+    """SPDX identifiers with one or two random insertions or deletions."""
+    rng = random.Random(seed)
+    ids = sorted(license_normalizer._spdx_indices()[0].by_lower)
+    misspelled = []
+    for _ in range(count):
+        chars = list(rng.choice(ids))
+        for _ in range(rng.randint(1, 2)):
+            position = rng.randrange(len(chars))
+            if rng.random() < 0.5:
+                del chars[position]
+            else:
+                chars.insert(position, rng.choice("abcdefgl0123.-"))
+        misspelled.append("".join(chars))
+    return misspelled
+
+
+def legacy_fuzzy_match(candidate, cutoff=0.92):
+    """The previous fuzzy fallback, scanning every identifier with difflib."""
+    lowered = license_normalizer._spdx_indices()[0].by_lower
+    matches = difflib.get_close_matches(candidate, lowered, n=1, cutoff=cutoff)
+    return matches[0] if matches else None
+
+
+def timed(label, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{label}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    return result
+
+
+if __name__ == "__main__":
+    packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(1)
+    # Mostly the common strings, plus a tail of one-off variants
+    raw_licenses = [
+        rng.choice(LICENSES)
+        if rng.random() < 0.95
+        else f"GPL (>= {rng.randrange(100)})"
+        for _ in range(packages)
+    ]
+    print(f"{packages} packages, {len(set(raw_licenses))} distinct licence strings")
+
+    expected = timed("legacy", lambda: [legacy_normalize(r) for r in raw_licenses])
+    license_normalizer._normalize_cached.cache_clear()
+    timed(
+        "normalize_license, cold cache",
+        lambda: [normalize_license(r) for r in LICENSES],
+    )
+    results = timed(
+        "normalize_license", lambda: [normalize_license(r) for r in raw_licenses]
+    )
+    license_normalizer._normalize_cached.cache_clear()
+    batch = timed("normalize_licenses, cold cache", normalize_licenses, raw_licenses)
+
+    if batch != results:
+        sys.exit("ERROR: normalize_licenses() differs from normalize_license()")
+    differences = {
+        raw: (old, new)
+        for raw, old, new in zip(raw_licenses, expected, results)
+        if old != new
+    }
+    for raw, (old, new) in sorted(differences.items()):
+        print(f"changed: {raw!r}: {old} -> {new}")
+    print(f"{len(set(raw_licenses)) - len(differences)} distinct strings unchanged")
+
+    index, exceptions = license_normalizer._spdx_indices()
+    wrong = {
+        spdx_id: normalize_license(spdx_id)
+        for spdx_id in index.by_lower.values()
+        if normalize_license(spdx_id) != spdx_id
+    }
+    wrong.update(
+        (spdx_id, license_normalizer._match_exception(spdx_id, 0.92))
+        for spdx_id in exceptions.by_lower.values()
+        if license_normalizer._match_exception(spdx_id, 0.92) != spdx_id
+    )
+    for spdx_id, result in sorted(wrong.items()):
+        print(f"not an identity: {spdx_id} -> {result}")
+    if wrong:
+        sys.exit(f"ERROR: {len(wrong)} SPDX identifiers do not normalize to themselves")
+    print(
+        f"all {len(index.by_lower)} licence and {len(exceptions.by_lower)} "
+        "exception identifiers normalize to themselves"
+    )
+
+    misspelled = misspelled_ids(1000)
+    print(f"fuzzy fallback, {len(misspelled)} misspelled of {len(index.by_lower)} ids")
+    expected = timed("legacy", lambda: [legacy_fuzzy_match(c) for c in misspelled])
+    results = timed(
+        "trigram index",
+        lambda: [license_normalizer._fuzzy_match(c, index) for c in misspelled],
+    )
+    agreeing = sum(
+        old == (new.lower() if new else None) for old, new in zip(expected, results)
+    )
+    print(f"{agreeing} of {len(misspelled)} identical")
@@ -0,0 +1,122 @@
+"""
+Time bc2bt.mapper.find_matches_optimized() on synthetic identity values
+(100k existing entries against 10k converted ones by default), and check it
+against the previous per-candidate verification loop.
+
+    python matching_benchmark.py [size1] [size2]
+"""
+
+import random
+import sys
+import time
+from collections import defaultdict
+
+from bc2bt.mapper import build_reverse_index, find_matches_optimized
+
+METHODS = ["name_homepage", "doi", "name_insensitive", "homepage"]
+POPULAR_DOI = "10.1186/gb-2004-5-10-r80"
+
+
+def synthetic_values(size, offset, seed):
+    """
+    Identity values shaped like those of compute_identity_values(), with
+    shared names, homepages and DOIs so that files have several candidates,
+    and a DOI cited by a third of the entries, like the Bioconductor paper.
+    """
+    rng = random.Random(seed)
+    values = {}
+    for n in range(size):
+        i = offset + n
+        name = f"tool{rng.randrange(size)}"
+        homepage = f"example.org/{name}" if rng.random() < 0.8 else f"other.org/{i}"
+        entry = {
+            "name_insensitive": name,
+            "homepage": homepage,
+            "name_homepage": (name, homepage),
+        }
+        if rng.random() < 0.6:
+            dois = {
+                f"10.1000/{rng.randrange(size * 2)}" for _ in range(rng.randint(1, 3))
+            }
+            if rng.random() < 0.5:
+                dois.add(POPULAR_DOI)
+            entry["doi"] = frozenset(dois)
+        values[f"data/tool{i}/tool{i}.biotools.json"] = entry
+    return values
+
+
+def legacy_matches(identity_values1, identity_values2, identity_indices2, methods):
+    """
+    The previous algorithm: gather the unmatched candidates of each file,
+    then verify each of them against every method. Candidates are taken in
+    dataset order, which is the order find_matches_optimized() settles on.
+    """
+    order2 = {f: i for i, f in enumerate(identity_values2)}
+    match_results = defaultdict(lambda: defaultdict(set))
+    matched_files2 = set()
+    for file1, id_vals1 in identity_values1.items():
+        candidates = set()
+        for method in methods:
+            if method not in id_vals1:
+                continue
+            id_val1 = id_vals1[method]
+            elements = id_val1 if isinstance(id_val1, (set, frozenset)) else [id_val1]
+            for element in elements:
+                for file2 in identity_indices2[method].get(element, ()):
+                    if file2 not in matched_files2:
+                        candidates.add(file2)
+        for file2 in sorted(candidates, key=order2.get):
+            id_vals2 = identity_values2[file2]
+            found = []
+            for method in methods:
+                if method not in id_vals1 or method not in id_vals2:
+                    continue
+                id1, id2 = id_vals1[method], id_vals2[method]
+                if isinstance(id1, frozenset) and isinstance(id2, frozenset):
+                    if not id1.isdisjoint(id2):
+                        found.append(method)
+                elif id1 == id2:
+                    found.append(method)
+            if found:
+                for method in found:
+                    match_results[method][file1].add(file2)
+                matched_files2.add(file2)
+                break
+    return match_results
+
+
+def timed(label, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+if __name__ == "__main__":
+    size1 = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    size2 = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    values1 = synthetic_values(size1, 0, 1)
+    # half of dataset 2 are copies of entries of dataset 1
+    values2 = synthetic_values(size2 // 2, size1, 2)
+    copies = random.Random(3).sample(sorted(values1), size2 - size2 // 2)
+    values2.update((f"converted/{path}", values1[path]) for path in copies)
+    indices1 = timed("reverse index 1", build_reverse_index, values1, METHODS)
+    indices2 = timed("reverse index 2", build_reverse_index, values2, METHODS)
+
+    results = timed(
+        f"find_matches_optimized {size1} x {size2}",
+        find_matches_optimized,
+        values1,
+        values2,
+        indices2,
+        METHODS,
+        indices1,
+    )[0]
+    expected = timed("legacy loop", legacy_matches, values1, values2, indices2, METHODS)
+
+    for method in METHODS:
+        print(f"{method} matched: {len(results[method])} files")
+    if results != expected:
+        sys.exit("ERROR: results differ from the legacy loop")
+    print("results identical")
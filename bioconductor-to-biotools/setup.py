@@ -25,6 +25,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/hmenager/bc2bt",
     packages=find_packages(exclude=["tests", "tests.*", "examples", "examples.*"]),
+    package_data={"bc2bt": ["data/*.json"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Science/Research",
@@ -51,6 +52,9 @@ setup(
             "sphinx>=6.0",
             "sphinx-rtd-theme>=1.2",
         ],
+        "fast": [
+            "orjson>=3.9",
+        ],
     },
     entry_points={
         "console_scripts": [
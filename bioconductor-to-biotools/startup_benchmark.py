@@ -0,0 +1,65 @@
+"""
+Measure the import time of the bc2bt command line with python -X importtime,
+and exit with an error if it exceeds a budget or if the plotting stack is
+imported without any plot being requested.
+
+    python startup_benchmark.py [budget_ms] [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+MODULE = "bc2bt.cli"
+# Modules that must only be imported when they are used
+LAZY_MODULES = ["matplotlib", "pandas", "upsetplot", "tqdm"]
+DEFAULT_BUDGET_MS = 250
+
+
+def import_time(module):
+    """
+    Import a module in a fresh interpreter and return its cumulative import
+    time in milliseconds, and the top-level packages it loaded.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        check=True,
+    )
+    cumulative = None
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        name = name.strip()
+        packages.add(name.split(".")[0])
+        if name == module:
+            cumulative = int(cumulative_us) / 1000
+    return cumulative, packages
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    timings = []
+    for _ in range(runs):
+        cumulative, packages = import_time(MODULE)
+        timings.append(cumulative)
+    best = min(timings)
+    print(f"import {MODULE}: best {best:.1f} ms of {runs} runs (budget {budget} ms)")
+
+    errors = []
+    eager = [name for name in LAZY_MODULES if name in packages]
+    if eager:
+        errors.append(f"imported at startup: {', '.join(eager)}")
+    if best > budget:
+        errors.append(f"import time {best:.1f} ms exceeds {budget} ms")
+    if errors:
+        sys.exit("ERROR: " + "; ".join(errors))
+    print("OK")
@@ -0,0 +1,57 @@
+"""
+Refresh the SPDX license and exception list bundled with bc2bt, from the
+machine-readable files of https://github.com/spdx/license-list-data.
+
+    python update_spdx_licenses.py [version]
+"""
+
+import json
+import os
+import sys
+
+import requests
+
+BASE_URL = "https://raw.githubusercontent.com/spdx/license-list-data/{version}/json/"
+OUTPUT = os.path.join(os.path.dirname(__file__), "bc2bt", "data", "spdx_licenses.json")
+
+
+def fetch(version, name):
+    response = requests.get(BASE_URL.format(version=version) + name, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+if __name__ == "__main__":
+    version = sys.argv[1] if len(sys.argv) > 1 else "main"
+    licenses = fetch(version, "licenses.json")
+    exceptions = fetch(version, "exceptions.json")
+    data = {
+        "licenseListVersion": licenses["licenseListVersion"],
+        "licenses": sorted(
+            (
+                {
+                    "licenseId": license["licenseId"],
+                    "isDeprecatedLicenseId": license["isDeprecatedLicenseId"],
+                }
+                for license in licenses["licenses"]
+            ),
+            key=lambda license: license["licenseId"].lower(),
+        ),
+        "exceptions": sorted(
+            (
+                {
+                    "licenseExceptionId": exception["licenseExceptionId"],
+                    "isDeprecatedLicenseId": exception["isDeprecatedLicenseId"],
+                }
+                for exception in exceptions["exceptions"]
+            ),
+            key=lambda exception: exception["licenseExceptionId"].lower(),
+        ),
+    }
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+        f.write("\n")
+    print(
+        f"SPDX license list {data['licenseListVersion']}: "
+        f"{len(data['licenses'])} licenses, {len(data['exceptions'])} exceptions"
+    )
@@ -1,13 +1,7 @@
 import os
 import glob
-from rdflib import Graph
-
-try:
-    from tabulate import tabulate
-except ImportError:
-
-    def tabulate(rows, headers=()):
-        return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+from dump import stream_dump
+from stats import show_stats
 
 
 def get_bioconda_files_in_repo():
@@ -33,54 +27,9 @@ def process_tools():
     Go through all bioconda entries in bioschemas JSON-LD and produce an single RDF file.
     """
     tool_files = get_bioconda_files_in_repo()
-    rdf_graph = Graph()
-
-    for tool_file in tool_files:
-        # print(tool_file)
-        rdf_graph.parse(tool_file, format="json-ld")
-
-    rdf_graph.serialize(
-        format="turtle",
-        destination="../../content/datasets/bioconda-dump.ttl",
-        # destination=os.path.join(directory, tpe_id + "bioschemas.jsonld")
-    )
- 
-
-    show_stats(rdf_graph)
-
-
-def show_stats(rdf_graph):
-    """
-    Display Bioschemas classes and properties counts.
-    """
-
-    ### display used classes
-    classes_counts = """
-    SELECT ?c (count(?c) as ?count) WHERE {
-        ?s rdf:type ?c .
-    } 
-    GROUP BY ?c
-    ORDER BY DESC(?count)
-    """
-
-    res = rdf_graph.query(classes_counts)
-    print()
-    print("Used classes")
-    print(tabulate(res))
-
-    ### display used properties
-    property_counts = """
-    SELECT ?p (count(?p) as ?count) WHERE {
-        ?s ?p ?o .
-    } 
-    GROUP BY ?p
-    ORDER BY DESC(?count)
-    """
+    summary = stream_dump(tool_files, "../../content/datasets/bioconda-dump.ttl")
 
-    res = rdf_graph.query(property_counts)
-    print()
-    print("Used properties")
-    print(tabulate(res))
+    show_stats(summary)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ import requests
 import yaml
 from pathlib import Path
 from rdflib import Graph
+from parallel import run_tools, show_report
+from writer import write_outputs
 
 # def getBiotoolsId(bioconda_data) -> str:
 #     """
@@ -165,7 +167,6 @@ def rdfize(data) -> Graph:
 
         g = Graph()
         g.parse(data=prefix + "\n" + triples, format="turtle")
-        print(g.serialize(format="turtle"))
             # serialize in compact json ld syntax
             # print(g.serialize(format='json-ld'))
         return g
@@ -173,7 +174,7 @@ def rdfize(data) -> Graph:
     except Exception as e:
         print("PARSING ERROR for:")
         print(prefix + "\n" + triples)
-        print(e)
+        raise (e)
 
 
 def get_bioconductor_files_in_repo():
@@ -228,14 +229,10 @@ def process_tools_by_id(id="SPROUT"):
             temp_graph = rdfize(tool)
             #print(temp_graph.serialize(format="turtle"))
             if temp_graph and os.path.exists(directory):
-                temp_graph.serialize(
-                    format="json-ld",
-                    auto_compact=True,
-                    destination=os.path.join(directory, tpe_id + ".bioconductor.jsonld"),
-                )
-                temp_graph.serialize(
-                    format="turtle",
-                    destination=os.path.join(directory, tpe_id + ".bioconductor.ttl"),
+                write_outputs(
+                    temp_graph,
+                    jsonld_path=os.path.join(directory, tpe_id + ".bioconductor.jsonld"),
+                    ttl_path=os.path.join(directory, tpe_id + ".bioconductor.ttl"),
                 )
 
 def clean():
@@ -247,48 +244,44 @@ def clean():
         os.remove(data_file)
 
 
-def process_tools():
+def process_tool_file(tool_file):
     """
-    Go through all bioconductor entries and produce an RDF graph representation (BioSchemas / JSON-LD).
+    Produce the BioSchemas JSON-LD and TTL files for a single bioconductor package.
     """
-    tool_files = get_bioconductor_files_in_repo()
-    for tool_file in tool_files:
-        path = Path(tool_file)
-        tool = json.loads(path.read_text(encoding="utf-8"))
+    path = Path(tool_file)
+    tool = json.loads(path.read_text(encoding="utf-8"))
 
+    tool_id = os.path.basename(tool_file)
+    tool_id = tool_id.removesuffix(".bioconductor.json")
 
-        #print(tool_file)
-        tool_id = os.path.basename(tool_file)
-        tool_id = tool_id.removesuffix(".bioconductor.json") 
-        # if "Package" in tool.keys():
-        #     tool_id = tool["Package"]
-        # tool_id = os.path.basename(tool_file)
-        # tool_id = tool_id.removesuffix(".bioconductor.json")
-
-        if tool_id is None:
-            print(f"WARNING: no tool id found for {tool_file}!")
-            continue
-
-        tpe_id = tool_id.lower()
-        directory = os.path.join("..", "..", "content", "data", tpe_id)
-
-        if not os.path.exists(directory):
-            print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
-            continue
-
-        ## generate bioconductor JSON-LD and TTL files
-        temp_graph = rdfize(tool)
-        if temp_graph and os.path.exists(directory):
-            temp_graph.serialize(
-                format="json-ld",
-                auto_compact=True,
-                destination=os.path.join(directory, tpe_id + ".bioconductor.jsonld"),
-            )
-            temp_graph.serialize(
-                format="turtle",
-                destination=os.path.join(directory, tpe_id + ".bioconductor.ttl"),
-            )
-            print(temp_graph.serialize(format="turtle"))
+    if tool_id is None:
+        print(f"WARNING: no tool id found for {tool_file}!")
+        return None
+
+    tpe_id = tool_id.lower()
+    directory = os.path.join("..", "..", "content", "data", tpe_id)
+
+    if not os.path.exists(directory):
+        print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
+        return None
+
+    ## generate bioconductor JSON-LD and TTL files
+    temp_graph = rdfize(tool)
+    if temp_graph and os.path.exists(directory):
+        jsonld_file = os.path.join(directory, tpe_id + ".bioconductor.jsonld")
+        ttl_file = os.path.join(directory, tpe_id + ".bioconductor.ttl")
+        write_outputs(temp_graph, jsonld_file, ttl_file)
+        return [jsonld_file, ttl_file]
+    return None
+
+
+def process_tools(workers=None):
+    """
+    Go through all bioconductor entries and produce an RDF graph representation (BioSchemas / JSON-LD).
+    """
+    tool_files = get_bioconductor_files_in_repo()
+    report = run_tools(tool_files, process_tool_file, workers=workers)
+    show_report(report, "bioconductor_bioschemas_report.json")
 
 
 if __name__ == "__main__":
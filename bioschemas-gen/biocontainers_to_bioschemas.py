@@ -4,6 +4,8 @@ import glob
 import json
 from pathlib import Path
 from rdflib import Graph
+from parallel import run_tools, show_report
+from writer import write_outputs
 import requests
 
 
@@ -132,7 +134,7 @@ def rdfize(data) -> Graph:
     except Exception as e:
         print("PARSING ERROR for:")
         print(prefix + "\n" + triples)
-        print(e)
+        raise (e)
 
 
 def get_biotools_files_in_repo():
@@ -165,18 +167,11 @@ def process_tools_by_id(id="SPROUT"):
             ## generate biocontainers JSON-LD and TTL files
             temp_graph = rdfize(tool)
             if temp_graph and os.path.exists(directory):
-                temp_graph.serialize(
-                    format="json-ld",
-                    auto_compact=True,
-                    destination=os.path.join(
-                        directory, tpe_id + ".biocontainers.jsonld"
-                    ),
+                write_outputs(
+                    temp_graph,
+                    jsonld_path=os.path.join(directory, tpe_id + ".biocontainers.jsonld"),
+                    ttl_path=os.path.join(directory, tpe_id + ".biocontainers.ttl"),
                 )
-                temp_graph.serialize(
-                    format="turtle",
-                    destination=os.path.join(directory, tpe_id + ".biocontainers.ttl"),
-                )
-                print(temp_graph.serialize(format="turtle"))
 
 
 def clean():
@@ -188,36 +183,38 @@ def clean():
         os.remove(data_file)
 
 
-def process_tools():
+def process_tool_file(tool_file):
+    """
+    Produce the BioSchemas JSON-LD and TTL files for a single biocontainers entry.
+    """
+    path = Path(tool_file)
+    tool = yaml.safe_load(path.read_text(encoding="utf-8"))
+
+    tool_id = tool["name"]
+    tpe_id = tool_id.lower()
+    directory = os.path.join("..", "..", "content", "data", tpe_id)
+
+    if not os.path.exists(directory):
+        print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
+        return None
+
+    ## generate biocontainers JSON-LD and TTL files
+    temp_graph = rdfize(tool)
+    if temp_graph and os.path.exists(directory):
+        jsonld_file = os.path.join(directory, tpe_id + ".biocontainers.jsonld")
+        ttl_file = os.path.join(directory, tpe_id + ".biocontainers.ttl")
+        write_outputs(temp_graph, jsonld_file, ttl_file)
+        return [jsonld_file, ttl_file]
+    return None
+
+
+def process_tools(workers=None):
     """
     Go through all bio.tools entries and produce an RDF graph representation (BioSchemas / JSON-LD).
     """
     tool_files = get_biotools_files_in_repo()
-    for tool_file in tool_files:
-        path = Path(tool_file)
-        tool = yaml.safe_load(path.read_text(encoding="utf-8"))
-
-        tool_id = tool["name"]
-        tpe_id = tool_id.lower()
-        directory = os.path.join("..", "..", "content", "data", tpe_id)
-
-        if not os.path.exists(directory):
-            print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
-            continue
-
-        ## generate biocontainers JSON-LD and TTL files
-        temp_graph = rdfize(tool)
-        if temp_graph and os.path.exists(directory):
-            temp_graph.serialize(
-                format="json-ld",
-                auto_compact=True,
-                destination=os.path.join(directory, tpe_id + ".biocontainers.jsonld"),
-            )
-            temp_graph.serialize(
-                format="turtle",
-                destination=os.path.join(directory, tpe_id + ".biocontainers.ttl"),
-            )
-            print(temp_graph.serialize(format="turtle"))
+    report = run_tools(tool_files, process_tool_file, workers=workers)
+    show_report(report, "biocontainers_bioschemas_report.json")
 
 
 if __name__ == "__main__":
@@ -1,57 +1,73 @@
+import argparse
 import json
 import os
 import glob
+import zlib
 from rdflib import Graph
-
-
-def rdfize(json_entry):
+from rdflib.compare import isomorphic
+from parallel import run_tools, show_report
+
+
+BASE = "https://bio.tools/"
+CONTEXT_FILE = "../../content/data/bioschemas.context.jsonld"
+# how entries in ../../content/data/<id>/ reference CONTEXT_FILE
+CONTEXT_REF = "../bioschemas.context.jsonld"
+
+# Fraction of the tools checked against the rdflib round-trip, see --validate.
+validate_rate = 0.0
+
+# JSON-LD context shared by all bio.tools entries. The fast path writes it once
+# as CONTEXT_FILE and references it from every entry instead of inlining it.
+BIOSCHEMAS_CONTEXT = {
+    "@context": {
+        "@base": "https://bio.tools/",
+        "biotools": "https://bio.tools/ontology/",
+        "edam": "http://edamontology.org/",
+        "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+        "sc": "http://schema.org/",
+        "dct": "http://purl.org/dc/terms/",
+        "bsc": "http://bioschemas.org/",
+        "bsct": "http://bioschemas.org/types/",
+        "description": "sc:description",
+        "name": "sc:name",
+        "identifier": "sc:identifier",
+        "sameAs": "sc:sameAs",
+        "homepage": "sc:url",
+        "toolType": "sc:additionalType",
+        "primaryContact": "biotools:primaryContact",
+        "author": "sc:author",
+        "provider": "sc:provider",
+        "contributor": "sc:contributor",
+        "funder": "sc:funder",
+        "hasPublication": "sc:citation",
+        "hasTopic": "sc:applicationSubCategory",
+        "hasOperation": "sc:featureList",
+        "hasInputData": "bsc:input",
+        "hasOutputData": "bsc:output",
+        "license": "sc:license",
+        "version": "sc:softwareVersion",
+        "isAccessibleForFree": "sc:isAccessibleForFree",
+        "operatingSystem": "sc:operatingSystem",
+        "hasApiDoc": "sc:softwareHelp",
+        "hasGenDoc": "sc:softwareHelp",
+        "hasTermsOfUse": "sc:termsOfService",
+        "conformsTo": "dct:conformsTo",
+        "additionalType": "sc:additionalType",
+        "encodingFormat": "sc:encodingFormat",
+    }
+}
+
+
+def rdfize_entry(json_entry):
     """
-    Transforms a biotools json entry into RDF, and returns a JSON-LD serialization. The following fields
-    are covered: contact, publication, EDAM topic, EDAM operation, EDAM inputs & outputs.
+    Transforms a biotools json entry into a JSON-LD document (dict, with the inline context). The following
+    fields are covered: contact, publication, EDAM topic, EDAM operation, EDAM inputs & outputs.
     """
 
     entry = json_entry
 
     try:
-        ctx = {
-            "@context": {
-                "@base": "https://bio.tools/",
-                "biotools": "https://bio.tools/ontology/",
-                "edam": "http://edamontology.org/",
-                "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
-                "sc": "http://schema.org/",
-                "dct": "http://purl.org/dc/terms/",
-                "bsc": "http://bioschemas.org/",
-                "bsct": "http://bioschemas.org/types/",
-                "description": "sc:description",
-                "name": "sc:name",
-                "identifier": "sc:identifier",
-                "sameAs": "sc:sameAs",
-                "homepage": "sc:url",
-                "toolType": "sc:additionalType",
-                "primaryContact": "biotools:primaryContact",
-                "author": "sc:author",
-                "provider": "sc:provider",
-                "contributor": "sc:contributor",
-                "funder": "sc:funder",
-                "hasPublication": "sc:citation",
-                "hasTopic": "sc:applicationSubCategory",
-                "hasOperation": "sc:featureList",
-                "hasInputData": "bsc:input",
-                "hasOutputData": "bsc:output",
-                "license": "sc:license",
-                "version": "sc:softwareVersion",
-                "isAccessibleForFree": "sc:isAccessibleForFree",
-                "operatingSystem": "sc:operatingSystem",
-                "hasApiDoc": "sc:softwareHelp",
-                "hasGenDoc": "sc:softwareHelp",
-                "hasTermsOfUse": "sc:termsOfService",
-                "conformsTo": "dct:conformsTo",
-                "additionalType": "sc:additionalType",
-                "encodingFormat": "sc:encodingFormat",
-            }
-        }
-        entry.update(ctx)
+        entry.update(BIOSCHEMAS_CONTEXT)
 
         entry["@id"] = str(entry["biotoolsID"])
         # entry['@type'] = ['bsc:Tool','sc:SoftwareApplication']
@@ -361,10 +377,80 @@ def rdfize(json_entry):
     except KeyError as e:
         print(e)
         pass
-    raw_jld = json.dumps(entry, indent=4, sort_keys=True)
+    return entry
+
+
+def rdfize(json_entry):
+    """
+    Transforms a biotools json entry into RDF, and returns a JSON-LD serialization.
+    """
+    raw_jld = json.dumps(rdfize_entry(json_entry), indent=4, sort_keys=True)
     return raw_jld
 
 
+def _compact_value(value, terms):
+    if isinstance(value, dict):
+        res = {}
+        for key, val in value.items():
+            if key == "@context" or (key not in terms and not key.startswith("@")):
+                continue
+            val = _compact_value(val, terms)
+            if val is None or val == []:
+                continue
+            if key == "@id" and ":" not in val:
+                val = BASE + val
+            res[key] = val
+        return res
+    if isinstance(value, list):
+        return [v for v in (_compact_value(v, terms) for v in value) if v is not None]
+    return value
+
+
+def compact_entry(entry, context=CONTEXT_REF):
+    """
+    Keep only the parts of an rdfize_entry() document that the context maps
+    to RDF, and reference the shared context instead of inlining it.
+
+    Keys that are not terms of the context are ignored by JSON-LD processors,
+    so this yields the same graph as the rdflib round-trip. Relative @id
+    values are resolved here because @base is not honoured in a referenced
+    context.
+    """
+    terms = BIOSCHEMAS_CONTEXT["@context"]
+    doc = {"@context": context}
+    doc.update(_compact_value(entry, terms))
+    return doc
+
+
+def write_context():
+    """
+    Write the shared JSON-LD context document referenced by the entries.
+    """
+    with open(CONTEXT_FILE, "w", encoding="utf-8") as f:
+        json.dump(BIOSCHEMAS_CONTEXT, f, indent=4)
+
+
+def check_isomorphic(entry, doc):
+    """
+    Check that the fast-path document gives the same graph as the rdflib
+    round-trip of the full entry.
+    """
+    expected = Graph().parse(data=json.dumps(entry), format="json-ld")
+    inlined = dict(doc, **BIOSCHEMAS_CONTEXT)
+    actual = Graph().parse(data=json.dumps(inlined), format="json-ld")
+    if not isomorphic(expected, actual):
+        raise ValueError(
+            f"fast path graph differs from rdflib round-trip for {entry.get('@id')}"
+        )
+
+
+def sampled(tool_file, rate):
+    """
+    Deterministically pick about *rate* of the files for validation.
+    """
+    return zlib.crc32(tool_file.encode("utf-8")) % 10000 < rate * 10000
+
+
 def get_biotools_files_in_repo():
     tools = []
     for data_file in glob.glob("../../content/data/*/*.biotools.json"):
@@ -389,14 +475,8 @@ def process_tools_by_id(id="SPROUT"):
                 directory = os.path.join("..", "..", "content", "data", tpe_id)
                 dest = os.path.join(directory, tpe_id + ".bioschemas.jsonld")
 
-                jsonld = rdfize(tool)
-                temp_graph = Graph()
-                temp_graph.parse(data=jsonld, format="json-ld")
-                temp_graph.serialize(
-                    format="json-ld",
-                    auto_compact=True,
-                    destination=os.path.join(directory, tpe_id + ".bioschemas.jsonld"),
-                )
+                write_context()
+                process_tool_file(tool_file)
                 print(f"generated markup at {dest}")
 
 
@@ -406,29 +486,68 @@ def clean():
         os.remove(data_file)
 
 
-def process_tools():
+def process_tool_file(tool_file):
+    """
+    Produce the BioSchemas JSON-LD file for a single bio.tools entry.
+    """
+    tool = json.load(open(tool_file))
+    tool_id = tool["biotoolsID"]
+    tpe_id = tool_id.lower()
+    directory = os.path.join("..", "..", "content", "data", tpe_id)
+    dest = os.path.join(directory, tpe_id + ".bioschemas.jsonld")
+
+    entry = rdfize_entry(tool)
+    doc = compact_entry(entry)
+    if validate_rate and sampled(tool_file, validate_rate):
+        check_isomorphic(entry, doc)
+
+    with open(dest, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+    return dest
+
+
+def init_worker(rate):
+    """
+    Share the validation sampling rate with the pool workers.
+    """
+    global validate_rate
+    validate_rate = rate
+
+
+def process_tools(workers=None, validate=0.0):
     """
     Go through all bio.tools entries and produce an RDF graph representation (BioSchemas / JSON-LD).
     """
+    write_context()
     tool_files = get_biotools_files_in_repo()
-    for tool_file in tool_files:
-        tool = json.load(open(tool_file))
-        print(tool_file)
-        tool_id = tool["biotoolsID"]
-        tpe_id = tool_id.lower()
-        directory = os.path.join("..", "..", "content", "data", tpe_id)
-
-        jsonld = rdfize(tool)
-        temp_graph = Graph()
-        temp_graph.parse(data=jsonld, format="json-ld")
-        temp_graph.serialize(
-            format="json-ld",
-            auto_compact=True,
-            destination=os.path.join(directory, tpe_id + ".bioschemas.jsonld"),
-        )
+    report = run_tools(
+        tool_files,
+        process_tool_file,
+        initializer=init_worker,
+        initargs=(validate,),
+        workers=workers,
+    )
+    show_report(report, "biotools_bioschemas_report.json")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate BioSchemas JSON-LD files for bio.tools entries"
+    )
+    parser.add_argument(
+        "--validate",
+        type=float,
+        nargs="?",
+        const=0.01,
+        default=0.0,
+        metavar="RATE",
+        help="check a sample of the tools (default 1%%) against the rdflib round-trip",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="number of worker processes"
+    )
+    args = parser.parse_args()
+
     clean()
-    process_tools()
+    process_tools(workers=args.workers, validate=args.validate)
     # process_tools_by_id("macsyfinder")
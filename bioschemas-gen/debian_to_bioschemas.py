@@ -3,6 +3,9 @@ import glob
 import yaml
 from pathlib import Path
 from rdflib import Graph
+from edam import get_edam_uris_from_labels, load_edam_labels
+from parallel import run_tools, show_report
+from writer import write_outputs
 
 
 
@@ -11,26 +14,7 @@ def getEdamUrisFromLabels(edam_labels) -> list:
     """
     Get EDAM URIs from EDAM labels.
     """
-
-    res = []
-
-    for lab in edam_labels:
-        query = """
-    PREFIX edam: <http://edamontology.org/>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-    SELECT ?label ?entity WHERE {
-        ?entity rdfs:label '%s' .
-    }
-    """ % (lab)
-
-        q = edam_kg.query(query)
-        for r in q:
-            # uri = r['entity']
-            uri = r["entity"].rsplit("/", 1)[-1]
-            res.append(f"{uri}")
-
-    return res
+    return get_edam_uris_from_labels(edam_labels, edam_index)
 
 
 def getBiotoolsIdFromDebian(debian_data) -> str:
@@ -183,7 +167,6 @@ def rdfize(data) -> Graph:
 
         g = Graph()
         g.parse(data=prefix + "\n" + triples, format="turtle")
-        print(g.serialize(format="turtle"))
         return g
 
     except Exception as e:
@@ -218,14 +201,10 @@ def process_tools_by_id(id="SPROUT"):
             ## generate debian JSON-LD and TTL files
             temp_graph = rdfize(tool)
             if temp_graph and os.path.exists(directory):
-                temp_graph.serialize(
-                    format="json-ld",
-                    auto_compact=True,
-                    destination=os.path.join(directory, tpe_id + ".debian.jsonld"),
-                )
-                temp_graph.serialize(
-                    format="turtle",
-                    destination=os.path.join(directory, tpe_id + ".debian.ttl"),
+                write_outputs(
+                    temp_graph,
+                    jsonld_path=os.path.join(directory, tpe_id + ".debian.jsonld"),
+                    ttl_path=os.path.join(directory, tpe_id + ".debian.ttl"),
                 )
 
 
@@ -238,42 +217,56 @@ def clean():
         os.remove(data_file)
 
 
-def process_tools():
+def process_tool_file(tool_file):
+    """
+    Produce the BioSchemas JSON-LD and TTL files for a single debian package.
+    """
+    path = Path(tool_file)
+    tool = yaml.safe_load(path.read_text(encoding="utf-8"))
+
+    tool_id = tool["package"]
+    tpe_id = tool_id.lower()
+    directory = os.path.join("..", "..", "content", "data", tpe_id)
+
+    if not os.path.exists(directory):
+        print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
+        return None
+
+    ## generate debian JSON-LD and TTL files
+    temp_graph = rdfize(tool)
+    if temp_graph and os.path.exists(directory):
+        jsonld_file = os.path.join(directory, tpe_id + ".debian.jsonld")
+        ttl_file = os.path.join(directory, tpe_id + ".debian.ttl")
+        write_outputs(temp_graph, jsonld_file, ttl_file)
+        return [jsonld_file, ttl_file]
+    return None
+
+
+def init_worker(index):
+    """
+    Share the EDAM label index with the pool workers.
+    """
+    global edam_index
+    edam_index = index
+
+
+def process_tools(workers=None):
     """
     Go through all bio.tools entries and produce an RDF graph representation (BioSchemas / JSON-LD).
     """
     tool_files = get_biotools_files_in_repo()
-    for tool_file in tool_files:
-        path = Path(tool_file)
-        tool = yaml.safe_load(path.read_text(encoding="utf-8"))
-
-        print(tool_file)
-        tool_id = tool["package"]
-        tpe_id = tool_id.lower()
-        directory = os.path.join("..", "..", "content", "data", tpe_id)
-
-        if not os.path.exists(directory):
-            print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
-            continue
-
-        ## generate debian JSON-LD and TTL files
-        temp_graph = rdfize(tool)
-        if temp_graph and os.path.exists(directory):
-            temp_graph.serialize(
-                format="json-ld",
-                auto_compact=True,
-                destination=os.path.join(directory, tpe_id + ".debian.jsonld"),
-            )
-            temp_graph.serialize(
-                format="turtle",
-                destination=os.path.join(directory, tpe_id + ".debian.ttl"),
-            )
+    report = run_tools(
+        tool_files,
+        process_tool_file,
+        initializer=init_worker,
+        initargs=(edam_index,),
+        workers=workers,
+    )
+    show_report(report, "debian_bioschemas_report.json")
 
 
 if __name__ == "__main__":
-    edam_version = "https://github.com/edamontology/edamontology/raw/main/EDAM_dev.owl"
-    edam_kg = Graph()
-    edam_kg.parse(edam_version, format="xml")
+    edam_index = load_edam_labels()
 
     clean()
     process_tools()
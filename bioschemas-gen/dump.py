@@ -0,0 +1,94 @@
+import os
+
+from rdflib import BNode, Graph, Literal
+from stats import add_graph, new_stats, source_name, write_stats
+
+_FORMATS = {".nt": "nt", ".ttl": "turtle", ".jsonld": "json-ld"}
+
+
+def _escape(text):
+    return (
+        text.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def nt_term(term, bnode_prefix, labels):
+    """
+    N-Triples form of an RDF term. Blank nodes get a label unique to the
+    file being dumped (``bnode_prefix``) so that nodes from different files
+    never merge.
+    """
+    if isinstance(term, BNode):
+        if term not in labels:
+            labels[term] = f"{bnode_prefix}b{len(labels)}"
+        return "_:" + labels[term]
+    if isinstance(term, Literal):
+        res = f'"{_escape(str(term))}"'
+        if term.language:
+            return f"{res}@{term.language}"
+        if term.datatype is not None:
+            return f"{res}^^<{term.datatype}>"
+        return res
+    return f"<{term}>"
+
+
+def source_file(path):
+    """
+    Prefer an already generated .nt or .ttl sibling of a .jsonld file, which
+    is cheaper to parse.
+    """
+    base, ext = os.path.splitext(path)
+    if ext == ".jsonld":
+        for sibling in (base + ".nt", base + ".ttl"):
+            if os.path.exists(sibling):
+                return sibling
+    return path
+
+
+def stream_dump(files, destination) -> dict:
+    """
+    Concatenate per-tool RDF files into a single N-Triples file.
+
+    Files are parsed and written one at a time, so memory stays bounded by
+    the largest tool rather than the whole dump. N-Triples is a subset of
+    Turtle, so the output can keep a .ttl name. Triples shared by several
+    files (e.g. a Galaxy server typed as schema:WebSite) are written once per
+    file; RDF loaders deduplicate them.
+
+    Returns a summary with the number of files and triples, the rdf:type and
+    predicate usage counts (in total and per source, see stats.py), and the
+    files that could not be parsed. The counts are also saved next to the
+    dump as ``<dump>.stats.json`` and ``<dump>.stats.md``.
+    """
+    summary = new_stats()
+    summary["errors"] = []
+
+    written = 0
+    tmp_path = destination + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        for index, path in enumerate(files):
+            path = source_file(path)
+            fmt = _FORMATS.get(os.path.splitext(path)[1], "turtle")
+            try:
+                g = Graph().parse(path, format=fmt)
+            except Exception as e:
+                print(f"WARNING: could not parse {path}: {e}")
+                summary["errors"].append({"file": path, "error": str(e)})
+                continue
+
+            labels = {}
+            out.writelines(
+                f"{nt_term(s, f'f{index}', labels)} <{p}> "
+                f"{nt_term(o, f'f{index}', labels)} .\n"
+                for s, p, o in g
+            )
+            written += len(g)
+            add_graph(summary, source_name(path), g)
+    os.replace(tmp_path, destination)
+    write_stats(summary, os.path.splitext(destination)[0] + ".stats")
+
+    print(f"wrote {written} triples from {summary['files']} files")
+    return summary
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import defaultdict
+
+import rdflib
+import requests
+from rdflib import RDFS, XSD, Graph, Literal
+
+EDAM_URL = "https://github.com/edamontology/edamontology/raw/main/EDAM_dev.owl"
+
+# Set EDAM_OWL to a local file (or another URL, e.g. a released EDAM_x.y.owl)
+# to pin the ontology version. With a local file no network access is needed.
+EDAM_SOURCE = os.environ.get("EDAM_OWL", EDAM_URL)
+EDAM_CACHE_DIR = os.environ.get(
+    "EDAM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "edam")
+)
+
+# Bump when the layout of the pickled cache changes.
+_CACHE_FORMAT = 1
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _is_url(source):
+    return source.startswith(("http://", "https://"))
+
+
+def fetch_edam_owl(source=EDAM_SOURCE, cache_dir=EDAM_CACHE_DIR, offline=False):
+    """
+    Return the path of a local copy of the EDAM OWL file.
+
+    Remote sources are cached in *cache_dir* and revalidated with
+    If-None-Match / If-Modified-Since, so an unchanged ontology is not
+    downloaded again. When *offline* is set, or the server cannot be reached,
+    the cached copy is used as is.
+    """
+    if not _is_url(source):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"EDAM ontology not found at {source}")
+        return source
+
+    os.makedirs(cache_dir, exist_ok=True)
+    name = os.path.basename(source) or "EDAM.owl"
+    owl_path = os.path.join(cache_dir, name)
+    meta_path = owl_path + ".json"
+
+    meta = {}
+    if os.path.exists(meta_path) and os.path.exists(owl_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("source") != source:
+            meta = {}
+
+    if offline:
+        if not meta:
+            raise FileNotFoundError(
+                f"No cached copy of {source} in {cache_dir}, cannot run offline"
+            )
+        return owl_path
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(source, headers=headers, timeout=60)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if meta:
+            print(f"WARNING: could not revalidate {source} ({e}), using cached copy.")
+            return owl_path
+        raise
+
+    if response.status_code == 304:
+        return owl_path
+
+    tmp_path = owl_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp_path, owl_path)
+
+    meta = {
+        "source": source,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return owl_path
+
+
+def _pickle_path(owl_path, cache_dir):
+    digest = _sha256(owl_path)
+    key = f"{_CACHE_FORMAT}-{rdflib.__version__}-{digest[:16]}"
+    return os.path.join(cache_dir, f"{os.path.basename(owl_path)}.{key}.pickle")
+
+
+def load_edam_graph(source=EDAM_SOURCE, cache_dir=EDAM_CACHE_DIR, offline=False):
+    """
+    Load the EDAM ontology as an rdflib Graph.
+
+    The parsed triples are pickled next to the cached OWL file, keyed by the
+    OWL checksum and the rdflib version, so the slow RDF/XML parse only runs
+    when the ontology actually changes.
+    """
+    owl_path = fetch_edam_owl(source, cache_dir, offline)
+    os.makedirs(cache_dir, exist_ok=True)
+    pickle_path = _pickle_path(owl_path, cache_dir)
+
+    g = Graph()
+    if os.path.exists(pickle_path):
+        with open(pickle_path, "rb") as f:
+            triples = pickle.load(f)
+        g.addN((s, p, o, g) for s, p, o in triples)
+        return g
+
+    g.parse(owl_path, format="xml")
+
+    tmp_path = pickle_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(list(g), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, pickle_path)
+    return g
+
+
+def build_label_index(edam_kg) -> dict:
+    """
+    Map every plain rdfs:label of the ontology to the local names of the
+    entities carrying it (e.g. "Sequence alignment" -> ["operation_0292"]).
+    """
+    index = defaultdict(list)
+    for entity, label in edam_kg.subject_objects(RDFS.label):
+        if not isinstance(label, Literal) or label.language:
+            continue
+        if label.datatype not in (None, XSD.string):
+            continue
+        index[str(label)].append(str(entity).rsplit("/", 1)[-1])
+    return dict(index)
+
+
+def load_edam_labels(source=EDAM_SOURCE, cache_dir=EDAM_CACHE_DIR, offline=False):
+    """
+    Load the EDAM label index, see ``build_label_index``.
+    """
+    return build_label_index(load_edam_graph(source, cache_dir, offline))
+
+
+def get_edam_uris_from_labels(edam_labels, label_index) -> list:
+    """
+    Get EDAM URIs (local names) from EDAM labels.
+    """
+    res = []
+    for lab in edam_labels:
+        res.extend(label_index.get(lab, []))
+    return res
@@ -0,0 +1,161 @@
+"""
+In-process replacement for the FAIR-checker get_rdf_metadata call: fetch a
+page and parse the JSON-LD of its <script type="application/ld+json"> blocks.
+"""
+
+import codecs
+import json
+import re
+import threading
+from html.parser import HTMLParser
+
+import requests
+from rdflib import ConjunctiveGraph
+
+JSONLD_TYPE = "application/ld+json"
+SCHEMA_ORG_CONTEXT = "https://schema.org/docs/jsonldcontext.json"
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+
+# Remote JSON-LD contexts, fetched once per process rather than once per page
+# as rdflib would do.
+_contexts = {}
+_contexts_lock = threading.Lock()
+
+
+class JSONLDScriptParser(HTMLParser):
+    """
+    Streaming HTML tokenizer collecting the content of JSON-LD script blocks.
+    Text can be fed in chunks as it is downloaded.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.blocks = []
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script":
+            script_type = dict(attrs).get("type") or ""
+            if script_type.split(";")[0].strip().lower() == JSONLD_TYPE:
+                self._current = []
+
+    def handle_data(self, data):
+        if self._current is not None:
+            self._current.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._current is not None:
+            self.blocks.append("".join(self._current))
+            self._current = None
+
+
+def extract_jsonld(chunks):
+    """
+    JSON-LD blocks embedded in an HTML page, given as a string or an iterable
+    of text chunks.
+    """
+    parser = JSONLDScriptParser()
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.blocks
+
+
+def _remote_context(url, session):
+    if url.rstrip("/") in ("http://schema.org", "https://schema.org"):
+        url = SCHEMA_ORG_CONTEXT
+    with _contexts_lock:
+        if url in _contexts:
+            return _contexts[url]
+    res = session.get(
+        url, headers={"Accept": "application/ld+json, application/json"}, timeout=60
+    )
+    res.raise_for_status()
+    context = res.json().get("@context", {})
+    with _contexts_lock:
+        _contexts[url] = context
+    return context
+
+
+def inline_contexts(doc, session):
+    """
+    Replace the remote context references of a JSON-LD document by their
+    (cached) content. References that cannot be fetched are left for rdflib.
+    """
+    if isinstance(doc, list):
+        for item in doc:
+            inline_contexts(item, session)
+        return
+    if not isinstance(doc, dict) or "@context" not in doc:
+        return
+    contexts = doc["@context"]
+    single = not isinstance(contexts, list)
+    contexts = [contexts] if single else list(contexts)
+    for i, context in enumerate(contexts):
+        if isinstance(context, str):
+            try:
+                contexts[i] = _remote_context(context, session)
+            except (requests.RequestException, ValueError) as e:
+                print(f"WARNING: could not load JSON-LD context {context}: {e}")
+    doc["@context"] = contexts[0] if single else contexts
+
+
+def page_encoding(res, head):
+    """
+    Encoding of a page: the charset of its Content-Type, else the one declared
+    in a <meta> tag of its first bytes *head*, else UTF-8. (Without a charset,
+    requests assumes ISO-8859-1 for text/html, which garbles UTF-8 pages.)
+    """
+    if "charset" in res.headers.get("Content-Type", "").lower() and res.encoding:
+        return res.encoding
+    match = META_CHARSET_RE.search(head)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def _decode(res, chunk_size=65536):
+    """
+    Text chunks of a streamed page, decoded with page_encoding().
+    """
+    chunks = res.iter_content(chunk_size)
+    first = next(chunks, b"")
+    decoder = codecs.getincrementaldecoder(page_encoding(res, first[:4096]))(
+        errors="replace"
+    )
+    yield decoder.decode(first)
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def retrieve_rdf(url, session=None):
+    """
+    Fetch a page and parse its embedded JSON-LD into a graph, using the page
+    URL as base. Raises on HTTP errors and when no block can be parsed.
+    """
+    session = session or requests
+    with session.get(
+        url, headers={"Accept": "text/html"}, stream=True, timeout=120
+    ) as res:
+        res.raise_for_status()
+        blocks = extract_jsonld(_decode(res))
+
+    kg = ConjunctiveGraph()
+    errors = []
+    for block in blocks:
+        try:
+            doc = json.loads(block)
+            inline_contexts(doc, session)
+            kg.parse(data=json.dumps(doc), format="json-ld", publicID=url)
+        except Exception as e:
+            errors.append(str(e))
+    if errors and len(errors) == len(blocks):
+        raise ValueError(f"no parseable JSON-LD in {url}: {errors[0]}")
+    return kg
@@ -0,0 +1,104 @@
+"""
+Check that the local JSON-LD extractor (embedded_jsonld.py) gives the same
+graphs as the FAIR-checker.
+
+Without arguments, the saved pages of embedded_jsonld_fixtures/ are served
+locally (as text/html without charset) and the graph of each page is compared
+with the graph expected from the FAIR-checker, saved next to the page as
+N-Triples: the valid blocks only, parsed with the page URL as base. A saved
+copy of the schema.org context is used, so that the check runs offline.
+With URLs, the live pages are fetched and both extractors are compared:
+
+    python embedded_jsonld_check.py [url ...]
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import embedded_jsonld
+from rdflib import Graph
+from rdflib.compare import graph_diff, isomorphic, to_isomorphic
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "embedded_jsonld_fixtures")
+# Number of JSON-LD blocks of each saved page
+BLOCKS = {
+    "multiple_blocks.html": 2,
+    "graph.html": 1,
+    "remote_context.html": 1,
+    "invalid_json.html": 2,
+    "meta_charset.html": 1,
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def compare(name, graph, expected):
+    """
+    Print whether two graphs are isomorphic, and their differences if not.
+    """
+    if isomorphic(graph, expected):
+        print(f"ok      {name}: {len(graph)} triples")
+        return True
+    _, missing, extra = graph_diff(to_isomorphic(expected), to_isomorphic(graph))
+    print(f"FAILED  {name}: {len(graph)} triples, {len(expected)} expected")
+    for prefix, triples in (("-", missing), ("+", extra)):
+        for line in sorted(triples.serialize(format="nt").splitlines()):
+            if line:
+                print(f"  {prefix} {line}")
+    return False
+
+
+def check_fixtures():
+    with open(os.path.join(FIXTURES_DIR, "schemaorg_context.jsonld")) as f:
+        context = json.load(f)["@context"]
+    embedded_jsonld._contexts[embedded_jsonld.SCHEMA_ORG_CONTEXT] = context
+
+    handler = functools.partial(QuietHandler, directory=FIXTURES_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    ok = True
+    try:
+        for name, count in BLOCKS.items():
+            with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+                page = f.read().decode("utf-8", errors="replace")
+            # JSONLDScriptParser, fed at once and in small chunks
+            blocks = embedded_jsonld.extract_jsonld(page)
+            chunked = embedded_jsonld.extract_jsonld(
+                page[i : i + 7] for i in range(0, len(page), 7)
+            )
+            if len(blocks) != count or chunked != blocks:
+                print(f"FAILED  {name}: {len(blocks)} blocks, {count} expected")
+                ok = False
+                continue
+
+            expected = Graph().parse(
+                os.path.join(FIXTURES_DIR, name.replace(".html", ".nt")), format="nt"
+            )
+            graph = embedded_jsonld.retrieve_rdf(base + name)
+            ok = compare(name, graph, expected) and ok
+    finally:
+        server.shutdown()
+    return ok
+
+
+def check_urls(urls):
+    from workflowhub_bioschemas_dump import retrieve_rdf
+
+    ok = True
+    for url in urls:
+        ok = compare(url, embedded_jsonld.retrieve_rdf(url), retrieve_rdf(url)) and ok
+    return ok
+
+
+if __name__ == "__main__":
+    urls = sys.argv[1:]
+    sys.exit(0 if (check_urls(urls) if urls else check_fixtures()) else 1)
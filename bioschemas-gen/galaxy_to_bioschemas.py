@@ -4,6 +4,9 @@ import json
 from pathlib import Path
 from rdflib import Graph
 import pandas as pd
+from edam import get_edam_uris_from_labels, load_edam_labels
+from parallel import run_tools, show_report
+from writer import write_outputs
 
 
 
@@ -11,26 +14,7 @@ def getEdamUrisFromLabels(edam_labels) -> list:
     """
     Get EDAM URIs from EDAM labels.
     """
-
-    res = []
-
-    for lab in edam_labels:
-        query = """
-    PREFIX edam: <http://edamontology.org/>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-    SELECT ?label ?entity WHERE {
-        ?entity rdfs:label '%s' .
-    }
-    """ %(lab)
-
-        q = edam_kg.query(query)
-        for r in q:
-            # uri = r['entity']
-            uri = r["entity"].rsplit("/", 1)[-1]
-            res.append(f"{uri}")
-
-    return res
+    return get_edam_uris_from_labels(edam_labels, edam_index)
 
 def getGalaxyServers(tool_data) -> list:
     """
@@ -190,7 +174,6 @@ def rdfize(data) -> Graph:
 
             g = Graph()
             g.parse(data=prefix + "\n" + triples, format="turtle")
-            print(g.serialize(format="turtle"))
             return g
 
     except Exception as e:
@@ -230,14 +213,10 @@ def process_tools_by_id(id="SPROUT"):
             ## generate bioconda JSON-LD and TTL files
             temp_graph = rdfize(tool)
             if temp_graph and os.path.exists(directory):
-                temp_graph.serialize(
-                    format="json-ld",
-                    auto_compact=True,
-                    destination=os.path.join(directory, tpe_id + ".galaxy.jsonld"),
-                )
-                temp_graph.serialize(
-                    format="turtle",
-                    destination=os.path.join(directory, tpe_id + ".galaxy.ttl"),
+                write_outputs(
+                    temp_graph,
+                    jsonld_path=os.path.join(directory, tpe_id + ".galaxy.jsonld"),
+                    ttl_path=os.path.join(directory, tpe_id + ".galaxy.ttl"),
                 )
 
 
@@ -250,50 +229,66 @@ def clean():
         os.remove(data_file)
 
 
-def process_tools():
+def process_tool_file(tool_file):
     """
-    Go through all galaxy entries and produce an RDF graph representation (BioSchemas / JSON-LD).
+    Produce the BioSchemas JSON-LD and TTL files for a single galaxy suite.
     """
-    tool_files = get_galaxy_files_in_repo()
-    for tool_file in tool_files:
-        path = Path(tool_file)
-        tool = json.loads(path.read_text(encoding="utf-8"))
+    path = Path(tool_file)
+    tool = json.loads(path.read_text(encoding="utf-8"))
 
-        tool_id = None
+    tool_id = None
 
-        if "Suite_ID" in tool.keys():
-            tool_id = tool["Suite_ID"]
+    if "Suite_ID" in tool.keys():
+        tool_id = tool["Suite_ID"]
 
-        if tool_id is None:
-            print(f"WARNING: no tool id found for {tool_file}!")
-            continue
+    if tool_id is None:
+        print(f"WARNING: no tool id found for {tool_file}!")
+        return None
 
-        tpe_id = tool_id.lower()
-        directory = os.path.join("..", "..", "content", "data", tpe_id)
+    tpe_id = tool_id.lower()
+    directory = os.path.join("..", "..", "content", "data", tpe_id)
 
-        if not os.path.exists(directory):
-            print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
-            continue
+    if not os.path.exists(directory):
+        print(f"WARNING: Directory {directory} does not exist for {tool_id}!")
+        return None
 
-        ## generate galaxy JSON-LD and TTL files
-        temp_graph = rdfize(tool)
-        if temp_graph and os.path.exists(directory):
-            temp_graph.serialize(
-                format="json-ld",
-                auto_compact=True,
-                destination=os.path.join(directory, tpe_id + ".galaxy.jsonld"),
-            )
-            temp_graph.serialize(
-                format="turtle",
-                destination=os.path.join(directory, tpe_id + ".galaxy.ttl"),
-            )
+    ## generate galaxy JSON-LD and TTL files
+    temp_graph = rdfize(tool)
+    if temp_graph and os.path.exists(directory):
+        jsonld_file = os.path.join(directory, tpe_id + ".galaxy.jsonld")
+        ttl_file = os.path.join(directory, tpe_id + ".galaxy.ttl")
+        write_outputs(temp_graph, jsonld_file, ttl_file)
+        return [jsonld_file, ttl_file]
+    return None
+
+
+def init_worker(index, servers):
+    """
+    Share the EDAM label index and the Galaxy servers list with the pool workers.
+    """
+    global edam_index, server_dict
+    edam_index = index
+    server_dict = servers
+
+
+def process_tools(workers=None):
+    """
+    Go through all galaxy entries and produce an RDF graph representation (BioSchemas / JSON-LD).
+    """
+    tool_files = get_galaxy_files_in_repo()
+    report = run_tools(
+        tool_files,
+        process_tool_file,
+        initializer=init_worker,
+        initargs=(edam_index, server_dict),
+        workers=workers,
+    )
+    show_report(report, "galaxy_bioschemas_report.json")
 
 
 if __name__ == "__main__":
 
-    edam_version = "https://github.com/edamontology/edamontology/raw/main/EDAM_dev.owl"
-    edam_kg = Graph()
-    edam_kg.parse(edam_version, format="xml")
+    edam_index = load_edam_labels()
 
     server_table = "https://raw.githubusercontent.com/galaxyproject/galaxy_codex/refs/heads/main/sources/data/available_public_servers.csv"
     df = pd.read_table(server_table)
@@ -1,145 +1,172 @@
-
-#from pathlib import Path
-from urllib import response
-
-#from matplotlib.pylab import rint
-from rdflib import Graph
-#from rdflib import ConjunctiveGraph
-import requests
-#import yaml
+import argparse
 import json
+import os
+import re
+import sys
 
+import requests
+from dump import nt_term
+from edam import get_edam_uris_from_labels, load_edam_labels
+from rdflib import RDF, Literal, Namespace, URIRef
 
-edam_version = "https://github.com/edamontology/edamontology/raw/main/EDAM_dev.owl"
-
-kg = Graph()
-kg.parse(edam_version, format="xml")
-
+SCHEMA = Namespace("http://schema.org/")
+EDAM = Namespace("http://edamontology.org/")
 
-def getEdamUrisFromLabels(edam_labels) -> list :
-  """
-  Get EDAM URIs from EDAM labels.
-  """
+WORKFLOWS_URL = "https://raw.githubusercontent.com/galaxyproject/galaxy_codex/refs/heads/main/communities/all/resources/workflows.json"
+DUMP_FILE = "../../content/datasets/galaxyworkflow-dump.ttl"
 
-  res = []
+# Characters that cannot appear in an IRI written as <...> in Turtle/N-Triples.
+_INVALID_IRI = re.compile(r'[\x00-\x20<>"{}|^`\\]')
 
-  for lab in edam_labels:
-    query="""
-    PREFIX edam: <http://edamontology.org/>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+edam_index = None
 
-    SELECT ?label ?entity WHERE {
-        ?entity rdfs:label '%s' .
-    }
-    """%(lab)
 
-    q = kg.query(query)
-    for r in q:
-        uri = r['entity'].rsplit('/', 1)[-1]
-        res.append(f'{uri}')
+def getEdamUrisFromLabels(edam_labels) -> list:
+    """
+    Get EDAM URIs from EDAM labels.
+    """
+    return get_edam_uris_from_labels(edam_labels, edam_index)
 
-  return res
 
 def get_metadata(url):
-    
     response = requests.get(url)
-    response.raise_for_status() 
+    response.raise_for_status()
 
     data = json.loads(response.text)
     return data
 
-def rdfize(data) -> Graph:
 
-    prefix = """
-    @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
-    @prefix schema: <http://schema.org/> .
-    @prefix biotools: <https://bio.tools/> .
-    @prefix edam: <http://edamontology.org/> .
+def _iri(value):
+    if not isinstance(value, str) or not value or _INVALID_IRI.search(value):
+        raise ValueError(f"invalid IRI {value!r}")
+    return URIRef(value)
+
+
+def _literals(entry, key):
+    values = entry.get(key)
+    if values is None:
+        return []
+    if not isinstance(values, list):
+        values = [values]
+    return [Literal(str(value)) for value in values if value is not None]
+
+
+def workflow_triples(entry):
+    """
+    Generate the triples describing one workflow of the Galaxy codex, except
+    for the rdf:type of the servers it is part of.
+    """
+    if "link" not in entry:
+        return
+    package_uri = _iri(entry["link"])
+
+    ## Minimum
+    yield package_uri, RDF.type, SCHEMA.ComputationalWorkflow
+    yield package_uri, SCHEMA.url, Literal(entry["link"])
+    for key, prop in (("name", SCHEMA.name), ("description", SCHEMA.description)):
+        for value in _literals(entry, key):
+            yield package_uri, prop, value
+
+    ## Recommended
+    for key, prop in (
+        ("doi", SCHEMA.citation),
+        ("latest_version", SCHEMA.softwareVersion),
+        ("license", SCHEMA.license),
+        ("creators", SCHEMA.author),
+    ):
+        for value in _literals(entry, key):
+            yield package_uri, prop, value
+
+    for key, prop in (
+        ("edam_operation", SCHEMA.featureList),
+        ("edam_topic", SCHEMA.applicationSubCategory),
+    ):
+        if entry.get(key):
+            for uri in getEdamUrisFromLabels(entry[key]):
+                yield package_uri, prop, EDAM[uri]
+
+    ## Optional
+    for key, prop in (
+        ("create_time", SCHEMA.dateCreated),
+        ("update_time", SCHEMA.dateModified),
+        ("tags", SCHEMA.keywords),
+    ):
+        for value in _literals(entry, key):
+            yield package_uri, prop, value
+
+    source = entry.get("source")
+    if source == "WorkflowHub":
+        yield package_uri, SCHEMA.isPartOf, URIRef("https://workflowhub.eu")
+    elif isinstance(source, str) and source.startswith("https://"):
+        yield package_uri, SCHEMA.isPartOf, _iri(source)
+
+
+def iter_triples(data, summary):
+    """
+    Generate the triples of all workflows. A workflow that cannot be
+    converted is reported in ``summary["errors"]`` and left out, without
+    affecting the others. The servers are typed as schema:WebSite once, at
+    the end.
+    """
+    servers = set()
+    for index, entry in enumerate(data):
+        try:
+            triples = list(workflow_triples(entry))
+        except Exception as e:
+            link = entry.get("link", index) if isinstance(entry, dict) else index
+            print(f"WARNING: skipping workflow {link}: {e}")
+            summary["errors"].append({"workflow": link, "error": str(e)})
+            continue
+        if not triples:
+            summary["skipped"] += 1
+            continue
+        summary["workflows"] += 1
+        for s, p, o in triples:
+            if p == SCHEMA.isPartOf:
+                servers.add(o)
+            yield s, p, o
+    for server in sorted(servers):
+        yield server, RDF.type, SCHEMA.WebSite
+
+
+def rdfize(data, destination=DUMP_FILE, show=False) -> dict:
+    """
+    Write the triples of all workflows as N-Triples (also valid Turtle) to
+    *destination*, one workflow at a time. With *show*, the triples are also
+    printed on stdout.
+
+    Returns a summary with the number of converted and skipped workflows,
+    the number of triples, and the workflows that could not be converted.
     """
+    summary = {"workflows": 0, "skipped": 0, "triples": 0, "errors": []}
+    tmp_path = destination + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        for s, p, o in iter_triples(data, summary):
+            line = f"{nt_term(s, '', {})} <{p}> {nt_term(o, '', {})} .\n"
+            out.write(line)
+            if show:
+                sys.stdout.write(line)
+            summary["triples"] += 1
+    os.replace(tmp_path, destination)
+
+    print(
+        f"wrote {summary['triples']} triples for {summary['workflows']} workflows, "
+        f"{summary['skipped']} skipped, {len(summary['errors'])} errors"
+    )
+    return summary
 
-    triples = ""
-
-    try:
-
-        for entry in data:
-
-            ## Minimum
-            if "link" in entry.keys():
-                package_uri = f'<{entry["link"]}>'
-                triples += f'{package_uri} rdf:type schema:ComputationalWorkflow .\n'
-                triples += f'{package_uri} schema:url "{entry["link"]}" .\n'
-
-                if "name" in entry.keys():
-                    triples += f"{package_uri} schema:name " + json.dumps(entry["name"]) + " .\n"
-
-                if "description" in entry.keys():
-                    triples += f"{package_uri} schema:description " + json.dumps(entry["description"]) + " .\n"
-
-                ## Recommended
-                # if "id" in entry.keys():
-                #     triples += f'{package_uri} schema:identifier "{entry["id"]}" .\n'
-                
-                if "doi" in entry.keys():
-                    triples += f'{package_uri} schema:citation "{entry["doi"]}" .\n'
-            
-                if "latest_version" in entry.keys():
-                    triples += f'{package_uri} schema:softwareVersion "{entry["latest_version"]}" .\n'
-
-                if "license" in entry.keys():
-                    triples += f'{package_uri} schema:license "{entry["license"]}" .\n'
-
-                if "creators" in entry.keys():
-                    for creator in entry["creators"]:
-                        triples += f'{package_uri} schema:author "{creator}" .\n'
-
-                if "edam_operation" in entry.keys():
-                    ope = getEdamUrisFromLabels(entry["edam_operation"])
-                    for o in ope:
-                        triples += f'{package_uri} schema:featureList edam:{o} .\n'
-
-                if "edam_topic" in entry.keys():
-                    top = getEdamUrisFromLabels(entry["edam_topic"])
-                    for t in top:
-                        triples += f'{package_uri} schema:applicationSubCategory edam:{t} .\n'
-
-                ## Optional
-                if "create_time" in entry.keys():
-                    triples += f'{package_uri} schema:dateCreated "{entry["create_time"]}" .\n'
-
-                if "update_time" in entry.keys():
-                    triples += f'{package_uri} schema:dateModified "{entry["update_time"]}" .\n'
-
-                if "source" in entry.keys():
-                    if entry["source"] == "WorkflowHub":
-                        server = "https://workflowhub.eu"
-                        triples += f'{package_uri} schema:isPartOf <{server}> .\n'
-                        triples += f'<{server}> rdf:type schema:WebSite .\n'
-                    elif entry["source"].startswith("https://"):
-                        server = entry["source"]
-                        triples += f'{package_uri} schema:isPartOf <{server}> .\n'
-                        triples += f'<{server}> rdf:type schema:WebSite .\n'
-
-                if "tags" in entry.keys():
-                    for tag in entry["tags"]:
-                        triples += f'{package_uri} schema:keywords "{tag}" .\n'
-    
-        g = Graph()
-        g.parse(data=prefix+"\n"+triples, format="turtle")
-        print(g.serialize(format='turtle'))
-        g.serialize(
-            format="turtle",
-            destination="../../content/datasets/galaxyworkflow-dump.ttl",
-        )
-
-
-
-    except Exception as e:
-        print("PARSING ERROR for:")
-        print(prefix+"\n"+triples)
-        raise(e)
 
 if __name__ == "__main__":
-    url = "https://raw.githubusercontent.com/galaxyproject/galaxy_codex/refs/heads/main/communities/all/resources/workflows.json"
-    data = get_metadata(url)
-    rdfize(data)
-    #rdfize(data[1:100])
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description="Generate the Bioschemas dump of the Galaxy workflows"
+    )
+    parser.add_argument("--url", default=WORKFLOWS_URL, help="workflows.json URL")
+    parser.add_argument(
+        "--show", action="store_true", help="also print the triples on stdout"
+    )
+    args = parser.parse_args()
+
+    edam_index = load_edam_labels()
+    data = get_metadata(args.url)
+    rdfize(data, show=args.show)
+    # rdfize(data[1:100])
@@ -0,0 +1,129 @@
+import contextlib
+import io
+import json
+import os
+import traceback
+from multiprocessing import Pool
+
+# Set in each worker by _init_worker.
+_task_func = None
+
+
+def default_workers():
+    """
+    Number of worker processes, overridable with BIOSCHEMAS_WORKERS.
+    """
+    return int(os.environ.get("BIOSCHEMAS_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def _init_worker(func, initializer, initargs):
+    global _task_func
+    _task_func = func
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_task(tool_file):
+    """
+    Run the task function on one file, capturing what it prints so that
+    warnings end up in the report instead of being interleaved on stdout.
+    """
+    out = io.StringIO()
+    result = None
+    error = None
+    try:
+        with contextlib.redirect_stdout(out):
+            result = _task_func(tool_file)
+    except Exception as e:
+        error = {
+            "file": tool_file,
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        }
+
+    warnings = [
+        {"file": tool_file, "message": line.removeprefix("WARNING:").strip()}
+        for line in out.getvalue().splitlines()
+        if line.startswith("WARNING")
+    ]
+    return tool_file, result, warnings, error
+
+
+def run_tools(
+    tool_files, func, initializer=None, initargs=(), workers=None, chunksize=None
+) -> dict:
+    """
+    Apply *func* to every file of *tool_files* using a process pool.
+
+    *func* must be a module-level function taking a file path and returning
+    the generated output path(s), or None when the file was skipped.
+    *initializer* is called once per worker with *initargs*, to set up shared
+    read-only resources (EDAM index, Galaxy server list, ...).
+
+    Returns a report dict with ``written``, ``skipped``, ``warnings`` and
+    ``errors`` lists.
+    """
+    tool_files = list(tool_files)
+    if workers is None:
+        workers = default_workers()
+    workers = max(1, min(workers, len(tool_files) or 1))
+    if chunksize is None:
+        chunksize = max(1, min(64, len(tool_files) // (workers * 4)))
+
+    report = {
+        "processed": len(tool_files),
+        "written": [],
+        "skipped": [],
+        "warnings": [],
+        "errors": [],
+    }
+
+    if workers == 1:
+        _init_worker(func, initializer, initargs)
+        results = map(_run_task, tool_files)
+        _collect(report, results)
+    else:
+        with Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(func, initializer, initargs),
+        ) as pool:
+            _collect(report, pool.imap_unordered(_run_task, tool_files, chunksize))
+
+    for key in ("written", "skipped"):
+        report[key].sort()
+    for key in ("warnings", "errors"):
+        report[key].sort(key=lambda item: item["file"])
+    return report
+
+
+def _collect(report, results):
+    for tool_file, result, warnings, error in results:
+        report["warnings"].extend(warnings)
+        if error:
+            report["errors"].append(error)
+        elif result is None:
+            report["skipped"].append(tool_file)
+        elif isinstance(result, (list, tuple)):
+            report["written"].extend(result)
+        else:
+            report["written"].append(result)
+
+
+def show_report(report, path=None):
+    """
+    Print a short summary of a run_tools() report, and optionally save the
+    full report as JSON.
+    """
+    print(f"processed {report['processed']} files")
+    print(f"written:  {len(report['written'])} files")
+    print(f"skipped:  {len(report['skipped'])}")
+    print(f"warnings: {len(report['warnings'])}")
+    print(f"errors:   {len(report['errors'])}")
+    for error in report["errors"]:
+        print(f"ERROR for {error['file']}: {error['error']}")
+
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"report saved to {path}")
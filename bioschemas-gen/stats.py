@@ -0,0 +1,162 @@
+"""
+Class and property usage counts for the Bioschemas dumps.
+
+Counts are accumulated per file while dump.stream_dump() writes the dump, so
+no merged graph (nor SPARQL query) is needed, and memory does not grow with
+the dump. They are therefore counts of occurrences per file: a triple that
+several files share (e.g. a Person, Organization or EDAM term typed in each
+tool file) is counted once per file, whereas the former SPARQL GROUP BY over
+the merged graph counted it once, so these counts are not comparable with
+earlier reports. Each dump saves its counts as JSON and Markdown next to the
+dump; running this module merges all saved counts into a single report with
+one column per source:
+
+    python stats.py [stats.json ...]
+"""
+
+import glob
+import json
+import os
+import sys
+from collections import Counter
+
+from rdflib import RDF
+
+try:
+    from tabulate import tabulate
+except ImportError:
+
+    def tabulate(rows, headers=()):
+        return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+DATASETS_DIR = "../../content/datasets"
+
+
+def new_stats(by_source=True) -> dict:
+    stats = {"files": 0, "triples": 0, "classes": Counter(), "properties": Counter()}
+    if by_source:
+        stats["sources"] = {}
+    return stats
+
+
+def source_name(path):
+    """
+    Source of a per-tool file, from its name: ``samtools.bioconda.jsonld``
+    comes from ``bioconda``.
+    """
+    parts = os.path.basename(path).split(".")
+    return parts[-2] if len(parts) >= 3 else "unknown"
+
+
+def _add(stats, files, triples, classes, properties):
+    stats["files"] += files
+    stats["triples"] += triples
+    stats["classes"].update(classes)
+    stats["properties"].update(properties)
+
+
+def add_graph(stats, source, graph):
+    """
+    Count the triples of one file, both in the totals and under *source*.
+    """
+    properties = Counter(str(p) for p in graph.predicates())
+    classes = Counter(str(o) for o in graph.objects(None, RDF.type))
+    source_stats = stats["sources"].setdefault(source, new_stats(by_source=False))
+    for target in (stats, source_stats):
+        _add(target, 1, len(graph), classes, properties)
+
+
+def _as_json(stats):
+    res = {
+        "files": stats["files"],
+        "triples": stats["triples"],
+        "classes": dict(stats["classes"].most_common()),
+        "properties": dict(stats["properties"].most_common()),
+    }
+    if "sources" in stats:
+        res["sources"] = {
+            name: _as_json(source) for name, source in sorted(stats["sources"].items())
+        }
+    return res
+
+
+def _merge(stats, data):
+    """
+    Add counts loaded from a stats JSON file to *stats*.
+    """
+    _add(stats, data["files"], data["triples"], data["classes"], data["properties"])
+    for name, source in data.get("sources", {}).items():
+        _merge(stats["sources"].setdefault(name, new_stats(by_source=False)), source)
+
+
+def _rows(stats, key):
+    """
+    Table rows for ``classes`` or ``properties``: the IRI, the total, then
+    one count per source when there are several sources.
+    """
+    sources = sorted(stats["sources"]) if len(stats["sources"]) > 1 else []
+    headers = ["IRI", "count"] + sources
+    rows = [
+        [iri, count] + [stats["sources"][s][key].get(iri, 0) for s in sources]
+        for iri, count in stats[key].most_common()
+    ]
+    return headers, rows
+
+
+def to_markdown(stats):
+    lines = [
+        f"{stats['files']} files, {stats['triples']} triples (per-file occurrences)",
+        "",
+    ]
+    for title, key in (("Used classes", "classes"), ("Used properties", "properties")):
+        headers, rows = _rows(stats, key)
+        lines += [f"## {title}", ""]
+        lines.append("| " + " | ".join(headers) + " |")
+        lines.append("|" + "---|" * len(headers))
+        lines += ["| " + " | ".join(str(v) for v in row) + " |" for row in rows]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def show_stats(stats):
+    """
+    Display Bioschemas classes and properties counts.
+    """
+    for title, key in (("Used classes", "classes"), ("Used properties", "properties")):
+        headers, rows = _rows(stats, key)
+        print()
+        print(title)
+        print(tabulate(rows, headers=headers))
+
+
+def write_stats(stats, path):
+    """
+    Save the counts as ``<path>.json`` and ``<path>.md``.
+    """
+    with open(path + ".json", "w", encoding="utf-8") as f:
+        json.dump(_as_json(stats), f, indent=2)
+    with open(path + ".md", "w", encoding="utf-8") as f:
+        f.write(to_markdown(stats))
+    print(f"stats saved to {path}.json and {path}.md")
+
+
+def merge_stats(paths) -> dict:
+    """
+    Merge saved stats files (from write_stats()) into one, keeping the
+    per-source breakdown.
+    """
+    stats = new_stats()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            _merge(stats, json.load(f))
+    return stats
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or sorted(
+        glob.glob(os.path.join(DATASETS_DIR, "*-dump.stats.json"))
+    )
+    stats = merge_stats(paths)
+    show_stats(stats)
+    write_stats(stats, os.path.join(DATASETS_DIR, "bioschemas-stats"))
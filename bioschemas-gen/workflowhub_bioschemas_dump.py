@@ -1,16 +1,55 @@
-from rdflib import ConjunctiveGraph
+import argparse
+import hashlib
+import io
+import json
+import os
+import threading
 import xml.etree.ElementTree as ET
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# from tqdm.notebook import tqdm
+import embedded_jsonld
+import requests
+from dump import stream_dump
+from rdflib import ConjunctiveGraph
+from stats import show_stats
 
 # Get all workflow URLs from the sitemap https://workflowhub.eu/sitemaps/workflows.xml
-# fetch the sitemap and parse it to extract workflow URLs
-response = requests.get("https://workflowhub.eu/sitemaps/workflows.xml")
-sitemap_data = response.text
-# write file on disk
-with open("workflows_sitemap.xml", "w") as f:
-    f.write(sitemap_data)
+SITEMAP_URL = "https://workflowhub.eu/sitemaps/workflows.xml"
+FC_get_md = (
+    "https://fair-checker.france-bioinformatique.fr/api/inspect/get_rdf_metadata"
+)
+
+# One N-Triples file per workflow URL, plus a manifest recording the sitemap
+# lastmod each file was harvested for. Kept between runs so that only new or
+# changed workflows are fetched again.
+STORE_DIR = os.environ.get("WORKFLOWHUB_STORE", "workflowhub-store")
+MANIFEST = "manifest.json"
+# Entries of the child sitemaps of a sitemap index, with their lastmod, so
+# that unchanged child sitemaps are not downloaded again.
+SITEMAPS = "sitemaps.json"
+# Save the manifest every SAVE_EVERY harvested URLs, so an interrupted run
+# can resume where it stopped.
+SAVE_EVERY = 50
+
+_local = threading.local()
+
+
+def _session():
+    """
+    One requests session (and connection pool) per harvesting thread.
+    """
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def fetch_sitemap(url=SITEMAP_URL, path="workflows_sitemap.xml"):
+    # fetch the sitemap and write it on disk
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+    with open(path, "w") as f:
+        f.write(response.text)
+    return path
 
 
 def parse_sitemap(xml_path):
@@ -60,38 +99,268 @@ def parse_sitemap(xml_path):
     return urls
 
 
+def read_sitemap(url):
+    response = _session().get(url, timeout=60)
+    response.raise_for_status()
+    return parse_sitemap(io.BytesIO(response.content))
+
+
+def collect_entries(xml_path, store=STORE_DIR, workers=8):
+    """
+    Workflow entries of a sitemap. The child sitemaps of a sitemap index are
+    read concurrently, level by level; those whose lastmod did not change
+    since the previous run are taken from the store instead.
+
+    Returns the entries and the list of child sitemaps that could not be
+    read (and for which no previous entries were available).
+    """
+    known = load_manifest(store, SITEMAPS)
+    sitemaps = {}
+    failed = []
+    entries = {}
+    pending = parse_sitemap(xml_path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending:
+            entries.update((e["loc"], e) for e in pending if e.get("loc"))
+            to_read = []
+            children = [e for e in pending if e.get("sitemap")]
+            pending = []
+            for child in children:
+                url = child["sitemap"]
+                if url in sitemaps:
+                    continue
+                record = known.get(url)
+                if (
+                    record
+                    and child["lastmod"]
+                    and record["lastmod"] == child["lastmod"]
+                ):
+                    sitemaps[url] = record
+                    pending += record["entries"]
+                else:
+                    sitemaps[url] = None
+                    to_read.append(child)
+
+            futures = {pool.submit(read_sitemap, c["sitemap"]): c for c in to_read}
+            for future in as_completed(futures):
+                child = futures[future]
+                url = child["sitemap"]
+                try:
+                    child_entries = future.result()
+                except Exception as e:
+                    print(f"WARNING: could not read sitemap {url}: {e}")
+                    if url in known:
+                        sitemaps[url] = known[url]
+                        pending += known[url]["entries"]
+                    else:
+                        del sitemaps[url]
+                        failed.append(url)
+                    continue
+                print(f"{len(child_entries)} entries in {url}")
+                sitemaps[url] = {"lastmod": child["lastmod"], "entries": child_entries}
+                pending += child_entries
+
+    if sitemaps or known:
+        os.makedirs(store, exist_ok=True)
+        save_manifest(store, sitemaps, SITEMAPS)
+    return list(entries.values()), failed
+
+
 def retrieve_rdf(url):
-    FC_get_md = (
-        "https://fair-checker.france-bioinformatique.fr/api/inspect/get_rdf_metadata"
-    )
+    """
+    Get the RDF metadata of a page from the FAIR-checker. Raises on HTTP
+    errors and unparseable responses.
+    """
     kg = ConjunctiveGraph()
-    res = requests.get(url=FC_get_md, params={"url": url})
-    try:
-        kg.parse(data=res.text, format="json-ld")
-    except Exception as e:
-        print(e)
-    print(f"Loaded {len(kg)} RDF triples from {url}")
+    res = _session().get(url=FC_get_md, params={"url": url}, timeout=120)
+    res.raise_for_status()
+    kg.parse(data=res.text, format="json-ld")
     return kg
 
 
+def retrieve_rdf_local(url):
+    """
+    Get the RDF metadata embedded in a page as JSON-LD, without going through
+    the FAIR-checker.
+    """
+    return embedded_jsonld.retrieve_rdf(url, session=_session())
+
+
+EXTRACTORS = {"fair-checker": retrieve_rdf, "local": retrieve_rdf_local}
+
+
+def store_path(store, url):
+    name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(store, f"{name}.workflowhub.nt")
+
+
+def load_manifest(store, name=MANIFEST):
+    try:
+        with open(os.path.join(store, name), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(store, manifest, name=MANIFEST):
+    path = os.path.join(store, name)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def is_current(record, entry, store, extractor="fair-checker"):
+    """
+    Whether the stored result for a sitemap entry is still valid: harvested
+    for the same lastmod with the same extractor, and still on disk. Entries
+    without a lastmod are always fetched again.
+    """
+    return (
+        record is not None
+        and entry["lastmod"] is not None
+        and record["lastmod"] == entry["lastmod"]
+        and record.get("extractor", "fair-checker") == extractor
+        and os.path.exists(store_path(store, entry["loc"]))
+    )
+
+
+def diff_manifest(entries, manifest, store, extractor="fair-checker") -> dict:
+    """
+    Compare the sitemap entries with the previous run's manifest. Returns the
+    ``new``, ``changed`` and ``unchanged`` entries, and the ``removed`` URLs
+    which are in the manifest but no longer in the sitemap.
+    """
+    changes = {"new": [], "changed": [], "unchanged": [], "removed": []}
+    for entry in entries:
+        record = manifest.get(entry["loc"])
+        if record is None:
+            changes["new"].append(entry)
+        elif is_current(record, entry, store, extractor):
+            changes["unchanged"].append(entry)
+        else:
+            changes["changed"].append(entry)
+    current = {entry["loc"] for entry in entries}
+    changes["removed"] = sorted(url for url in manifest if url not in current)
+    return changes
+
+
+def harvest_url(store, entry, extractor="fair-checker"):
+    """
+    Fetch the RDF of one workflow and save it in the store. Returns the
+    manifest record for the URL.
+    """
+    kg = EXTRACTORS[extractor](entry["loc"])
+    path = store_path(store, entry["loc"])
+    kg.serialize(destination=path + ".tmp", format="nt", encoding="utf-8")
+    os.replace(path + ".tmp", path)
+    return {"lastmod": entry["lastmod"], "triples": len(kg), "extractor": extractor}
+
+
+def harvest(
+    entries, store=STORE_DIR, workers=8, prune=True, extractor="fair-checker"
+) -> dict:
+    """
+    Harvest the sitemap entries that are new or changed since the previous
+    run, with at most *workers* concurrent requests. With *prune*, workflows
+    no longer in the sitemap are dropped from the store. *extractor* is one of
+    EXTRACTORS: the remote FAIR-checker, or ``local`` to parse the JSON-LD
+    embedded in the pages directly.
+
+    Failed URLs are not recorded in the manifest and are retried on the next
+    run. Returns a summary with the number of new, changed, unchanged,
+    removed and fetched entries and the list of errors.
+    """
+    os.makedirs(store, exist_ok=True)
+    manifest = load_manifest(store)
+    entries = [entry for entry in entries if entry.get("loc")]
+    changes = diff_manifest(entries, manifest, store, extractor)
+    todo = changes["new"] + changes["changed"]
+    summary = {"entries": len(entries), "fetched": 0, "errors": []}
+    for key, values in changes.items():
+        summary[key] = len(values)
+    print(
+        f"{summary['new']} new, {summary['changed']} changed, "
+        f"{summary['unchanged']} unchanged, {summary['removed']} removed workflows"
+    )
+
+    if prune:
+        for url in changes["removed"]:
+            del manifest[url]
+            if os.path.exists(store_path(store, url)):
+                os.remove(store_path(store, url))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(harvest_url, store, entry, extractor): entry for entry in todo
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            url = futures[future]["loc"]
+            try:
+                manifest[url] = future.result()
+                summary["fetched"] += 1
+                print(f"Loaded {manifest[url]['triples']} RDF triples from {url}")
+            except Exception as e:
+                print(f"WARNING: could not harvest {url}: {e}")
+                summary["errors"].append({"url": url, "error": str(e)})
+            if done % SAVE_EVERY == 0:
+                save_manifest(store, manifest)
+                print(f"{done}/{len(todo)}")
+    save_manifest(store, manifest)
+
+    print(
+        f"fetched {summary['fetched']} of {len(todo)}, errors {len(summary['errors'])}"
+    )
+    return summary
+
+
+def dump(entries, store=STORE_DIR, keep_removed=False):
+    """
+    Assemble the dump from the stored results of the current sitemap entries.
+    With *keep_removed*, the workflows retained in the store although they are
+    not in *entries* (see harvest() with prune=False) are dumped as well, so
+    that the dump matches the store.
+    """
+    manifest = load_manifest(store)
+    urls = [entry["loc"] for entry in entries if entry.get("loc") in manifest]
+    if keep_removed:
+        current = set(urls)
+        urls += sorted(url for url in manifest if url not in current)
+    files = [store_path(store, url) for url in urls]
+    return stream_dump(files, "../../content/datasets/workflowhub-dump.ttl")
+
+
 if __name__ == "__main__":
-    data = parse_sitemap("workflows_sitemap.xml")
+    parser = argparse.ArgumentParser(
+        description="Harvest WorkflowHub Bioschemas metadata into a single RDF dump"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="number of concurrent requests"
+    )
+    parser.add_argument(
+        "--store", default=STORE_DIR, help="directory of per-workflow results"
+    )
+    parser.add_argument(
+        "--extractor",
+        choices=sorted(EXTRACTORS),
+        default="fair-checker",
+        help="get the RDF from the FAIR-checker service, or from the JSON-LD "
+        "embedded in the pages (local)",
+    )
+    args = parser.parse_args()
+
+    data, failed = collect_entries(
+        fetch_sitemap(), store=args.store, workers=args.workers
+    )
     print("entries:", len(data))
-    # print(data[:3])
-
-    merged_kg = ConjunctiveGraph()
-    counter = 0
-    #for url in data[1000:1100]:
-    for url in data:
-        # print(url)
-        kg = retrieve_rdf(url["loc"])
-        # print(f"KG has {len(kg)} triples")
-        merged_kg += kg
-        counter += 1
-        print(counter)
-
-    print(f"Final merged KG has {len(merged_kg)} triples")
-
-    merged_kg.serialize(
-        destination="../../content/datasets/workflowhub-dump.ttl", format="turtle"
-    ) 
\ No newline at end of file
+
+    # keep the workflows of unreadable sitemaps rather than pruning them
+    harvest(
+        data,
+        store=args.store,
+        workers=args.workers,
+        prune=not failed,
+        extractor=args.extractor,
+    )
+    summary = dump(data, store=args.store, keep_removed=bool(failed))
+    show_stats(summary)
@@ -0,0 +1,159 @@
+import json
+import re
+from functools import lru_cache
+
+from rdflib import RDF, BNode, Literal, URIRef
+
+# Local names that can safely be written as prefix:local in Turtle and JSON-LD.
+_LOCAL_NAME = re.compile(r"^[A-Za-z0-9_](?:[A-Za-z0-9_.\-]*[A-Za-z0-9_\-])?$")
+
+
+@lru_cache(maxsize=32)
+def _namespace_table(bindings) -> tuple:
+    """
+    Compaction table for a set of (prefix, namespace) bindings, longest
+    namespace first. Graphs built from the same prefix block share the same
+    bindings, so this is computed once per converter rather than per tool.
+    """
+    table = {}
+    for prefix, namespace in bindings:
+        namespace = str(namespace)
+        if prefix and namespace not in table:
+            table[namespace] = prefix
+    return tuple(sorted(table.items(), key=lambda item: -len(item[0])))
+
+
+class _Compactor:
+    """
+    Turn IRIs into prefix:local names, remembering which prefixes were used.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.used = {}
+        self.cache = {}
+
+    def compact(self, iri):
+        iri = str(iri)
+        if iri in self.cache:
+            return self.cache[iri]
+        res = None
+        for namespace, prefix in self.table:
+            if iri.startswith(namespace):
+                local = iri[len(namespace) :]
+                if _LOCAL_NAME.match(local):
+                    self.used[prefix] = namespace
+                    res = f"{prefix}:{local}"
+                break
+        self.cache[iri] = res
+        return res
+
+
+def _bnode_label(node, labels):
+    if node not in labels:
+        labels[node] = f"b{len(labels)}"
+    return labels[node]
+
+
+def _turtle_term(term, compactor, labels):
+    if isinstance(term, URIRef):
+        return compactor.compact(term) or f"<{term}>"
+    if isinstance(term, BNode):
+        return "_:" + _bnode_label(term, labels)
+    if term.datatype is not None:
+        dt = _turtle_term(term.datatype, compactor, labels)
+        return Literal(str(term)).n3() + "^^" + dt
+    return term.n3()
+
+
+def _jsonld_value(term, compactor, labels):
+    if isinstance(term, URIRef):
+        return {"@id": compactor.compact(term) or str(term)}
+    if isinstance(term, BNode):
+        return {"@id": "_:" + _bnode_label(term, labels)}
+    if term.language:
+        return {"@value": str(term), "@language": term.language}
+    if term.datatype is not None:
+        dt = compactor.compact(term.datatype) or str(term.datatype)
+        return {"@value": str(term), "@type": dt}
+    return str(term)
+
+
+def _group(triples):
+    """
+    Group sorted triples by subject then predicate.
+    """
+    subjects = []
+    for s, p, o in triples:
+        if not subjects or subjects[-1][0] != s:
+            subjects.append((s, []))
+        predicates = subjects[-1][1]
+        if not predicates or predicates[-1][0] != p:
+            predicates.append((p, []))
+        predicates[-1][1].append(o)
+    return subjects
+
+
+def render(graph) -> tuple:
+    """
+    Render a graph as (JSON-LD text, Turtle text) from a single sorted pass
+    over its triples.
+
+    The JSON-LD output is compacted against a context holding only the
+    prefixes that are actually used; it parses back to the same graph as the
+    rdflib ``auto_compact`` serialization.
+    """
+    compactor = _Compactor(_namespace_table(tuple(graph.namespaces())))
+    ttl_labels = {}
+    jsonld_labels = {}
+
+    ttl_blocks = []
+    nodes = []
+    for s, predicates in _group(sorted(graph)):
+        # rdf:type goes first, as in rdflib's Turtle output
+        predicates.sort(key=lambda item: item[0] != RDF.type)
+
+        node = {"@id": _jsonld_value(s, compactor, jsonld_labels)["@id"]}
+        lines = []
+        for p, objects in predicates:
+            if p == RDF.type and all(isinstance(o, URIRef) for o in objects):
+                pred = "a"
+                types = [compactor.compact(o) or str(o) for o in objects]
+                node["@type"] = types[0] if len(types) == 1 else types
+            else:
+                pred = _turtle_term(p, compactor, ttl_labels)
+                values = [_jsonld_value(o, compactor, jsonld_labels) for o in objects]
+                key = compactor.compact(p) or str(p)
+                node[key] = values[0] if len(values) == 1 else values
+            objs = [_turtle_term(o, compactor, ttl_labels) for o in objects]
+            lines.append(f"{pred} " + ",\n        ".join(objs))
+
+        subject = _turtle_term(s, compactor, ttl_labels)
+        ttl_blocks.append(f"{subject} " + " ;\n    ".join(lines) + " .\n")
+        nodes.append(node)
+
+    context = dict(sorted(compactor.used.items()))
+    if len(nodes) == 1:
+        doc = {"@context": context, **nodes[0]}
+    else:
+        doc = {"@context": context, "@graph": nodes}
+    jsonld = json.dumps(doc, indent=2, ensure_ascii=False)
+
+    prefixes = "".join(f"@prefix {p}: <{ns}> .\n" for p, ns in context.items())
+    ttl = prefixes + "\n" + "\n".join(ttl_blocks)
+    return jsonld, ttl
+
+
+def write_outputs(graph, jsonld_path=None, ttl_path=None) -> list:
+    """
+    Write the JSON-LD and/or Turtle serializations of a graph, rendering it
+    only once. Returns the list of written paths.
+    """
+    jsonld, ttl = render(graph)
+    written = []
+    for path, text in ((jsonld_path, jsonld), (ttl_path, ttl)):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            written.append(path)
+    return written
@@ -0,0 +1,85 @@
+"""
+Compare the per-tool serialization cost of writer.render() with the two
+rdflib serializations (auto-compacted JSON-LD + Turtle) it replaces, and
+check that both give the same graphs.
+
+    python writer_benchmark.py [iterations]
+"""
+
+import sys
+import time
+
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from writer import render
+
+PREFIX = """
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix schema: <http://schema.org/> .
+@prefix bioschemas: <http://bioschemas.org/> .
+@prefix biotools: <https://bio.tools/> .
+@prefix bioconda: <https://github.com/bioconda/bioconda-recipes/tree/master/recipes/> .
+@prefix galaxytool: <https://github.com/galaxyproject/tools-iuc/tree/master/tools/> .
+@prefix edam: <http://edamontology.org/> .
+"""
+
+
+def sample_graph(i):
+    """
+    A graph shaped like the output of galaxy_to_bioschemas.rdfize().
+    """
+    uri = f"galaxytool:suite_{i}"
+    triples = [
+        f"{uri} rdf:type schema:SoftwareApplication .",
+        f'{uri} schema:name "suite_{i}" .',
+        f'{uri} schema:description """A "quoted" description\nover two lines""" .',
+        f"{uri} schema:url <https://github.com/galaxyproject/tools-iuc/{i}> .",
+        f'{uri} schema:softwareVersion "1.{i}" .',
+        f'{uri} schema:dateCreated "2020-01-01" .',
+        f"{uri} schema:identifier biotools:tool_{i} .",
+        f"{uri} schema:identifier bioconda:tool_{i} .",
+    ]
+    for n in range(6):
+        triples.append(f"{uri} schema:applicationSubCategory edam:topic_{n:04d} .")
+        triples.append(f"{uri} schema:featureList edam:operation_{n:04d} .")
+        triples.append(f'{uri} schema:encodingFormat "format{n}" .')
+        triples.append(f'{uri} bioschemas:output "format{n}" .')
+        triples.append(f"{uri} schema:isPartOf <https://usegalaxy.org/{n}> .")
+        triples.append(f"<https://usegalaxy.org/{n}> rdf:type schema:WebSite .")
+        triples.append(f'{uri} schema:keywords "Keyword {n}" .')
+    g = Graph()
+    g.parse(data=PREFIX + "\n".join(triples), format="turtle")
+    return g
+
+
+def rdflib_outputs(g):
+    return (
+        g.serialize(format="json-ld", auto_compact=True),
+        g.serialize(format="turtle"),
+    )
+
+
+def main(iterations=200):
+    graphs = [sample_graph(i) for i in range(iterations)]
+
+    for g in graphs[:10]:
+        jsonld, ttl = render(g)
+        for data, fmt in ((jsonld, "json-ld"), (ttl, "turtle")):
+            parsed = Graph().parse(data=data, format=fmt)
+            assert isomorphic(parsed, g), f"{fmt} output differs from the graph"
+
+    timings = {}
+    for name, func in (("rdflib", rdflib_outputs), ("writer", render)):
+        start = time.perf_counter()
+        for g in graphs:
+            func(g)
+        timings[name] = (time.perf_counter() - start) / iterations
+
+    print(f"graphs: {iterations}, triples per graph: {len(graphs[0])}")
+    for name, seconds in timings.items():
+        print(f"{name:8} {seconds * 1000:.2f} ms per tool")
+    print(f"speedup  {timings['rdflib'] / timings['writer']:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)